@@ -0,0 +1,95 @@
+"""
+Batched Loader Benchmark
+Loading both sides of a match one find_one at a time (the old path) against get_user_teams and the batch loaders
+
+Counts the database commands each match start issues with the QueryCounter listener.
+Runs on the backend STORAGE_BACKEND selects (MongoDB at MONGODB_URI, or STORAGE_BACKEND=sqlite
+offline); uses a scratch database that is dropped afterwards.
+
+Run with: python -m benchmarks.bench_batch_loader [match starts] [concurrency]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from benchmarks.scratch import BACKEND, SCRATCH_DB, scratch_client
+from database.db import Database
+
+
+USERS = 200
+
+
+async def sequential_start(db, a, b):
+    """The old start_interactive_innings lookups: XI and team per side, one round trip each"""
+    await db.db.teams.find_one({"user_id": a})
+    await db.db.teams.find_one({"user_id": b})
+    await db.db.teams.find_one({"user_id": a})
+    await db.db.teams.find_one({"user_id": b})
+    await db.db.economy.find_one({"user_id": a})
+    await db.db.economy.find_one({"user_id": b})
+
+
+async def batched_start(db, a, b):
+    """Both teams through get_user_teams, both balances gathered into one economy query"""
+    await db.get_user_teams(a, b)
+    await asyncio.gather(db.get_user_balance(a), db.get_user_balance(b))
+
+
+async def run_mode(label, db, starts, concurrency, match_start):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            a, b = f"bench_{i % USERS}", f"bench_{(i + 1) % USERS}"
+            # Cold cache, so every start measures the database round trips
+            db.profile_cache.clear()
+            token = db.query_counter.begin(label)
+            start = time.perf_counter()
+            try:
+                await match_start(db, a, b)
+            finally:
+                latencies.append(time.perf_counter() - start)
+                db.query_counter.end(token)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(starts)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    _, calls, average, peak = next(row for row in db.query_counter.summary() if row[0] == label)
+    print(f"{label:<11} p50 {statistics.median(latencies) * 1000:7.1f}ms  p95 {p95 * 1000:7.1f}ms  "
+          f"| {starts / elapsed:7.1f} starts/s | {average:.1f} queries/start (max {peak}, {calls} starts)")
+
+
+async def run(starts=500, concurrency=10):
+    print(f"{starts} match starts, {concurrency} at a time, {USERS} users, {BACKEND}\n")
+
+    db = Database()
+    db.client = scratch_client([db.pool_monitor, db.query_counter])
+    db.db = db.client[SCRATCH_DB]
+    try:
+        await db.db.teams.create_index("user_id", unique=True)
+        await db.db.economy.create_index("user_id", unique=True)
+        players = [{"name": f"Player {n}", "role": "Batsman", "rating": 80} for n in range(15)]
+        await db.db.teams.insert_many([
+            {"user_id": f"bench_{u}", "team_name": f"Bench {u}", "players": players,
+             "playing_xi": [p["name"] for p in players[:11]]}
+            for u in range(USERS)
+        ])
+        await db.db.economy.insert_many([{"user_id": f"bench_{u}", "balance": 100000} for u in range(USERS)])
+
+        await run_mode("sequential", db, starts, concurrency, sequential_start)
+        await run_mode("batched", db, starts, concurrency, batched_start)
+        loaders = {name: loader.summary() for name, loader in db.loaders.items()}
+        print(f"{'':<11} teams loader {loaders['teams']['keys_per_batch']:.1f} keys/query | "
+              f"economy loader {loaders['economy']['keys_per_batch']:.1f} keys/query")
+    finally:
+        await db.client.drop_database(SCRATCH_DB)
+        db.client.close()
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    asyncio.run(run(*args))
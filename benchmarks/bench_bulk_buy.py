@@ -0,0 +1,99 @@
+"""
+Bulk Pack Opening Benchmark
+Compares N single `cmbuy` pack purchases with one bulk purchase of N packs
+
+Runs on the backend STORAGE_BACKEND selects (MongoDB at MONGODB_URI, or
+STORAGE_BACKEND=sqlite offline); uses a scratch database that is dropped afterwards.
+
+Run with: python -m benchmarks.bench_bulk_buy [packs]
+"""
+import asyncio
+import sys
+import time
+
+from benchmarks.scratch import SCRATCH_DB, scratch_client
+from database.db import Database
+from utils.draw_engine import draw_engine
+
+
+PACK_PRICE = 20000
+USER_ID = 'bench_user'
+
+
+def draw(count):
+    cards, seed = draw_engine.draw_cards('pack_epic', 'pack', count=count)
+    players = []
+    for rarity, drawn in cards:
+        player = drawn.copy()
+        player['rarity'] = rarity
+        player['draw_seed'] = seed
+        players.append(player)
+    return players
+
+
+async def single_purchases(db, packs):
+    """The pre-bulk cmbuy path, repeated once per pack"""
+    for _ in range(packs):
+        balance = await db.get_user_balance(USER_ID)
+        if balance < PACK_PRICE:
+            raise RuntimeError("bench user ran out of coins")
+        await db.remove_coins(USER_ID, PACK_PRICE, "Bought Gold Pack")
+        players = draw(1)
+        await db.add_item_to_inventory(USER_ID, 'players', {'players': players})
+        user_team = await db.get_user_team(USER_ID)
+        player_ids = [p['id'] for p in players]
+        if user_team:
+            new_squad = (user_team.get('players', []) + player_ids)[:20]
+            await db.update_user_team(USER_ID, new_squad, user_team.get('budget_remaining', 0))
+            playing_xi = await db.get_playing_xi(USER_ID)
+            if not playing_xi:
+                await db.set_playing_xi(USER_ID, player_ids[:11])
+        else:
+            await db.create_user_team(USER_ID, "Bench Team", player_ids[:20])
+            await db.set_playing_xi(USER_ID, player_ids[:11])
+
+
+async def bulk_purchase(db, packs):
+    """The `cmbuy <pack> <count>` path"""
+    players = draw(packs)
+    user = await db.purchase_items(
+        USER_ID, PACK_PRICE * packs,
+        [('players', {'players': [p]}) for p in players],
+        f"Bought {packs}x Gold Pack"
+    )
+    if not user:
+        raise RuntimeError("bench user ran out of coins")
+    await db.add_players_to_squad(USER_ID, "Bench Team", [p['id'] for p in players])
+
+
+async def reset(db, packs):
+    await db.db.economy.delete_many({"user_id": USER_ID})
+    await db.db.teams.delete_many({"user_id": USER_ID})
+    await db.db.transactions.delete_many({"user_id": USER_ID})
+    coins = PACK_PRICE * packs
+    await db.db.economy.insert_one({"user_id": USER_ID, "balance": coins, "coins": coins, "items": []})
+    # The previous round's balance would otherwise still be cached
+    db.profile_cache.clear()
+
+
+async def run(packs=50, rounds=3):
+    db = Database()
+    db.client = scratch_client()
+    db.db = db.client[SCRATCH_DB]
+    try:
+        for label, fn in (("single x N", single_purchases), ("bulk", bulk_purchase)):
+            best = None
+            for _ in range(rounds):
+                await reset(db, packs)
+                start = time.perf_counter()
+                await fn(db, packs)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"{label:<11} {packs} packs: {best * 1000:8.1f}ms  ({packs / best:8.1f} packs/s)")
+    finally:
+        await db.client.drop_database(SCRATCH_DB)
+        db.client.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
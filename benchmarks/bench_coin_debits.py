@@ -0,0 +1,93 @@
+"""
+Coin Debit Benchmark
+Parallel purchases against one balance: the old read-then-$inc debit against the atomic remove_coins
+
+Shows the old path overdrawing under concurrency while the conditional update never does,
+and compares per-debit latency. Runs on the backend STORAGE_BACKEND selects (MongoDB at
+MONGODB_URI, or STORAGE_BACKEND=sqlite offline); uses a scratch database that is dropped afterwards.
+
+Run with: python -m benchmarks.bench_coin_debits [purchases] [price]
+(exits 1 if the atomic path overdraws, so it doubles as the no-overdraft check)
+"""
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.scratch import BACKEND, SCRATCH_DB, scratch_client
+from database.db import Database
+
+
+USER_ID = "bench_buyer"
+
+
+async def legacy_remove_coins(db, user_id, amount, reason=""):
+    """The pre-atomic remove_coins: balance read, $inc and ledger insert as three round trips"""
+    user = await db.db.economy.find_one({"user_id": user_id})
+    if (user.get('balance', 0) or user.get('coins', 0)) < amount:
+        return False
+    await db.db.economy.update_one(
+        {"user_id": user_id},
+        {"$inc": {"balance": -amount, "coins": -amount, "total_spent": amount},
+         "$set": {"updated_at": datetime.utcnow()}}
+    )
+    await db.db.transactions.insert_one({
+        "user_id": user_id, "amount": -amount, "type": "spend", "reason": reason, "timestamp": datetime.utcnow()
+    })
+    return True
+
+
+async def run_mode(db, label, purchases, price, debit):
+    """Seed enough coins for half the purchases, fire all of them at once; True if exactly the affordable ones went through"""
+    starting = price * (purchases // 2)
+    await db.db.economy.replace_one(
+        {"user_id": USER_ID},
+        {"user_id": USER_ID, "balance": starting, "coins": starting, "total_spent": 0, "items": []},
+        upsert=True
+    )
+    db.invalidate_profile(USER_ID)
+    latencies = []
+
+    async def one():
+        start = time.perf_counter()
+        result = await debit(USER_ID, price, "Bench purchase")
+        latencies.append(time.perf_counter() - start)
+        return result
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(purchases)))
+    elapsed = time.perf_counter() - start
+    # remove_coins returns the new balance, which is 0 after the last affordable debit
+    succeeded = sum(1 for r in results if r is not None and r is not False)
+    final = (await db.db.economy.find_one({"user_id": USER_ID}))['balance']
+
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{label:<8} {succeeded:>4}/{purchases} succeeded (affordable: {starting // price}) | final balance {final:>9,} "
+          f"| {'OVERDRAWN' if final < 0 else 'ok':<9} | p50 {statistics.median(latencies) * 1000:6.1f}ms  "
+          f"p95 {p95 * 1000:6.1f}ms | {purchases / elapsed:7.1f} debits/s")
+    return final >= 0 and succeeded == starting // price
+
+
+async def run(purchases=200, price=1000):
+    db = Database()
+    db.client = scratch_client()
+    db.db = db.client[SCRATCH_DB]
+    try:
+        print(f"{purchases} concurrent purchases of {price:,} coins, {BACKEND}\n")
+        await run_mode(db, "legacy", purchases, price, lambda *a: legacy_remove_coins(db, *a))
+        no_overdraft = await run_mode(db, "atomic", purchases, price, db.remove_coins)
+        await db.ledger.flush()
+        print(f"\nLedger entries written by the atomic run: {db.ledger.stats['written']} "
+              f"in {db.ledger.stats['batches']} insert_many batch(es)")
+    finally:
+        await db.client.drop_database(SCRATCH_DB)
+        db.client.close()
+    return no_overdraft
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    # Non-zero exit if the atomic path overdrew or refused an affordable purchase
+    sys.exit(0 if asyncio.run(run(*args)) else 1)
@@ -0,0 +1,126 @@
+"""
+Draw Engine Benchmark
+Times alias-table draws against random.choices and checks every registered
+weight table's observed distribution against its configured weights
+
+Run with: python -m benchmarks.bench_draw_engine [draws_per_table]
+"""
+import math
+import random
+import sys
+import time
+
+from utils.draw_engine import AliasTable, draw_engine
+
+
+DEFAULT_DRAWS = 2_000_000
+BENCH_DRAWS = 1_000_000
+# Chi-square upper tail probability treated as a failure
+ALPHA = 0.001
+
+
+def chi_square_critical(df, alpha=ALPHA):
+    """Wilson-Hilferty approximation of the chi-square critical value"""
+    # Upper-tail normal quantiles for the alphas we use
+    z = {0.01: 2.326, 0.001: 3.090, 0.0001: 3.719}[alpha]
+    h = 2.0 / (9.0 * df)
+    return df * (1.0 - h + z * math.sqrt(h)) ** 3
+
+
+def check_conformance(name, table, draws, seed):
+    """Chi-square goodness-of-fit of `draws` samples against the table weights"""
+    rng = random.Random(seed)
+    counts = dict.fromkeys(table.outcomes, 0)
+    for outcome in table.sample_many(draws, rng):
+        counts[outcome] += 1
+
+    chi2 = 0.0
+    worst = 0.0
+    for outcome, p in zip(table.outcomes, table.probabilities):
+        expected = draws * p
+        chi2 += (counts[outcome] - expected) ** 2 / expected
+        worst = max(worst, abs(counts[outcome] / draws - p))
+
+    df = len(table.outcomes) - 1
+    critical = chi_square_critical(df) if df > 0 else 0.0
+    passed = chi2 <= critical
+    status = "✅" if passed else "❌"
+    print(f"{status} {name:<16} chi2={chi2:8.2f} (crit {critical:6.2f}, df {df}) max |obs-p|={worst:.5f}")
+    return passed
+
+
+def check_replay():
+    """Same seed must reproduce the same cards"""
+    first, seed = draw_engine.draw_cards('pack_legendary', 'pack', count=50)
+    again, _ = draw_engine.draw_cards('pack_legendary', 'pack', count=50, seed=seed)
+    same = [(r, p['id']) for r, p in first] == [(r, p['id']) for r, p in again]
+    print(f"{'✅' if same else '❌'} replay of seed {seed} reproduces 50 cards")
+    return same
+
+
+def bench_sampling():
+    weights = {'common': 90, 'rare': 8, 'epic': 1.5, 'legendary': 0.5}
+    keys = list(weights.keys())
+    values = list(weights.values())
+    rng = random.Random(1)
+
+    start = time.perf_counter()
+    for _ in range(BENCH_DRAWS):
+        random.choices(keys, weights=values)[0]
+    choices_single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    random.choices(keys, weights=values, k=BENCH_DRAWS)
+    choices_batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = AliasTable(weights)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(BENCH_DRAWS):
+        table.sample(rng)
+    alias_single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table.sample_many(BENCH_DRAWS, rng)
+    alias_batch = time.perf_counter() - start
+
+    print(f"\n{BENCH_DRAWS:,} draws from a 4-outcome table")
+    print(f"  random.choices per call : {choices_single:6.3f}s")
+    print(f"  random.choices k=N      : {choices_batch:6.3f}s")
+    print(f"  alias build             : {build * 1e6:6.1f}us")
+    print(f"  alias sample() per call : {alias_single:6.3f}s")
+    print(f"  alias sample_many(N)    : {alias_batch:6.3f}s")
+
+    # Alias sampling cost stays flat as the table grows; choices bisects cumulative weights
+    big = {i: random.random() for i in range(10000)}
+    big_keys = list(big.keys())
+    big_values = list(big.values())
+    big_table = AliasTable(big)
+    start = time.perf_counter()
+    for _ in range(10000):
+        random.choices(big_keys, weights=big_values)
+    big_choices = time.perf_counter() - start
+    start = time.perf_counter()
+    big_table.sample_many(10000, rng)
+    big_alias = time.perf_counter() - start
+    print("\n10,000 draws from a 10,000-outcome table")
+    print(f"  random.choices per call : {big_choices:6.3f}s")
+    print(f"  alias sample_many(N)    : {big_alias:6.3f}s")
+
+
+def run(draws=DEFAULT_DRAWS):
+    print(f"Conformance: {draws:,} draws per table, alpha={ALPHA}")
+    results = [
+        check_conformance(name, table, draws, seed=i)
+        for i, (name, table) in enumerate(sorted(draw_engine.tables.items()))
+    ]
+    results.append(check_replay())
+    bench_sampling()
+    return all(results)
+
+
+if __name__ == '__main__':
+    draws = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DRAWS
+    sys.exit(0 if run(draws) else 1)
@@ -0,0 +1,114 @@
+"""
+Index Bootstrap Benchmark
+Hot-path query latency and documents examined on a seeded database, before and after ensure_indexes()
+
+Runs on the backend STORAGE_BACKEND selects (MongoDB at MONGODB_URI, ideally local, or
+STORAGE_BACKEND=sqlite offline); seeds a scratch database (~1M documents by default) that is
+dropped afterwards. Documents examined come from explain(), which only MongoDB has.
+
+Run with: python -m benchmarks.bench_indexes [documents]
+"""
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.scratch import SCRATCH_DB, scratch_client
+from database.db import Database
+from database.indexes import ensure_indexes
+
+
+BATCH = 10000
+QUERIES = 200
+
+
+async def seed(db, documents, rng):
+    """80% matches, the rest split across teams, economy and trades"""
+    users = max(100, documents // 10)
+    now = datetime.utcnow()
+
+    async def insert(collection, count, make):
+        for start in range(0, count, BATCH):
+            await db.db[collection].insert_many([make(i) for i in range(start, min(count, start + BATCH))], ordered=False)
+
+    await insert('teams', users, lambda i: {
+        'user_id': str(i), 'team_name': f"Team {i}", 'players': [], 'wins': rng.randint(0, 200),
+        'losses': rng.randint(0, 200), 'matches_played': 0, 'updated_at': now
+    })
+    await insert('economy', users, lambda i: {'user_id': str(i), 'coins': 50000, 'balance': 50000, 'items': []})
+    await insert('trades', documents // 20, lambda i: {
+        'sender_id': str(rng.randrange(users)), 'receiver_id': str(rng.randrange(users)),
+        'status': rng.choice(['pending', 'accepted', 'rejected', 'rejected']), 'created_at': now
+    })
+    def match(i):
+        team1, team2 = str(rng.randrange(users)), str(rng.randrange(users))
+        return {
+            'team1_user': team1, 'team2_user': team2, 'participants': [team1, team2],
+            'team1_score': "150/6", 'team2_score': "149/9", 'winner_id': "0",
+            'created_at': now - timedelta(minutes=i)
+        }
+
+    await insert('matches', documents - 2 * users - documents // 20, match)
+    return users
+
+
+def queries(db, users, rng):
+    """(label, query function, cursor to explain) for the hot-path lookups"""
+    def user():
+        return str(rng.randrange(users))
+
+    return [
+        ("economy by user_id", lambda: db.get_economy_user(user()),
+         lambda: db.db.economy.find({'user_id': user()}).limit(1)),
+        ("teams by user_id", lambda: db.get_user_team(user()),
+         lambda: db.db.teams.find({'user_id': user()}).limit(1)),
+        ("match history (page 1)", lambda: db.get_user_matches(user()),
+         lambda: db.db.matches.find({'participants': user()})
+         .sort([('created_at', -1), ('_id', -1)]).limit(10)),
+        ("pending trades for receiver", lambda: db.db.trades.find({'receiver_id': user(), 'status': 'pending'}).to_list(length=10),
+         lambda: db.db.trades.find({'receiver_id': user(), 'status': 'pending'}).limit(10)),
+    ]
+
+
+async def measure(db, users, label):
+    rng = random.Random(3)
+    print(f"\n{label}")
+    for name, query, explain in queries(db, users, rng):
+        start = time.perf_counter()
+        for _ in range(QUERIES):
+            await query()
+        per_query = (time.perf_counter() - start) / QUERIES
+        cursor = explain()
+        plan = await cursor.explain() if hasattr(cursor, 'explain') else {}
+        examined = plan.get('executionStats', {}).get('totalDocsExamined', '?')
+        print(f"  {name:<28} {per_query * 1000:8.2f}ms/query | docs examined {examined}")
+
+
+async def run(documents=1_000_000):
+    db = Database()
+    db.client = scratch_client()
+    db.db = db.client[SCRATCH_DB]
+    try:
+        await db.client.drop_database(SCRATCH_DB)
+        start = time.perf_counter()
+        users = await seed(db, documents, random.Random(1))
+        print(f"Seeded {documents:,} documents ({users:,} users) in {time.perf_counter() - start:.1f}s")
+
+        await measure(db, users, "Without indexes")
+
+        start = time.perf_counter()
+        await ensure_indexes(db.db)
+        built = time.perf_counter() - start
+        await measure(db, users, f"With indexes (built in {built:.1f}s)")
+
+        start = time.perf_counter()
+        await ensure_indexes(db.db)
+        print(f"\nRe-running ensure_indexes on a ready database: {(time.perf_counter() - start) * 1000:.0f}ms")
+    finally:
+        await db.client.drop_database(SCRATCH_DB)
+        db.client.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
@@ -0,0 +1,148 @@
+"""
+Inventory Benchmark
+Economy documents with embedded `items` arrays (the old layout) against the inventory collection after migrate_inventory
+
+Seeds economy documents the way packs used to fill them, measures the average economy
+document size and the profile, inventory page and trade lookup latencies, migrates, and
+measures again. Runs on MongoDB (MONGODB_URI, in a scratch database that is dropped
+afterwards) or on the embedded SQLite store in a temporary file.
+
+Run with: python -m benchmarks.bench_inventory [users] [packs per user] [mongodb|sqlite]
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import bson
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from config import MONGODB_URI
+from database.db import Database
+from database.indexes import ensure_indexes
+from database.sqlite_store import SQLiteClient
+
+
+SCRATCH_DB = 'cricket_bot_bench'
+PAGE_SIZE = 10
+SAMPLES = 200
+
+
+def legacy_items(rng, packs):
+    """An `items` array as packs, trades and the shop used to $push them"""
+    start = datetime.utcnow() - timedelta(days=packs)
+    items = []
+    for n in range(packs):
+        players = [
+            {"id": rng.randrange(2000), "name": f"Player {rng.randrange(2000)}", "country": "🏏",
+             "role": "batsman", "batting": rng.randint(40, 99), "bowling": rng.randint(20, 99),
+             "rarity": "common", "draw_seed": rng.getrandbits(32)}
+            for _ in range(rng.choice((1, 1, 3, 5)))
+        ]
+        items.append({"item_id": "players", "data": {"players": players}, "acquired_at": start + timedelta(days=n)})
+        if n % 10 == 0:
+            items.append({"item_id": "lucky_coin", "data": {"name": "Lucky Coin", "price": 300,
+                                                            "effect": "Double coins for next match"},
+                          "acquired_at": start + timedelta(days=n)})
+    return items
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return f"p50 {statistics.median(samples) * 1000:7.2f}ms  p95 {p95 * 1000:7.2f}ms"
+
+
+async def timed(samples, awaitable):
+    start = time.perf_counter()
+    value = await awaitable
+    samples.append(time.perf_counter() - start)
+    return value
+
+
+async def average_doc_size(db):
+    sizes = [len(bson.encode(doc)) async for doc in db.db.economy.find({})]
+    return sum(sizes) / max(1, len(sizes))
+
+
+async def legacy_page(db, user_id):
+    """The old cminventory: the whole economy document, newest items sliced out in Python"""
+    user = await db.db.economy.find_one({"user_id": user_id})
+    items = sorted(user.get('items', []), key=lambda item: item['acquired_at'], reverse=True)
+    return items[:PAGE_SIZE]
+
+
+async def legacy_owned_player(db, user_id, player_id):
+    """The old trade lookup: the whole economy document, scanned for the card"""
+    user = await db.db.economy.find_one({"user_id": user_id})
+    for item in user.get('items', []):
+        for player in (item.get('data') or {}).get('players', []):
+            if player['id'] == player_id:
+                return player
+    return None
+
+
+async def measure(label, db, samples_for):
+    page, lookup, profile = [], [], []
+    for user_id, player_id in samples_for:
+        db.profile_cache.clear()
+        await timed(profile, db.get_economy_user(user_id))
+        if label == 'before':
+            await timed(page, legacy_page(db, user_id))
+            await timed(lookup, legacy_owned_player(db, user_id, player_id))
+        else:
+            await timed(page, db.get_user_inventory(user_id, limit=PAGE_SIZE))
+            await timed(lookup, db.find_owned_player(user_id, [player_id]))
+    size = await average_doc_size(db)
+    print(f"{label:<7} economy doc {size / 1024:8.1f} KiB avg")
+    print(f"{'':<7} get_economy_user  {percentiles(profile)}")
+    print(f"{'':<7} inventory page    {percentiles(page)}")
+    print(f"{'':<7} trade lookup      {percentiles(lookup)}")
+
+
+async def run(users=500, packs=200, backend='sqlite'):
+    print(f"{users} users, {packs} packs each, {backend}\n")
+    rng = random.Random(7)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if backend == 'mongodb':
+            client = AsyncIOMotorClient(MONGODB_URI)
+        else:
+            client = SQLiteClient(os.path.join(tmp, 'bench.sqlite3'))
+        db = Database()
+        db.client = client
+        db.db = client[SCRATCH_DB]
+        db.ledger.spool_path = os.path.join(tmp, 'ledger_spool.jsonl')
+        try:
+            await ensure_indexes(db.db)
+            samples_for = []
+            for start in range(0, users, 100):
+                batch = []
+                for u in range(start, min(users, start + 100)):
+                    items = legacy_items(rng, packs)
+                    batch.append({"user_id": f"bench_{u}", "balance": 5000, "coins": 5000, "items": items})
+                    if len(samples_for) < SAMPLES:
+                        pack = rng.choice([item for item in items if item['item_id'] == 'players'])
+                        samples_for.append((f"bench_{u}", rng.choice(pack['data']['players'])['id']))
+                await db.db.economy.insert_many(batch)
+
+            await measure('before', db, samples_for)
+
+            start = time.perf_counter()
+            await db.migrate_inventory()
+            print(f"\nmigrate_inventory {time.perf_counter() - start:6.2f}s\n")
+
+            await measure('after', db, samples_for)
+        finally:
+            await db.ledger.close()
+            await client.drop_database(SCRATCH_DB)
+            client.close()
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:4]
+    asyncio.run(run(*[int(a) for a in args[:2]], *args[2:]))
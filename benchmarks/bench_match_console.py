@@ -0,0 +1,123 @@
+"""
+Match Console Benchmark
+Discord API calls per over in classic mode (new message per prompt/result) against console mode
+(persistent scoreboard + controls edited in place), replaying the engine's per-ball message sequence
+
+Run with: python -m benchmarks.bench_match_console
+"""
+import asyncio
+import random
+
+from utils.match_console import MatchConsole
+from utils.outbound import outbound
+
+
+OVERS = 20
+
+
+class CountingMessage:
+    def __init__(self, channel, message_id):
+        self.channel = channel
+        self.id = message_id
+
+    async def edit(self, **kwargs):
+        self.channel.edits += 1
+
+    async def delete(self):
+        self.channel.deletes += 1
+
+
+class CountingChannel:
+    """Stands in for a discord channel and counts what the console sends"""
+
+    def __init__(self, channel_id=1):
+        self.id = channel_id
+        self.sends = 0
+        self.edits = 0
+        self.deletes = 0
+
+    async def send(self, content=None, **kwargs):
+        self.sends += 1
+        return CountingMessage(self, self.sends)
+
+
+class PressedInteraction:
+    """A deferred button/select press on a message"""
+
+    def __init__(self, message):
+        self.message = message
+
+    async def edit_original_response(self, **kwargs):
+        pass
+
+
+async def answer(console, message):
+    """Player presses a control; the engine callback acknowledges the interaction"""
+    console.acknowledge(PressedInteraction(message))
+
+
+async def play_ball(console, rng, fast):
+    """Same console calls ProfessionalMatchEngine.select_shot/process_ball make for one ball"""
+    if fast:
+        pace_msg = await console.prompt("choose pace & length", view=object())
+        await answer(console, pace_msg)
+        await console.edit(pace_msg, view=object())
+        await answer(console, pace_msg)
+    else:
+        await answer(console, await console.prompt("choose your delivery", view=object()))
+    await console.update("bowls: Quick Yorker")
+    await answer(console, await console.prompt("facing 145km/h", view=object()))
+
+    outcome = rng.choices(['dot', 1, 2, 4, 6, 'wicket'], weights=[30, 30, 10, 15, 5, 10])[0]
+    if outcome == 'wicket':
+        # Key event: text, GIF embed, wicket card, then the new batsman prompt
+        for _ in range(3):
+            await console.send("OUT!")
+        await answer(console, await console.prompt(embed=object(), view=object()))
+    elif outcome in ('dot', 4, 6):
+        if console.persistent:
+            await console.update("Dot/FOUR/SIX")
+        else:
+            await console.send(embed=object())
+    else:
+        await console.update(f"{outcome} RUNS")
+    await console.show_scoreboard(object())
+
+
+async def play_innings(persistent, seed=5):
+    rng = random.Random(seed)
+    channel = CountingChannel()
+    console = MatchConsole(channel, persistent)
+    for over in range(OVERS):
+        await answer(console, await console.prompt(embed=object(), view=object()))  # bowler selection
+        fast = rng.random() < 0.7
+        for _ in range(6):
+            await play_ball(console, rng, fast)
+        console.end_over()
+    # Let fire-and-forget scoreboard edits and deletes drain
+    await asyncio.sleep(0.05)
+    return console
+
+
+async def run():
+    # Counting only: lift the scheduler's pacing (bench_outbound covers that)
+    outbound.rate = outbound.burst = 1e9
+    results = {}
+    for persistent in (False, True):
+        console = await play_innings(persistent)
+        stats = console.stats()
+        results[stats['mode']] = stats
+        calls = stats['calls']
+        print(f"{stats['mode']:<8} {stats['per_over']:6.1f} calls/over | "
+              f"{calls['send']} new messages, {calls['edit']} edits, {calls['delete']} deletes over {stats['overs']} overs "
+              f"(+{calls['interaction']} interaction edits outside the channel bucket)")
+
+    classic = results['classic']
+    console = results['console']
+    print(f"\nNew messages per over: {classic['calls']['send'] / OVERS:.1f} -> {console['calls']['send'] / OVERS:.1f}")
+    print(f"Channel API calls per over: {classic['per_over']:.1f} -> {console['per_over']:.1f} "
+          f"({1 - console['per_over'] / classic['per_over']:.0%} fewer)")
+
+
+if __name__ == '__main__':
+    asyncio.run(run())
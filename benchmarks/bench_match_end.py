@@ -0,0 +1,107 @@
+"""
+Match-End Latency Benchmark
+Saving a result with a fresh client per event (the old engine path) against the shared pooled client
+
+Runs on the backend STORAGE_BACKEND selects (MongoDB at MONGODB_URI, or
+STORAGE_BACKEND=sqlite offline); uses a scratch database that is dropped afterwards.
+Connection counts come from the driver's pool events, so only MongoDB reports them.
+
+Run with: python -m benchmarks.bench_match_end [matches] [concurrency]
+"""
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.scratch import BACKEND, SCRATCH_DB, scratch_client
+from config import MONGODB_POOL_SETTINGS
+from database.db import Database, PoolMonitor
+
+
+
+
+def match_data(i):
+    return {
+        "team1_user": f"bench_{i}_a", "team1_name": "Bench A", "team1_score": "151/6", "team1_overs": "19.2",
+        "team2_user": f"bench_{i}_b", "team2_name": "Bench B", "team2_score": "150/8", "team2_overs": "20.0",
+        "winner_id": f"bench_{i}_a", "winner_name": "Bench A", "win_by": "4 wickets",
+        "venue": "Lord's", "overs": 20, "match_type": "20-over match", "created_at": datetime.utcnow()
+    }
+
+
+async def record_result(db, i):
+    """The writes MatchSession.save_match_history makes"""
+    await db.save_match(match_data(i))
+    await db.update_match_result(f"bench_{i}_a", won=True)
+    await db.update_match_result(f"bench_{i}_b", won=False)
+    await db.award_match_coins(f"bench_{i}_a", 5000, "Match victory")
+    await db.award_match_coins(f"bench_{i}_b", 1000, "Participation reward")
+
+
+def scratch(client):
+    db = Database()
+    db.client = client
+    db.db = client[SCRATCH_DB]
+    return db
+
+
+async def per_event(i, monitor):
+    """Old path: Database() + connect() + close() around every match end"""
+    db = scratch(scratch_client([monitor]))
+    try:
+        await record_result(db, i)
+    finally:
+        db.client.close()
+
+
+async def run_mode(label, matches, concurrency, match_end):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            await match_end(i)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(matches)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{label:<10} p50 {statistics.median(latencies) * 1000:7.1f}ms  p95 {p95 * 1000:7.1f}ms  "
+          f"| {matches / elapsed:7.1f} match ends/s")
+
+
+async def run(matches=200, concurrency=10):
+    print(f"{matches} match ends, {concurrency} at a time, {BACKEND}\n")
+
+    monitor = PoolMonitor()
+    await run_mode("per-event", matches, concurrency, lambda i: per_event(i, monitor))
+    if BACKEND != 'sqlite':
+        print(f"{'':<10} connections opened: {monitor.stats['created']}")
+
+    shared = Database()
+    shared.client = scratch_client(
+        [shared.pool_monitor],
+        maxPoolSize=MONGODB_POOL_SETTINGS['max_pool_size'],
+        minPoolSize=MONGODB_POOL_SETTINGS['min_pool_size']
+    )
+    shared.db = shared.client[SCRATCH_DB]
+    try:
+        # Warm the pool the way the bot does at startup
+        await shared.db.command('ping')
+        await run_mode("shared", matches, concurrency, lambda i: record_result(shared, i))
+        if BACKEND != 'sqlite':
+            pool = shared.pool_stats()
+            print(f"{'':<10} connections opened: {pool['created']} | peak in use {pool['max_in_use']} "
+                  f"| checkout wait avg {pool['wait_ms_avg']:.2f}ms")
+    finally:
+        await shared.client.drop_database(SCRATCH_DB)
+        shared.client.close()
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    asyncio.run(run(*args))
@@ -0,0 +1,136 @@
+"""
+Outbound Scheduler Benchmark
+Several matches sharing one channel, sending directly (library-style 429 retry sleeps) against the
+per-channel token bucket scheduler. Time is scaled 50x: the fake channel allows 5 calls per 0.1s
+
+Run with: python -m benchmarks.bench_outbound
+"""
+import asyncio
+import random
+import statistics
+import time
+
+from config import OUTBOUND_SETTINGS
+from utils.outbound import OutboundScheduler, PROMPT, RESULT, DECORATIVE
+
+
+SCALE = 50            # 5 per 5s becomes 5 per 0.1s
+WINDOW = 5 / SCALE
+LIMIT = 5
+MATCHES = 3
+BALLS = 30
+BALL_GAP = 8 / SCALE  # a ball (delivery + shot choice) every ~8s per match
+
+
+class RateLimited(Exception):
+    status = 429
+
+    def __init__(self, retry_after):
+        super().__init__("429 Too Many Requests")
+        self.retry_after = retry_after
+
+
+class Message:
+    def __init__(self, channel):
+        self.channel = channel
+        self.id = id(self)
+
+    async def edit(self, **kwargs):
+        await self.channel.hit()
+
+
+class RateLimitedChannel:
+    """Sliding-window limit like Discord's per-channel message bucket"""
+
+    def __init__(self):
+        self.id = 1
+        self.calls = []
+        self.rejected = 0
+
+    async def hit(self):
+        now = time.monotonic()
+        self.calls = [t for t in self.calls if now - t < WINDOW]
+        if len(self.calls) >= LIMIT:
+            self.rejected += 1
+            raise RateLimited(WINDOW - (now - self.calls[0]))
+        self.calls.append(now)
+        await asyncio.sleep(0.001)
+
+    async def send(self, content=None, **kwargs):
+        await self.hit()
+        return Message(self)
+
+
+async def direct(channel, action):
+    """What the library does on a 429: sleep retry_after and try again"""
+    while True:
+        try:
+            return await action()
+        except RateLimited as e:
+            await asyncio.sleep(e.retry_after)
+
+
+async def play_match(channel, scheduler, rng, latencies, delivered):
+    scoreboard = await channel.send("scoreboard")
+    for ball in range(BALLS):
+        await asyncio.sleep(BALL_GAP * rng.uniform(0.5, 1.5))
+        start = time.monotonic()
+        if scheduler:
+            await scheduler.send(channel, "shot prompt", priority=PROMPT)
+        else:
+            await direct(channel, lambda: channel.send("shot prompt"))
+        latencies.append(time.monotonic() - start)
+
+        # Result, scoreboard edit and (on boundaries/wickets) a GIF and a card
+        decorative = rng.random() < 0.35
+        if scheduler:
+            scheduler.send(channel, "result", priority=RESULT)
+            scheduler.edit(scoreboard, collapse_key=('scoreboard', scoreboard.id), embed=ball)
+            if decorative:
+                for _ in range(2):
+                    future = scheduler.send(channel, "gif", priority=DECORATIVE)
+                    future.add_done_callback(lambda f: delivered.append(f.result() is not None))
+        else:
+            await direct(channel, lambda: channel.send("result"))
+            await direct(channel, lambda: scoreboard.edit(embed=ball))
+            if decorative:
+                for _ in range(2):
+                    await direct(channel, lambda: channel.send("gif"))
+                    delivered.append(True)
+
+
+async def scenario(label, scheduled):
+    rng = random.Random(11)
+    channel = RateLimitedChannel()
+    scheduler = OutboundScheduler(
+        rate=OUTBOUND_SETTINGS['rate'] * SCALE, burst=OUTBOUND_SETTINGS['burst'],
+        decorative_ttl=OUTBOUND_SETTINGS['decorative_ttl'] / SCALE,
+        pressure_depth=OUTBOUND_SETTINGS['pressure_depth']
+    ) if scheduled else None
+    latencies, delivered = [], []
+    start = time.monotonic()
+    await asyncio.gather(*(play_match(channel, scheduler, rng, latencies, delivered) for _ in range(MATCHES)))
+    if scheduler:
+        while scheduler.stats()['totals']['depth']:
+            await asyncio.sleep(0.01)
+    elapsed = time.monotonic() - start
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)]
+    print(f"{label:<10} {elapsed * SCALE:6.0f}s match time | 429s: {channel.rejected:4d} | "
+          f"prompt wait p50 {statistics.median(latencies) * SCALE:5.2f}s p95 {p95 * SCALE:5.2f}s | "
+          f"decorative delivered {sum(delivered)}/{len(delivered)}")
+    if scheduler:
+        totals = scheduler.stats()['totals']
+        print(f"{'':<10} collapsed edits {totals['collapsed']} | dropped {totals['dropped']} | "
+              f"max wait {totals['wait_max'] * SCALE:.2f}s")
+
+
+async def run():
+    print(f"{MATCHES} matches x {BALLS} balls in one channel (times shown unscaled)\n")
+    await scenario("direct", scheduled=False)
+    await scenario("scheduler", scheduled=True)
+
+
+if __name__ == '__main__':
+    asyncio.run(run())
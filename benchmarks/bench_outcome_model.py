@@ -0,0 +1,75 @@
+"""
+Outcome Model Benchmark
+Per-ball cost of the old calculate_outcome (dict rebuilt + random.choices every ball)
+against the precompiled OutcomeModel tables
+
+Run with: python -m benchmarks.bench_outcome_model
+"""
+import random
+import time
+
+from game.outcome_model import OutcomeModel, outcome_model, rating_bucket
+from game.rules import SHOTS, FAST_DELIVERIES, sample_outcome
+
+
+BALLS = 500000
+
+
+def legacy_calculate_outcome(shot, bowl_type):
+    """calculate_outcome as it was before the outcome model"""
+    outcomes = {
+        'defend': [('dot', 70), (1, 25), ('wicket', 5)],
+        'drive': [(4, 30), (2, 25), (1, 20), ('dot', 15), ('wicket', 10)],
+        'loft': [(6, 25), (4, 20), (1, 15), ('wicket', 40)],
+        'sweep': [(4, 30), (2, 25), (1, 20), ('wicket', 25)],
+        'cut': [(4, 35), (2, 20), (1, 25), ('dot', 10), ('wicket', 10)],
+        'leave': [('dot', 95), ('wicket', 5)],
+        'pull': [(6, 20), (4, 30), (1, 20), ('wicket', 30)],
+        'flick': [(2, 30), (1, 40), (4, 15), ('wicket', 15)]
+    }
+
+    weights = outcomes.get(shot, [('dot', 50), (1, 30), ('wicket', 20)])
+    choices, probs = zip(*weights)
+    return random.choices(choices, weights=probs)[0]
+
+
+def per_ball(label, fn, balls):
+    start = time.perf_counter()
+    for shot, delivery, batting, bowling in balls:
+        fn(shot, delivery, batting, bowling)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<44} {elapsed / len(balls) * 1e9:8.0f} ns/ball")
+    return elapsed
+
+
+def run():
+    start = time.perf_counter()
+    model = OutcomeModel()
+    print(f"Compiled {len(model.tables):,} outcome tables in {(time.perf_counter() - start) * 1000:.0f}ms\n")
+
+    rng = random.Random(3)
+    balls = [
+        (rng.choice(SHOTS), rng.choice(FAST_DELIVERIES), rng.randint(40, 98), rng.randint(40, 98))
+        for _ in range(BALLS)
+    ]
+    offset = outcome_model.condition_offset('hard', 'Grassy', {'pitch_impact': -0.1})
+
+    print(f"{BALLS:,} balls")
+    before = per_ball("before: legacy calculate_outcome", lambda s, d, bat, bowl: legacy_calculate_outcome(s, d), balls)
+    per_ball("flat tables: rules.sample_outcome (bisect)", lambda s, d, bat, bowl: sample_outcome(s), balls)
+    per_ball(
+        "model.sample (raw ratings + conditions)",
+        lambda s, d, bat, bowl: outcome_model.sample(s, d, bat, bowl, 'hard', 'Grassy', {'pitch_impact': -0.1}),
+        balls
+    )
+    bucketed = [(s, d, rating_bucket(bat), rating_bucket(bowl)) for s, d, bat, bowl in balls]
+    after = per_ball(
+        "after: situation_index + sample_index",
+        lambda s, d, bb, wb: outcome_model.sample_index(outcome_model.situation_index(s, d, bb, wb, offset)),
+        bucketed
+    )
+    print(f"\nSpeedup (engine path): {before / after:.1f}x")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,81 @@
+"""
+Player Catalog Benchmark
+Compares the old linear get_player_by_id scan with PlayerCatalog lookups
+
+Run with: python -m benchmarks.bench_player_catalog
+"""
+import random
+import time
+
+from data.catalog import PlayerCatalog
+
+
+ROLES = {
+    "batsmen": ("bat", "batsman"),
+    "bowlers": ("bowl", "bowler"),
+    "all_rounders": ("ar", "all_rounder"),
+    "wicket_keepers": ("wk", "wicket_keeper"),
+}
+COUNTRIES = ['🇮🇳', '🇦🇺', '🏴', '🇳🇿', '🇿🇦', '🇵🇰', '🇱🇰', '🇧🇩', '🇦🇫', '🇼🇮']
+LOOKUPS = 20000
+
+
+def make_players(count, seed=42):
+    """Synthesize a role-keyed catalog of `count` players"""
+    rng = random.Random(seed)
+    database = {key: [] for key in ROLES}
+    keys = list(ROLES.keys())
+    for i in range(count):
+        key = keys[i % len(keys)]
+        prefix, role = ROLES[key]
+        database[key].append({
+            'id': f'{prefix}_{i:06d}',
+            'name': f'Player {i}',
+            'country': rng.choice(COUNTRIES),
+            'role': role,
+            'batting': rng.randint(40, 98),
+            'bowling': rng.randint(15, 98),
+            'overseas': rng.random() < 0.5,
+        })
+    return database
+
+
+def linear_get_player_by_id(database, player_id):
+    """The pre-catalog implementation: scan every role list"""
+    for category in database.values():
+        for player in category:
+            if player['id'] == player_id:
+                return player
+    return None
+
+
+def time_lookups(lookup, ids):
+    start = time.perf_counter()
+    for pid in ids:
+        lookup(pid)
+    return (time.perf_counter() - start) / len(ids)
+
+
+def run(sizes=(1000, 10000, 100000)):
+    print(f"{'players':>8} {'build ms':>10} {'linear us':>11} {'catalog us':>11} {'speedup':>9}")
+    for size in sizes:
+        database = make_players(size)
+
+        start = time.perf_counter()
+        catalog = PlayerCatalog(database)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        rng = random.Random(size)
+        all_ids = [p['id'] for p in catalog.all()]
+        ids = [rng.choice(all_ids) for _ in range(LOOKUPS)]
+        # The linear scan gets slow fast; sample fewer lookups at large sizes
+        linear_ids = ids[:max(50, LOOKUPS * 1000 // size)]
+
+        linear = time_lookups(lambda pid: linear_get_player_by_id(database, pid), linear_ids)
+        indexed = time_lookups(catalog.get, ids)
+
+        print(f"{size:>8} {build_ms:>10.1f} {linear * 1e6:>11.2f} {indexed * 1e6:>11.3f} {linear / indexed:>8.0f}x")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,249 @@
+"""
+Storage Backend Benchmark
+Runs the bot's database workload through Database on MongoDB and on the embedded SQLite store, checks both return the same answers, and compares latency
+
+SQLite always runs (in a temporary file). MongoDB runs when MONGODB_URI is reachable, in a scratch
+database that is dropped afterwards. Any answer that differs between the two is printed and the
+exit status is 1, so this doubles as the backend parity check.
+
+Run with: python -m benchmarks.bench_storage [users] [matches]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError
+
+from config import MONGODB_URI
+from database.db import Database
+from database.indexes import ensure_indexes
+from database.sqlite_store import SQLiteClient
+
+
+SCRATCH_DB = 'cricket_bot_bench'
+# Set from the clock or generated per backend, so never compared
+VOLATILE = {'_id', 'created_at', 'updated_at', 'timestamp', 'acquired_at', 'last_active', 'expires_at', 'as_of', 'date'}
+PLAYERS = [{"id": n, "name": f"Player {n}", "role": "Batsman", "rating": 70 + n} for n in range(15)]
+
+
+def normalise(value):
+    if isinstance(value, dict):
+        return {k: normalise(v) for k, v in value.items() if k not in VOLATILE}
+    if isinstance(value, (list, tuple)):
+        return [normalise(v) for v in value]
+    if isinstance(value, ObjectId):
+        return 'ObjectId'
+    return value
+
+
+def ranked(entries, *keys):
+    """Leaderboards: the ranking keys in order, and the entries as a set (ties may come back in either order)"""
+    return {
+        'order': [[entry.get(key) for key in keys] for entry in entries],
+        'entries': sorted((normalise(entry) for entry in entries), key=repr)
+    }
+
+
+def match_data(i, users):
+    a, b = f"bench_{i % users}", f"bench_{(i * 7 + 1) % users}"
+    if a == b:
+        b = f"bench_{(i + 1) % users}"
+    winner = a if i % 3 else b
+    return {
+        "team1_user": a, "team1_name": f"Team {a}", "team1_score": f"{140 + i % 30}/{i % 10}", "team1_overs": "20.0",
+        "team2_user": b, "team2_name": f"Team {b}", "team2_score": f"{130 + i % 25}/{(i + 3) % 10}", "team2_overs": "20.0",
+        "winner_id": winner, "winner_name": f"Team {winner}", "win_by": "5 runs", "venue": "Lord's", "overs": 20,
+        "match_type": "20-over match", "guild_id": "bench_guild" if i % 2 else "bench_guild_2"
+    }
+
+
+async def duplicate_rejected(collection, user_id):
+    try:
+        await collection.insert_one({"user_id": user_id})
+    except DuplicateKeyError:
+        return True
+    return False
+
+
+class Run:
+    """One backend's answers and per-operation latencies"""
+
+    def __init__(self, label, db):
+        self.label = label
+        self.db = db
+        self.results = {}
+        self.latency = {}
+
+    async def op(self, name, awaitable, check=None):
+        start = time.perf_counter()
+        value = await awaitable
+        self.latency.setdefault(name, []).append(time.perf_counter() - start)
+        if check is not None:
+            self.results[check] = normalise(value)
+        return value
+
+
+async def workload(run, users, matches):
+    db = run.db
+    ids = [f"bench_{u}" for u in range(users)]
+
+    for user_id in ids:
+        await run.op('create_user_team', db.create_user_team(user_id, f"Team {user_id}", PLAYERS))
+        await run.op('set_playing_xi', db.set_playing_xi(user_id, [p['id'] for p in PLAYERS[:11]]))
+        await run.op('add_coins', db.add_coins(user_id, 20000, "Bench"), f"add_coins:{user_id}")
+
+    for i in range(matches):
+        match = match_data(i, users)
+        loser = match['team2_user'] if match['winner_id'] == match['team1_user'] else match['team1_user']
+        await run.op('save_match', db.save_match(match))
+        await run.op('update_match_result', db.update_match_result(match['winner_id'], True, match))
+        await run.op('update_match_result', db.update_match_result(loser, False, match))
+        await run.op('award_match_coins', db.award_match_coins(match['winner_id'], 500, "Match victory"), f"award:{i}")
+
+    for n, user_id in enumerate(ids):
+        # Some of these overdraw and must come back None on both backends
+        await run.op('remove_coins', db.remove_coins(user_id, 5000 * (n % 6), "Bench"), f"remove:{user_id}")
+        await run.op('purchase_items', db.purchase_items(user_id, 1000, [("boost", {"n": n})], "Bench"),
+                     f"purchase:{user_id}")
+
+    # Reads with a cold profile cache, so every one reaches the backend
+    for user_id in ids:
+        db.profile_cache.clear()
+        await run.op('get_user_team', db.get_user_team(user_id), f"team:{user_id}")
+        await run.op('get_user_balance', db.get_user_balance(user_id), f"balance:{user_id}")
+        await run.op('get_user_stats', db.get_user_stats(user_id), f"stats:{user_id}")
+        page = await run.op('get_user_matches', db.get_user_matches(user_id, limit=5), f"matches:{user_id}")
+        if len(page) == 5:
+            before = (page[-1]['created_at'], page[-1]['_id'])
+            await run.op('get_user_matches', db.get_user_matches(user_id, limit=5, before=before), f"matches2:{user_id}")
+    db.profile_cache.clear()
+    await run.op('get_user_teams', db.get_user_teams(*ids[:10]), 'teams_batch')
+
+    db.leaderboard_cache.clear()
+    run.results['leaderboard'] = ranked(await run.op('get_leaderboard', db.get_leaderboard(limit=users)), 'wins')
+    run.results['guild_leaderboard'] = ranked(
+        await run.op('get_leaderboard', db.get_leaderboard('bench_guild', limit=users)), 'wins', 'matches_played'
+    )
+    run.results['weekly_leaderboard'] = ranked(
+        await run.op('get_leaderboard_by_period', db.get_leaderboard_by_period('weekly', limit=users)),
+        'wins', 'matches_played'
+    )
+
+    # Inventory cards, the trade path's lookup and transfer, and a keyset page
+    await run.op('add_item_to_inventory', db.add_item_to_inventory(ids[0], 'players', {'players': PLAYERS[:2]}))
+    await run.op('add_item_to_inventory', db.add_item_to_inventory(ids[0], 'players', {'players': [PLAYERS[2]]}))
+    card = await run.op('find_owned_player', db.find_owned_player(ids[0], [PLAYERS[0]['id'], PLAYERS[5]['id']]), 'owned')
+    await run.op('transfer_player', db.transfer_player(ids[0], ids[1], card['_id']), 'transfer')
+    await run.op('transfer_player', db.transfer_player(ids[0], ids[1], card['_id']), 'transfer_again')
+    await run.op('get_owned_player_ids', db.get_owned_player_ids(ids[0]), 'owned_ids')
+    await run.op('count_inventory', db.count_inventory(ids[0]), 'inventory_counts')
+    await run.op('get_user_inventory', db.get_user_inventory(ids[0]), 'inventory')
+
+    # Trades looked up from either side
+    await run.op('insert_one', db.db.trades.insert_one({"sender_id": ids[0], "receiver_id": ids[1], "status": "pending"}))
+    await run.op('insert_one', db.db.trades.insert_one({"sender_id": ids[2], "receiver_id": ids[0], "status": "pending"}))
+    trades = await run.op('find', db.db.trades.find({
+        "$or": [{"sender_id": ids[0], "status": "pending"}, {"receiver_id": ids[0], "status": "pending"}]
+    }).to_list(length=None))
+    run.results['trades'] = sorted((normalise(t) for t in trades), key=repr)
+
+    # Motor-style single field index given as a plain string
+    await run.op('create_index', db.db.bench_scratch.create_index("user_id", unique=True), 'create_index')
+    await run.op('insert_one', db.db.bench_scratch.insert_one({"user_id": ids[0]}))
+    await run.op('insert_one', duplicate_rejected(db.db.bench_scratch, ids[0]), 'create_index_unique')
+
+    # Bans
+    await run.op('update_one', db.db.bans.update_one({"user_id": ids[3]}, {"$set": {"reason": "bench"}}, upsert=True))
+    run.results['bans'] = normalise(await run.op('find', db.db.bans.find({}, {'user_id': 1, 'reason': 1}).to_list(length=None)))
+    await run.op('delete_one', db.db.bans.delete_one({"user_id": ids[3]}))
+
+    # Auction: $addToSet, indexed array $set and the positional "$" update
+    auction_id = await run.op('create_auction', db.create_auction('bench_guild', [dict(p) for p in PLAYERS[:3]], ids[0]))
+    for user_id in ids[:2]:
+        await run.op('add_auction_participant', db.add_auction_participant(auction_id, user_id, user_id))
+    await run.op('place_bid', db.place_bid(auction_id, ids[1], 2500), 'bid')
+    await run.op('close_current_bid', db.close_current_bid(auction_id))
+    run.results['auction'] = normalise(await run.op('get_active_auction', db.get_active_auction('bench_guild')))
+
+    await db.ledger.flush()
+    for collection in ('teams', 'matches', 'economy', 'inventory', 'transactions', 'leaderboards', 'guild_members'):
+        run.results[f"count:{collection}"] = await run.op('count_documents', db.db[collection].count_documents({}))
+
+
+async def run_backend(label, client, users, matches, spool_dir):
+    db = Database()
+    db.client = client
+    db.db = client[SCRATCH_DB]
+    db.ledger.spool_path = os.path.join(spool_dir, f"{label}_ledger_spool.jsonl")
+    run = Run(label, db)
+    try:
+        await ensure_indexes(db.db)
+        start = time.perf_counter()
+        await workload(run, users, matches)
+        print(f"{label:<8} workload {time.perf_counter() - start:6.2f}s")
+    finally:
+        await db.ledger.close()
+        await client.drop_database(SCRATCH_DB)
+        client.close()
+    return run
+
+
+async def mongo_client():
+    if not MONGODB_URI:
+        return None
+    client = AsyncIOMotorClient(MONGODB_URI, serverSelectionTimeoutMS=2000)
+    try:
+        await client[SCRATCH_DB].command('ping')
+    except Exception as e:
+        print(f"MongoDB not reachable ({e}); running SQLite only\n")
+        client.close()
+        return None
+    return client
+
+
+def report(runs):
+    header = f"{'operation':<26}" + ''.join(f"{run.label + ' p50':>14}{'p95':>10}" for run in runs)
+    print(f"\n{header}\n{'-' * len(header)}")
+    for name in runs[0].latency:
+        row = f"{name:<26}"
+        for run in runs:
+            samples = sorted(run.latency.get(name, [0.0]))
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            row += f"{statistics.median(samples) * 1000:12.2f}ms{p95 * 1000:8.2f}ms"
+        print(row)
+
+
+def parity(runs):
+    """Keys whose answers differ between backends"""
+    if len(runs) < 2:
+        return []
+    mongo, sqlite = runs
+    return [key for key in mongo.results if mongo.results[key] != sqlite.results.get(key)]
+
+
+async def run(users=50, matches=300):
+    print(f"{users} users, {matches} matches\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = []
+        client = await mongo_client()
+        if client:
+            runs.append(await run_backend('mongodb', client, users, matches, tmp))
+        runs.append(await run_backend('sqlite', SQLiteClient(os.path.join(tmp, 'bench.sqlite3')), users, matches, tmp))
+
+    report(runs)
+    differences = parity(runs)
+    if len(runs) > 1:
+        print(f"\nParity: {len(runs[0].results) - len(differences)}/{len(runs[0].results)} answers identical")
+    for key in differences:
+        print(f"  ✗ {key}\n    mongodb: {runs[0].results[key]}\n    sqlite:  {runs[1].results.get(key)}")
+    return not differences
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    sys.exit(0 if asyncio.run(run(*args)) else 1)
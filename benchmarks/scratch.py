@@ -0,0 +1,43 @@
+"""
+Scratch Database
+Opens the benchmarks' scratch database on the backend STORAGE_SETTINGS selects, so STORAGE_BACKEND=sqlite runs them offline
+"""
+import atexit
+import os
+import shutil
+import tempfile
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from config import MONGODB_URI, STORAGE_SETTINGS
+from database.sqlite_store import SQLiteClient
+
+
+SCRATCH_DB = 'cricket_bot_bench'
+BACKEND = STORAGE_SETTINGS['backend']
+
+# One temporary directory per run, removed at exit
+_sqlite_dir = None
+
+
+def scratch_client(event_listeners=(), **mongo_options):
+    """
+    A client for the scratch database: AsyncIOMotorClient on MONGODB_URI, or with
+    STORAGE_BACKEND=sqlite a SQLiteClient on a temporary file (every client shares it)
+
+    Args:
+        event_listeners (list): Driver listeners; the SQLite store only takes command listeners
+        **mongo_options: Extra AsyncIOMotorClient options such as pool sizes (ignored by SQLite)
+    """
+    if BACKEND != 'sqlite':
+        return AsyncIOMotorClient(MONGODB_URI, event_listeners=list(event_listeners), **mongo_options)
+    global _sqlite_dir
+    if _sqlite_dir is None:
+        _sqlite_dir = tempfile.mkdtemp(prefix='cricket_bot_bench_')
+        atexit.register(shutil.rmtree, _sqlite_dir, True)
+    return SQLiteClient(
+        os.path.join(_sqlite_dir, 'bench.sqlite3'),
+        event_listeners=[listener for listener in event_listeners if isinstance(listener, monitoring.CommandListener)],
+        cache_mb=STORAGE_SETTINGS['sqlite_cache_mb']
+    )
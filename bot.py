@@ -4,11 +4,15 @@ Cric Mater Discord Bot - Main Bot File
 import discord
 from discord.ext import commands
 import asyncio
+import signal
 import sys
 
-from config import DISCORD_TOKEN
+from config import DISCORD_TOKEN, MATCH_TYPES
 from database.db import db
-from data.players import get_player_by_id
+from data.players import CATALOG, get_player_by_id
+from game.win_probability import preload as preload_win_probability
+from utils.match_checkpoint import checkpoint_writer
+from utils.ban_cache import ban_cache
 
 
 # Bot setup
@@ -40,9 +44,20 @@ async def on_ready():
                         player['batting'] = int(o['batting'])
                     if 'bowling' in o:
                         player['bowling'] = int(o['bowling'])
+                    CATALOG.refresh(pid)
     except Exception as e:
         print(f"⚠️ Failed to load player overrides: {e}")
     
+    # Every ban in memory: the global command check never queries the database
+    if await ban_cache.load():
+        print(f"🔨 Loaded {len(ban_cache.bans)} bans")
+    ban_cache.start()
+    
+    # Build (first run) or memory-map the win probability table for every format
+    formats = [m['overs'] for m in MATCH_TYPES.values()]
+    loaded = await asyncio.to_thread(preload_win_probability, formats)
+    print(f"🔮 Win probability tables ready for {loaded} formats")
+    
     # Load cogs
     await load_cogs()
     
@@ -87,17 +102,31 @@ async def globally_check_bans(ctx):
     if ctx.guild is None:
         return True
     
-    # Check if user is banned
-    ban = await db.db.bans.find_one({"user_id": str(ctx.author.id)})
+    # Check if user is banned (in-memory; falls back to the database until the cache loads)
+    reason = await ban_cache.get_reason(ctx.author.id)
     
-    if ban:
+    if reason is not None:
         await ctx.send("🔨 **You are banned from using this bot!**\n"
-                      f"**Reason:** {ban.get('reason', 'No reason provided')}")
+                      f"**Reason:** {reason}")
         return False
     
     return True
 
 
+@bot.before_invoke
+async def count_queries_start(ctx):
+    """Attribute the database commands issued from here on to this bot command"""
+    ctx.query_token = db.query_counter.begin(ctx.command.qualified_name)
+
+
+@bot.after_invoke
+async def count_queries_end(ctx):
+    """Fold this command's database command count into cmquerystats (runs even if the command failed)"""
+    token = getattr(ctx, 'query_token', None)
+    if token is not None:
+        db.query_counter.end(token)
+
+
 @bot.event
 async def on_command_error(ctx, error):
     """Handle command errors"""
@@ -129,13 +158,31 @@ async def on_resumed():
     print('✅ Bot reconnected')
 
 
+async def drain_and_close():
+    """Drain shutdown: refuse new matches, flush every live match checkpoint, then disconnect"""
+    print('🛑 Draining before shutdown...')
+    await checkpoint_writer.drain()
+    await bot.close()
+
+
 async def main():
     """Main entry point"""
+    # Redeploys send SIGTERM: drain so live matches resume after the restart
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, lambda: asyncio.create_task(drain_and_close()))
+        except NotImplementedError:
+            # Windows event loops don't support signal handlers
+            pass
+    
     try:
         async with bot:
             await bot.start(DISCORD_TOKEN)
+        await db.close()
     except KeyboardInterrupt:
         print('\n⚠️ Shutting down bot...')
+        await checkpoint_writer.drain()
         await db.close()
         await bot.close()
     except Exception as e:
@@ -12,8 +12,13 @@ from datetime import datetime, timedelta
 from config import ADMIN_IDS, COLORS, AUCTION_SETTINGS, ECONOMY_SETTINGS
 from database.db import db
 from data.players import get_all_players
-from data.players import get_player_by_id, search_players
+from data.players import CATALOG, get_player_by_id, search_players
 from utils.ovr_calculator import calculate_ovr
+from utils.draw_engine import draw_engine
+from utils.outbound import outbound
+from database.indexes import index_usage
+from database.career import backfill_career_stats
+from utils.ban_cache import ban_cache
 from datetime import datetime
 
 class AdminCommands(commands.Cog):
@@ -272,13 +277,17 @@ class AdminCommands(commands.Cog):
             await ctx.send("❌ You don't have permission to use this command!")
             return
         
-        # Store ban in database
-        await db.db.bans.insert_one({
-            "user_id": str(member.id),
-            "banned_by": str(ctx.author.id),
-            "reason": reason,
-            "timestamp": discord.utils.utcnow()
-        })
+        # Store ban in database (banning again updates the reason; user_id is unique)
+        await db.db.bans.update_one(
+            {"user_id": str(member.id)},
+            {"$set": {
+                "banned_by": str(ctx.author.id),
+                "reason": reason,
+                "timestamp": discord.utils.utcnow()
+            }},
+            upsert=True
+        )
+        ban_cache.add(member.id, reason)
         
         embed = discord.Embed(
             title="🔨 User Banned",
@@ -302,6 +311,7 @@ class AdminCommands(commands.Cog):
         
         # Remove ban from database
         result = await db.db.bans.delete_one({"user_id": user_id})
+        ban_cache.remove(user_id)
         
         if result.deleted_count > 0:
             await ctx.send(f"✅ User <@{user_id}> has been unbanned!")
@@ -335,6 +345,41 @@ class AdminCommands(commands.Cog):
         embed.add_field(name="🎪 Active Auctions", value=active_auctions, inline=True)
         embed.add_field(name="💰 Economy Users", value=total_economy, inline=True)
 
+        # Shared Motor connection pool
+        pool = db.pool_stats()
+        pool_text = (
+            f"Open: {pool['open']} (min {pool['min_pool_size']}, max {pool['max_pool_size']}) | "
+            f"In use: {pool['in_use']} (peak {pool['max_in_use']})\n"
+            f"Checkouts: {pool['checked_out']} | Wait avg {pool['wait_ms_avg']:.1f}ms, max {pool['wait_ms_max']:.1f}ms\n"
+            f"Created: {pool['created']} | Closed: {pool['closed']} | Failed checkouts: {pool['checkout_failed']}"
+        )
+        embed.add_field(name="🔌 Connection Pool", value=pool_text, inline=False)
+
+        bans = ban_cache.summary()
+        ban_text = (
+            f"{bans['size']} bans cached | {bans['hits']:,} hits, {bans['misses']:,} misses ({bans['hit_rate']:.1%}) | "
+            f"{bans['blocked']} blocked | {bans['refreshes']} refreshes, {bans['refresh_errors']} failed"
+        )
+        embed.add_field(name="🔨 Ban Cache", value=ban_text, inline=False)
+
+        profiles = db.profile_cache.summary()
+        profile_text = (
+            f"{profiles['size']:,}/{profiles['max_entries']:,} documents | {profiles['hits']:,} hits, "
+            f"{profiles['coalesced']:,} coalesced, {profiles['misses']:,} misses ({profiles['hit_rate']:.1%})\n"
+            f"{profiles['write_through']:,} write-through, {profiles['invalidated']:,} invalidated, "
+            f"{profiles['expired']:,} expired, {profiles['evicted']:,} evicted"
+        )
+        embed.add_field(name="🗃️ Profile Cache", value=profile_text, inline=False)
+
+        ledger = db.ledger.summary()
+        ledger_text = (
+            f"{ledger['written']:,}/{ledger['recorded']:,} written in {ledger['batches']:,} batches "
+            f"(avg {ledger['flush_ms_avg']:.1f}ms, max {ledger['flush_ms_max']:.1f}ms) | {ledger['write_errors']} failed\n"
+            f"Backlog {ledger['buffered']:,} (peak {ledger['max_buffered']:,}, high water {ledger['high_water']:,}, "
+            f"hit {ledger['high_water_events']}x) | oldest {ledger['oldest_age_s']:.1f}s | {ledger['recovered']:,} recovered"
+        )
+        embed.add_field(name="📒 Ledger", value=ledger_text, inline=False)
+
         # Show leaderboard for matches played
         leaderboard = await self.get_leaderboard('matches_played', top_n=5)
         lb_text = "\n".join([f"{idx+1}. <@{user['user_id']}> - {user['matches_played']} matches" for idx, user in enumerate(leaderboard)]) if leaderboard else "No data yet."
@@ -342,6 +387,131 @@ class AdminCommands(commands.Cog):
 
         await ctx.send(embed=embed)
 
+    @commands.command(name='indexstats')
+    @commands.has_permissions(administrator=True)
+    async def index_stats(self, ctx):
+        """
+        Show index usage per collection ($indexStats)
+        Usage: cmindexstats
+        """
+        if not self.is_admin(ctx.author.id):
+            await ctx.send("❌ You don't have permission to use this command!")
+            return
+
+        usage = await index_usage(db.db)
+        if not usage:
+            await ctx.send("❌ No index statistics available!")
+            return
+
+        embed = discord.Embed(
+            title="🗂️ Index Usage",
+            description=f"{len(usage)} indexes | operations since {min(u['since'] for u in usage).strftime('%d %b %Y %H:%M')} UTC",
+            color=COLORS['info']
+        )
+
+        by_collection = {}
+        for u in usage:
+            by_collection.setdefault(u['collection'], []).append(u)
+        for collection, indexes in sorted(by_collection.items()):
+            lines = [f"`{u['name']}` {u['ops']:,} ops{' ⚠️ unused' if u['ops'] == 0 and u['name'] != '_id_' else ''}"
+                     for u in sorted(indexes, key=lambda u: -u['ops'])]
+            embed.add_field(name=collection, value="\n".join(lines), inline=True)
+
+        await ctx.send(embed=embed)
+
+    @commands.command(name='querystats')
+    @commands.has_permissions(administrator=True)
+    async def query_stats(self, ctx):
+        """
+        Show database queries per command
+        Usage: cmquerystats
+        """
+        if not self.is_admin(ctx.author.id):
+            await ctx.send("❌ You don't have permission to use this command!")
+            return
+
+        rows = db.query_counter.summary(top=15)
+        embed = discord.Embed(
+            title="🔎 Queries per Command",
+            description=f"{db.query_counter.total:,} database commands since startup",
+            color=COLORS['info']
+        )
+        if rows:
+            lines = [f"`{name}` {avg:.1f} avg, {peak} max ({calls:,} calls)" for name, calls, avg, peak in rows]
+            embed.add_field(name="Most queries per call", value="\n".join(lines), inline=False)
+        loader_lines = []
+        for name, loader in db.loaders.items():
+            stats = loader.summary()
+            loader_lines.append(f"`{name}` {stats['loads']:,} loads → {stats['batches']:,} queries "
+                                f"({stats['keys_per_batch']:.2f} keys/query)")
+        embed.add_field(name="Batched loaders", value="\n".join(loader_lines), inline=False)
+        await ctx.send(embed=embed)
+
+    @commands.command(name='rebuildstats')
+    @commands.has_permissions(administrator=True)
+    async def rebuild_stats(self, ctx):
+        """
+        Rebuild every user's career stats from match history
+        Usage: cmrebuildstats
+        """
+        if not self.is_admin(ctx.author.id):
+            await ctx.send("❌ You don't have permission to use this command!")
+            return
+
+        await ctx.send("⏳ Rebuilding career stats from match history (run this while no matches are live)...")
+        try:
+            result = await backfill_career_stats(db.db)
+        except Exception as e:
+            await ctx.send(f"❌ Rebuild failed: {e}")
+            return
+        db.profile_cache.clear()
+
+        embed = discord.Embed(
+            title="📊 Career Stats Rebuilt",
+            description=f"Read **{result['matches']:,}** matches and updated **{result['users']:,}** users",
+            color=COLORS['success']
+        )
+        embed.set_footer(text=f"As of {result['as_of'].strftime('%d %b %Y %H:%M')} UTC")
+        await ctx.send(embed=embed)
+
+    @commands.command(name='outboundstats')
+    @commands.has_permissions(administrator=True)
+    async def outbound_stats(self, ctx):
+        """
+        Show outbound message scheduler queues
+        Usage: cmoutboundstats
+        """
+        if not self.is_admin(ctx.author.id):
+            await ctx.send("❌ You don't have permission to use this command!")
+            return
+
+        stats = outbound.stats()
+        totals = stats['totals']
+        embed = discord.Embed(
+            title="📮 Outbound Scheduler",
+            description=f"{len(stats['channels'])} active channel queues | {outbound.rate}/s, burst {outbound.burst}",
+            color=COLORS['info']
+        )
+        embed.add_field(name="📤 Sent", value=totals['sent'], inline=True)
+        embed.add_field(name="📥 Queued", value=totals['depth'], inline=True)
+        embed.add_field(name="⏱️ Max Wait", value=f"{totals['wait_max']:.1f}s", inline=True)
+        embed.add_field(name="🔀 Collapsed Edits", value=totals['collapsed'], inline=True)
+        embed.add_field(name="🗑️ Dropped", value=totals['dropped'], inline=True)
+        embed.add_field(name="🚦 429s", value=totals['rate_limited'], inline=True)
+
+        busiest = sorted(stats['channels'].items(), key=lambda kv: kv[1]['depth'], reverse=True)[:5]
+        if busiest:
+            lines = []
+            for channel_id, s in busiest:
+                depth = s['depth_by_priority']
+                lines.append(
+                    f"<#{channel_id}> depth {s['depth']} (P{depth['prompt']}/R{depth['result']}/D{depth['decorative']}) "
+                    f"| avg wait {s['wait_avg']:.1f}s | max {s['wait_max']:.1f}s"
+                )
+            embed.add_field(name="Busiest Channels", value="\n".join(lines), inline=False)
+
+        await ctx.send(embed=embed)
+
     @commands.command(name='makeadmin')
     @commands.has_permissions(administrator=True)
     async def make_admin(self, ctx, member: discord.Member):
@@ -462,6 +632,7 @@ class AdminCommands(commands.Cog):
         else:
             # Apply batting change
             player['batting'] = new_bat
+        CATALOG.refresh(player['id'])
 
         # Persist override to DB so it survives restarts
         await db.db.player_overrides.update_one(
@@ -618,6 +789,7 @@ class AdminCommands(commands.Cog):
         # Report
         player['batting'] = int(new_bat)
         player['bowling'] = int(new_bowl)
+        CATALOG.refresh(player['id'])
         new_ovr = calculate_ovr(player)
         await ctx.send(f"✅ Updated **{player['name']}** — BAT: {player['batting']} | BOWL: {player['bowling']} • OVR: {new_ovr}")
     
@@ -668,11 +840,12 @@ class AdminCommands(commands.Cog):
                 return
             player = results[0]
 
-        # Remove override from DB
+        # Remove override from DB and restore baseline stats in memory
         result = await db.db.player_overrides.delete_one({"player_id": player['id']})
 
         if result.deleted_count > 0:
-            await ctx.send(f"✅ Removed persistent override for **{player['name']}**. Restart the bot or reload players to apply baseline stats.")
+            CATALOG.revert(player['id'])
+            await ctx.send(f"✅ Removed persistent override for **{player['name']}**. Baseline stats restored (BAT {player['batting']} / BOWL {player['bowling']}).")
         else:
             await ctx.send(f"⚠️ No persistent override found for **{player['name']}**.")
         
@@ -697,26 +870,21 @@ class AdminCommands(commands.Cog):
             await ctx.send("❌ Cannot remove coins from bots!")
             return
         
-        # Check balance
-        balance = await db.get_user_balance(member.id)
+        # Remove coins (only if they have enough)
+        remaining = await db.remove_coins(member.id, amount, f"Admin removal by {ctx.author.display_name}")
         
-        if balance < amount:
+        if remaining is None:
+            balance = await db.get_user_balance(member.id)
             await ctx.send(f"⚠️ {member.display_name} only has **{balance:,} coins**!")
             return
         
-        # Remove coins
-        success = await db.remove_coins(member.id, amount, f"Admin removal by {ctx.author.display_name}")
-        
-        if success:
-            embed = discord.Embed(
-                title="💸 Coins Removed!",
-                description=f"Removed **{amount:,} coins** from {member.mention}!",
-                color=COLORS['danger']
-            )
-            embed.add_field(name="Remaining", value=f"{balance - amount:,} coins", inline=False)
-            await ctx.send(embed=embed)
-        else:
-            await ctx.send("❌ Failed to remove coins!")
+        embed = discord.Embed(
+            title="💸 Coins Removed!",
+            description=f"Removed **{amount:,} coins** from {member.mention}!",
+            color=COLORS['danger']
+        )
+        embed.add_field(name="Remaining", value=f"{remaining:,} coins", inline=False)
+        await ctx.send(embed=embed)
     
     @commands.command(name='setcoins')
     @commands.has_permissions(administrator=True)
@@ -751,6 +919,7 @@ class AdminCommands(commands.Cog):
             },
             upsert=True
         )
+        db.invalidate_profile(member.id, 'economy')
         
         embed = discord.Embed(
             title="⚙️ Balance Updated!",
@@ -779,6 +948,7 @@ class AdminCommands(commands.Cog):
         
         # Delete team
         result = await db.db.teams.delete_one({"user_id": str(member.id)})
+        db.invalidate_profile(member.id, 'teams')
         
         if result.deleted_count > 0:
             embed = discord.Embed(
@@ -1017,6 +1187,10 @@ class AdminCommands(commands.Cog):
             "⚙️ Configuration": {
                 "cmsetplayerprice \"Name\" [price]": "Set player's auction price",
                 "cmdbstats": "View database statistics",
+                "cmoutboundstats": "View message queue depth and wait times",
+                "cmindexstats": "View database index usage",
+                "cmrebuildstats": "Rebuild career stats from match history",
+                "cmquerystats": "View database queries per command",
             },
             "🎪 Auctions": {
                 "cmauction [num]": "Start regular auction",
@@ -1099,19 +1273,20 @@ class AdminCommands(commands.Cog):
         winners = random.sample(participants, min(num_winners, len(participants)))
         
         # Give players to winners
-        all_players = get_all_players()
         winner_details = []
         
         for winner in winners:
             # Generate random players
             giveaway_players = []
-            rarities = ['common', 'rare', 'epic', 'legendary']
-            weights = [50, 30, 15, 5]  # Rarity chances
+            cards, draw_seed = draw_engine.draw_cards(
+                'giveaway', 'pack', count=num_players,
+                context=f"giveaway user={winner.id}"
+            )
             
-            for _ in range(num_players):
-                rarity = random.choices(rarities, weights=weights)[0]
-                player = random.choice(all_players).copy()
+            for rarity, drawn_player in cards:
+                player = drawn_player.copy()
                 player['rarity'] = rarity
+                player['draw_seed'] = draw_seed
                 
                 # Apply rarity boosts
                 from config import PLAYER_RARITIES
@@ -1300,11 +1475,7 @@ class AdminCommands(commands.Cog):
         user_team = await db.get_user_team(int(user_id))
 
         # Sync inventory: add all owned player cards to squad if not present
-        inventory_items = await db.get_user_inventory(int(user_id))
-        owned_player_ids = set()
-        for item in inventory_items:
-            if item.get('item_id') == 'players':
-                owned_player_ids.update(p['id'] for p in item.get('data', {}).get('players', []))
+        owned_player_ids = await db.get_owned_player_ids(int(user_id))
         # Merge owned players with squad
         merged_squad = list(dict.fromkeys(unique_squad + list(owned_player_ids)))
 
@@ -1405,7 +1576,7 @@ class AdminCommands(commands.Cog):
 
                 embed.set_footer(text=f"Use !cmbid <amount> to bid | Auto-sells at {end_str}")
 
-                msg = await ctx.send(embed=embed)
+                msg = await outbound.send(ctx.channel, embed=embed)
 
                 # Live update loop: edit the message every few seconds to show remaining time and current bid
                 import math
@@ -1451,10 +1622,9 @@ class AdminCommands(commands.Cog):
 
                     live_embed.set_footer(text=f"Auto-sells in {timer_str} | Ends at {end_str}")
 
-                    try:
-                        await msg.edit(embed=live_embed)
-                    except Exception:
-                        pass
+                    # Queued behind match prompts; a backed-up channel only sends the newest countdown
+                    if msg:
+                        outbound.edit(msg, collapse_key=('auction', msg.id), embed=live_embed)
 
                     # Sleep until next update or until end
                     await asyncio.sleep(min(update_interval, max(1, remaining)))
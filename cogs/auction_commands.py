@@ -7,6 +7,7 @@ import asyncio
 
 from config import COLORS, AUCTION_SETTINGS
 from database.db import db
+from data.players import search_players
 
 
 class AuctionCommands(commands.Cog):
@@ -197,6 +198,7 @@ class AuctionCommands(commands.Cog):
             ctx.author.id,
             ctx.author.display_name
         )
+        await db.touch_guild_member(ctx.guild.id, ctx.author.id)
         
         embed = discord.Embed(
             title="✅ Joined Auction!",
@@ -224,42 +226,22 @@ class AuctionCommands(commands.Cog):
             await ctx.send("❌ You cannot trade with yourself!")
             return
         
-        # Get both users' inventories
-        sender_inventory = await db.get_user_inventory(ctx.author.id)
-        receiver_inventory = await db.get_user_inventory(target_user.id)
-        
-        # Find player to give
-        sender_players = sender_inventory.get('players', [])
-        give_player_obj = None
-        
-        for item in sender_players:
-            for player in item.get('players', []):
-                if give_player.lower() in player['name'].lower():
-                    give_player_obj = player
-                    break
-            if give_player_obj:
-                break
-        
-        if not give_player_obj:
+        # Match names against the catalog, then look the cards up by (owner_id, player_id)
+        give_card = await db.find_owned_player(ctx.author.id, [p['id'] for p in search_players(give_player)])
+        if not give_card:
             await ctx.send(f"❌ You don't own a player named '{give_player}'!")
             return
+        give_player_obj = give_card['data']
         
         # Check if receive player exists (if specified)
         receive_player_obj = None
+        receive_card = None
         if receive_player:
-            receiver_players = receiver_inventory.get('players', [])
-            
-            for item in receiver_players:
-                for player in item.get('players', []):
-                    if receive_player.lower() in player['name'].lower():
-                        receive_player_obj = player
-                        break
-                if receive_player_obj:
-                    break
-            
-            if not receive_player_obj:
+            receive_card = await db.find_owned_player(target_user.id, [p['id'] for p in search_players(receive_player)])
+            if not receive_card:
                 await ctx.send(f"❌ {target_user.display_name} doesn't own '{receive_player}'!")
                 return
+            receive_player_obj = receive_card['data']
         
         # Create trade offer
         trade_id = await db.db.trades.insert_one({
@@ -270,6 +252,9 @@ class AuctionCommands(commands.Cog):
             "receiver_name": target_user.display_name,
             "give_player": give_player_obj,
             "receive_player": receive_player_obj,
+            # The exact cards offered, so a second card of the same player is never the one moved
+            "give_card_id": give_card['_id'],
+            "receive_card_id": receive_card['_id'] if receive_card else None,
             "status": "pending",
             "created_at": discord.utils.utcnow()
         })
@@ -364,23 +349,17 @@ class AuctionCommands(commands.Cog):
             give_player = trade['give_player']
             receive_player = trade.get('receive_player')
             
-            # Remove players from inventories
-            await db.db.economy.update_one(
-                {"user_id": str(sender_id)},
-                {"$pull": {"items.players": {"players": {"$elemMatch": {"id": give_player['id']}}}}}
-            )
-            
-            if receive_player:
-                await db.db.economy.update_one(
-                    {"user_id": str(receiver_id)},
-                    {"$pull": {"items.players": {"players": {"$elemMatch": {"id": receive_player['id']}}}}}
-                )
+            give_card_id = trade.get('give_card_id')
             
-            # Add players to new inventories
-            await db.add_item_to_inventory(receiver_id, 'players', {'players': [give_player]})
+            # Move the offered cards; each move only succeeds if its owner still has that card
+            if not await db.transfer_player(sender_id, receiver_id, give_card_id):
+                await ctx.send(f"❌ {trade['sender_name']} no longer owns **{give_player['name']}**!")
+                return
             
-            if receive_player:
-                await db.add_item_to_inventory(sender_id, 'players', {'players': [receive_player]})
+            if receive_player and not await db.transfer_player(receiver_id, sender_id, trade.get('receive_card_id')):
+                await db.transfer_player(receiver_id, sender_id, give_card_id)
+                await ctx.send(f"❌ You no longer own **{receive_player['name']}**!")
+                return
             
             # Mark trade as completed
             await db.db.trades.update_one(
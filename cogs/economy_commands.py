@@ -4,13 +4,71 @@ Coins, Shop, Packs, and Rewards System
 """
 import discord
 from discord.ext import commands
-import random
 from datetime import datetime, timedelta
+from functools import partial
 
 from config import COLORS, ECONOMY_SETTINGS, SHOP_ITEMS, PLAYER_RARITIES
 from database.db import db
-from data.players import get_all_players, get_player_by_id
+from data.players import get_player_by_id
 from utils.image_generator import image_gen
+from utils.draw_engine import draw_engine
+from utils.keyset_pager import KeysetPager
+
+
+INVENTORY_PAGE_SIZE = 10
+
+
+class InventoryView(KeysetPager):
+    """Inventory pager, most recently acquired first"""
+    
+    def __init__(self, author):
+        super().__init__(author.id, partial(db.get_user_inventory, author.id), 'acquired_at', INVENTORY_PAGE_SIZE)
+        self.author = author
+        self.boosts = []
+        self.cards = 0
+        self.other_items = 0
+        self.balance = 0
+    
+    def build_embed(self):
+        embed = discord.Embed(
+            title=f"🎒 {self.author.display_name}'s Inventory",
+            color=COLORS['primary']
+        )
+        
+        # Active boosts
+        if self.boosts:
+            boost_text = ""
+            for boost in self.boosts:
+                expiry = boost['expiry']
+                time_left = (expiry - datetime.utcnow()).days
+                boost_text += f"• **{boost['type']}**: +{boost['value']} ({time_left} days left)\n"
+            embed.add_field(name="⚡ Active Boosts", value=boost_text, inline=False)
+        
+        if self.cards:
+            embed.add_field(name="👥 Player Cards", value=f"{self.cards} cards", inline=True)
+        if self.other_items:
+            embed.add_field(name="🎯 Items", value=f"{self.other_items} items", inline=True)
+        
+        if self.pages:
+            lines = []
+            for item in self.pages[self.page]:
+                data = item.get('data') or {}
+                if item.get('player_id') is not None:
+                    rarity = PLAYER_RARITIES.get(data.get('rarity'), {}).get('emoji', '🃏')
+                    lines.append(f"{rarity} **{data.get('name', 'Player')}** "
+                                 f"(BAT {data.get('batting', '?')} | BOWL {data.get('bowling', '?')})")
+                else:
+                    lines.append(f"• {data.get('name', item.get('item_id', 'Item'))}")
+            embed.add_field(
+                name="📦 Recently Acquired" if self.page == 0 else "📦 Older Items",
+                value="\n".join(lines),
+                inline=False
+            )
+        elif not self.boosts:
+            embed.description = "Your inventory is empty! Visit `cmshop` to buy items."
+        
+        embed.set_footer(text=f"Page {self.page + 1} | Balance: {self.balance:,} coins")
+        return embed
 
 
 class EconomyCommands(commands.Cog):
@@ -49,8 +107,8 @@ class EconomyCommands(commands.Cog):
                 embed.add_field(name="⚡ Active Boosts", value=boost_text, inline=False)
             
             # Items count
-            items = user_data.get('items', [])
-            embed.add_field(name="🎒 Items Owned", value=len(items), inline=True)
+            cards, other_items = await db.count_inventory(target.id)
+            embed.add_field(name="🎒 Items Owned", value=cards + other_items, inline=True)
         
         embed.set_thumbnail(url=target.display_avatar.url)
         embed.set_footer(text="Use cmshop to buy items!")
@@ -173,11 +231,12 @@ class EconomyCommands(commands.Cog):
         await ctx.send(embed=embed)
     
     @commands.command(name='buy')
-    async def buy_item(self, ctx, item_id: str):
+    async def buy_item(self, ctx, item_id: str, count: int = 1):
         """
         Buy an item from the shop
-        Usage: cmbuy [item_id]
+        Usage: cmbuy [item_id] [count]
         Example: cmbuy batting_boost
+        Example: cmbuy gold_pack 10
         """
         # Find item in shop
         item_data = None
@@ -204,25 +263,27 @@ class EconomyCommands(commands.Cog):
         if not item_data:
             await ctx.send("❌ Item not found! Use `cmshop` to see available items.")
             return
+        elif count != 1:
+            max_packs = ECONOMY_SETTINGS.get('max_bulk_packs', 50)
+            if category != 'packs':
+                await ctx.send("❌ Bulk buying is only available for packs!")
+            elif count < 1 or count > max_packs:
+                await ctx.send(f"❌ You can open between 1 and {max_packs} packs at once!")
+            else:
+                await self.open_packs_bulk(ctx, item_id, item_data, count)
+            return
         else:
             await ctx.send(f"🛒 You selected: {item_data['name']} for {item_data['price']} coins.")
         
-        # Check balance
-        balance = await db.get_user_balance(ctx.author.id)
+        # Check balance and debit in one step
         price = item_data['price']
+        new_balance = await db.remove_coins(ctx.author.id, price, f"Bought {item_data['name']}")
         
-        if balance < price:
+        if new_balance is None:
+            balance = await db.get_user_balance(ctx.author.id)
             await ctx.send(f"❌ Insufficient coins! You need {price:,} coins but have {balance:,}.")
             return
-        else:
-            await ctx.send(f"💰 Purchase successful! {price} coins deducted.")
-        
-        # Process purchase
-        success = await db.remove_coins(ctx.author.id, price, f"Bought {item_data['name']}")
-        
-        if not success:
-            await ctx.send("❌ Purchase failed! Please try again.")
-            return
+        await ctx.send(f"💰 Purchase successful! {price} coins deducted.")
         
         # Add item to inventory
         if category == 'stat_boosts':
@@ -253,7 +314,9 @@ class EconomyCommands(commands.Cog):
             
         elif category == 'packs':
             # Open pack immediately
-            players = await self.generate_pack_contents(item_data)
+            players = await self.generate_pack_contents(
+                item_data, context=f"buy {item_id} user={ctx.author.id}"
+            )
             await db.add_item_to_inventory(ctx.author.id, 'players', {'players': players})
 
             # Add players to user's team subs
@@ -300,51 +363,92 @@ class EconomyCommands(commands.Cog):
                 inline=False
             )
 
-            embed.set_footer(text=f"New balance: {balance - price:,} coins")
+            embed.set_footer(text=f"New balance: {balance - price:,} coins • Draw #{players[0]['draw_seed']}")
+        
+        await ctx.send(embed=embed)
+    
+    async def open_packs_bulk(self, ctx, item_id, item_data, count):
+        """Open `count` packs with one draw, one atomic debit and one squad update"""
+        total_price = item_data['price'] * count
+        players = await self.generate_pack_contents(
+            item_data, count=count, context=f"buy {item_id} x{count} user={ctx.author.id}"
+        )
+        
+        # Same inventory shape as single purchases: one entry per opened pack
+        user = await db.purchase_items(
+            ctx.author.id,
+            total_price,
+            [('players', {'players': [player]}) for player in players],
+            f"Bought {count}x {item_data['name']}"
+        )
+        
+        if not user:
+            balance = await db.get_user_balance(ctx.author.id)
+            await ctx.send(f"❌ Insufficient coins! You need {total_price:,} coins but have {balance:,}.")
+            return
+        
+        added = await db.add_players_to_squad(
+            ctx.author.id, f"{ctx.author.name}'s Team", [p['id'] for p in players]
+        )
+        
+        rarity_order = ['legendary', 'epic', 'rare', 'common']
+        counts = {rarity: 0 for rarity in rarity_order}
+        for player in players:
+            counts[player['rarity']] += 1
+        
+        embed = discord.Embed(
+            title="📦 Packs Opened!",
+            description=f"You opened **{count}x {item_data['name']}** for **{total_price:,} coins**!",
+            color=COLORS['gold']
+        )
+        embed.add_field(
+            name="🎴 Pulls",
+            value="\n".join(
+                f"{PLAYER_RARITIES[rarity]['emoji']} {rarity.title()}: **{counts[rarity]}**"
+                for rarity in rarity_order if counts[rarity]
+            ),
+            inline=True
+        )
+        
+        best = sorted(
+            players,
+            key=lambda p: (rarity_order.index(p['rarity']), -max(p['batting'], p['bowling']))
+        )[:5]
+        embed.add_field(
+            name="⭐ Best Cards",
+            value="\n".join(
+                f"{PLAYER_RARITIES[p['rarity']]['emoji']} **{p['name']}** {p['country']} "
+                f"(BAT {p['batting']} | BOWL {p['bowling']})"
+                for p in best
+            ),
+            inline=True
+        )
+        embed.add_field(
+            name="✅ Added to Team",
+            value=f"{len(added)} player(s) added to your squad (max 20). "
+                  f"The rest are in your `cminventory`.",
+            inline=False
+        )
         
+        new_balance = user.get('balance', 0) or user.get('coins', 0)
+        embed.set_footer(text=f"New balance: {new_balance:,} coins • Draw #{players[0]['draw_seed']}")
         await ctx.send(embed=embed)
     
-    async def generate_pack_contents(self, pack_data):
-        """Generate random players for a pack based on OVR"""
-        from utils.ovr_calculator import calculate_ovr
-        all_players = get_all_players()
+    async def generate_pack_contents(self, pack_data, count=1, seed=None, context=None):
+        """Generate random players for `count` packs based on OVR (one seeded draw)"""
         # Per new economy rules, each purchased/opened pack yields exactly ONE player card
-        num_players = 1
-        pack_rarity = pack_data['rarity']
-        
-        # Improved rarity weights for fair progression
-        rarity_weights = {
-            'common': {'common': 90, 'rare': 8, 'epic': 1.5, 'legendary': 0.5},
-            'rare': {'common': 60, 'rare': 30, 'epic': 8, 'legendary': 2},
-            'epic': {'common': 20, 'rare': 40, 'epic': 30, 'legendary': 10},
-            'legendary': {'common': 5, 'rare': 20, 'epic': 35, 'legendary': 40},
-        }
-        
-        weights = rarity_weights[pack_rarity]
+        # Rarity weights per pack rarity live in utils.draw_engine.PACK_RARITY_WEIGHTS
+        cards, seed = draw_engine.draw_cards(
+            f"pack_{pack_data['rarity']}", 'pack', count=count, seed=seed,
+            context=context or pack_data.get('name')
+        )
         selected_players = []
         
-        for _ in range(num_players):
-            # Determine rarity
-            rarity = random.choices(
-                list(weights.keys()),
-                weights=list(weights.values())
-            )[0]
-            
-            # Select player based on rarity (OVR-based)
-            if rarity == 'legendary':
-                eligible = [p for p in all_players if calculate_ovr(p) >= 90]
-            elif rarity == 'epic':
-                eligible = [p for p in all_players if 85 <= calculate_ovr(p) < 90]
-            elif rarity == 'rare':
-                eligible = [p for p in all_players if 80 <= calculate_ovr(p) < 85]
-            else:  # common
-                eligible = [p for p in all_players if calculate_ovr(p) < 80]
-            
-            if not eligible:
-                eligible = all_players
-            
-            player = random.choice(eligible).copy()
+        for rarity, drawn_player in cards:
+            player = drawn_player.copy()
             player['rarity'] = rarity
+            # Seed lets a disputed drop be replayed exactly
+            player['draw_seed'] = seed
             
             # Apply rarity boost (small percentage increase)
             boost = PLAYER_RARITIES[rarity]['boost']
@@ -361,45 +465,14 @@ class EconomyCommands(commands.Cog):
         View your inventory
         Usage: cminventory
         """
-        items = await db.get_user_inventory(ctx.author.id)
-        boosts = await db.get_active_boosts(ctx.author.id)
-        
-        embed = discord.Embed(
-            title=f"🎒 {ctx.author.display_name}'s Inventory",
-            color=COLORS['primary']
-        )
-        
-        # Active boosts
-        if boosts:
-            boost_text = ""
-            for boost in boosts:
-                expiry = boost['expiry']
-                time_left = (expiry - datetime.utcnow()).days
-                boost_text += f"• **{boost['type']}**: +{boost['value']} ({time_left} days left)\n"
-            embed.add_field(name="⚡ Active Boosts", value=boost_text, inline=False)
-        
-        # Consumables
-        consumables = [item for item in items if item.get('data', {}).get('effect')]
-        if consumables:
-            cons_text = ""
-            for item in consumables[:10]:
-                cons_text += f"• {item['data'].get('name', 'Item')}\n"
-            embed.add_field(name="🎯 Consumables", value=cons_text or "None", inline=True)
-        
-        # Player cards
-        player_items = [item for item in items if item.get('item_id') == 'players']
-        total_players = sum(len(item.get('data', {}).get('players', [])) for item in player_items)
-        
-        if total_players > 0:
-            embed.add_field(name="👥 Player Cards", value=f"{total_players} cards", inline=True)
-        
-        if not items and not boosts:
-            embed.description = "Your inventory is empty! Visit `cmshop` to buy items."
-        
-        balance = await db.get_user_balance(ctx.author.id)
-        embed.set_footer(text=f"Balance: {balance:,} coins")
-        
-        await ctx.send(embed=embed)
+        view = InventoryView(ctx.author)
+        await view.load_next()
+        view.boosts = await db.get_active_boosts(ctx.author.id)
+        view.cards, view.other_items = await db.count_inventory(ctx.author.id)
+        view.balance = await db.get_user_balance(ctx.author.id)
+        view.update_buttons()
+        
+        view.message = await ctx.send(embed=view.build_embed(), view=view)
     
     @commands.command(name='records')
     async def match_records(self, ctx, member: discord.Member = None):
@@ -410,7 +483,7 @@ class EconomyCommands(commands.Cog):
         target = member or ctx.author
         
         # Get recent matches
-        matches = await db.get_user_matches(target.id, limit=10)
+        matches = await db.get_user_matches(target.id, limit=5)
         stats = await db.get_user_stats(target.id)
         
         if not stats:
@@ -435,9 +508,10 @@ class EconomyCommands(commands.Cog):
         if matches:
             recent_text = ""
             for match in matches[:5]:
-                result = "W" if match.get('winner') == str(target.id) else "L"
-                score = match.get('team1_score', {}).get('runs', 0)
-                recent_text += f"{result} - {score} runs\n"
+                result = "W" if match.get('winner_id') == str(target.id) else "L"
+                side = 'team1' if match.get('team1_user') == str(target.id) else 'team2'
+                score = match.get(f'{side}_score', 'N/A')
+                recent_text += f"{result} - {score}\n"
             
             embed.add_field(name="📋 Recent Matches", value=recent_text, inline=False)
         
@@ -467,19 +541,16 @@ class EconomyCommands(commands.Cog):
             await ctx.send("❌ Amount must be positive!")
             return
         
-        # Check sender balance
-        sender_balance = await db.get_user_balance(ctx.author.id)
-        
-        if sender_balance < amount:
-            await ctx.send(f"❌ Insufficient balance! You have {sender_balance:,} coins.")
-            return
-        
         # Perform trade
         try:
-            # Deduct from sender
-            await db.update_user_balance(ctx.author.id, -amount)
+            # Deduct from sender (only if they can afford it)
+            sender_new_balance = await db.remove_coins(ctx.author.id, amount, f"Trade to {target.id}")
+            if sender_new_balance is None:
+                sender_balance = await db.get_user_balance(ctx.author.id)
+                await ctx.send(f"❌ Insufficient balance! You have {sender_balance:,} coins.")
+                return
             # Add to receiver
-            await db.update_user_balance(target.id, amount)
+            receiver_new_balance = await db.update_user_balance(target.id, amount, f"Trade from {ctx.author.id}")
             
             embed = discord.Embed(
                 title="💸 Trade Successful!",
@@ -487,9 +558,6 @@ class EconomyCommands(commands.Cog):
                 color=COLORS['success']
             )
             
-            sender_new_balance = await db.get_user_balance(ctx.author.id)
-            receiver_new_balance = await db.get_user_balance(target.id)
-            
             embed.add_field(name=f"{ctx.author.display_name}'s Balance", value=f"{sender_new_balance:,} coins", inline=True)
             embed.add_field(name=f"{target.display_name}'s Balance", value=f"{receiver_new_balance:,} coins", inline=True)
             
@@ -5,11 +5,11 @@ import discord
 from discord.ext import commands
 import asyncio
 from datetime import datetime, timedelta
-import random
 
 from config import COLORS
 from database.db import db
 from utils.ovr_calculator import calculate_ovr
+from utils.draw_engine import draw_engine
 
 
 class EngagementCommands(commands.Cog):
@@ -87,36 +87,14 @@ class EngagementCommands(commands.Cog):
         total_coins = base_coins + bonus_coins
         
         # Generate random player card with rarity-based selection
-        from data.players import get_all_players
-        from utils.ovr_calculator import calculate_ovr
-        all_players = get_all_players()
-        
-        # Determine rarity first (harder to get better cards)
-        # For free hourly claims we bias heavily towards lower-OVR (common) cards
-        rarity_roll = random.randint(1, 1000)
-        # New weights: common 88%, rare 9%, epic 2.5%, legendary 0.5%
-        if rarity_roll <= 880:  # 88%
-            rarity = 'common'
-            # Favor lower OVR players for free claims: 50-74
-            eligible_players = [p for p in all_players if 50 <= calculate_ovr(p) < 75]
-        elif rarity_roll <= 970:  # 9%
-            rarity = 'rare'
-            # Slightly broader rare range: 75-84
-            eligible_players = [p for p in all_players if 75 <= calculate_ovr(p) < 85]
-        elif rarity_roll <= 995:  # 2.5%
-            rarity = 'epic'
-            # Epic players: 85-89
-            eligible_players = [p for p in all_players if 85 <= calculate_ovr(p) < 90]
-        else:  # 0.5%
-            rarity = 'legendary'
-            # Legendary remains very rare: 90+
-            eligible_players = [p for p in all_players if calculate_ovr(p) >= 90]
-        
-        # If no eligible players in rarity tier, fallback to all players
-        if not eligible_players:
-            eligible_players = all_players
-        
-        random_player = random.choice(eligible_players).copy()
+        # Free hourly claims are biased heavily towards lower-OVR (common) cards:
+        # common 88%, rare 9%, epic 2.5%, legendary 0.5%, drawn from the claim
+        # bands (common 50-74, rare 75-84, epic 85-89, legendary 90+)
+        cards, draw_seed = draw_engine.draw_cards(
+            'hourly_claim', 'claim', context=f"hourly_claim user={user_id}"
+        )
+        rarity, drawn_player = cards[0]
+        random_player = drawn_player.copy()
         
         random_player['rarity'] = rarity
         
@@ -137,6 +115,7 @@ class EngagementCommands(commands.Cog):
                 "$inc": {"coins": total_coins, "balance": total_coins}
             }
         )
+        db.invalidate_profile(user_id, 'economy')
         
         # Add player to team and auto-add to Playing XI if less than 11 players
         user_team = await db.get_user_team(user_id)
@@ -205,7 +184,7 @@ class EngagementCommands(commands.Cog):
         if next_milestone:
             embed.add_field(name="🎯 Next Milestone", value=next_milestone, inline=False)
         
-        embed.set_footer(text="Claim again in 1 hour! Don't break your streak!")
+        embed.set_footer(text=f"Claim again in 1 hour! Don't break your streak! • Draw #{draw_seed}")
         embed.set_thumbnail(url=ctx.author.display_avatar.url)
         
         await ctx.send(embed=embed)
@@ -240,9 +219,13 @@ class EngagementCommands(commands.Cog):
         challenger_id = str(ctx.author.id)
         opponent_id = str(opponent.id)
         
-        # Get both users
-        challenger = await db.get_economy_user(challenger_id)
-        opponent_data = await db.get_economy_user(opponent_id)
+        # Get both users and teams (one economy and one teams query)
+        challenger, opponent_data, challenger_team, opponent_team = await asyncio.gather(
+            db.get_economy_user(challenger_id),
+            db.get_economy_user(opponent_id),
+            db.get_user_team(challenger_id),
+            db.get_user_team(opponent_id)
+        )
         
         if not challenger:
             await ctx.send("❌ You need to register first! Use `!cmdebut`")
@@ -253,9 +236,6 @@ class EngagementCommands(commands.Cog):
             return
         
         # Check teams
-        challenger_team = await db.get_user_team(challenger_id)
-        opponent_team = await db.get_user_team(opponent_id)
-        
         if not challenger_team or not challenger_team.get('players'):
             await ctx.send("❌ You need a team first! Use `!cmauction` or open packs.")
             return
@@ -311,6 +291,8 @@ class EngagementCommands(commands.Cog):
                 return
             
             # Challenge accepted!
+            await db.touch_guild_member(ctx.guild.id, challenger_id)
+            await db.touch_guild_member(ctx.guild.id, opponent_id)
             embed = discord.Embed(
                 title="✅ Challenge Accepted!",
                 description=f"Match is starting between {ctx.author.mention} and {opponent.mention}!",
@@ -318,10 +300,15 @@ class EngagementCommands(commands.Cog):
             )
             await ctx.send(embed=embed)
             
-            # Deduct bet amounts
+            # Deduct bet amounts (balances may have changed while the challenge was open)
             if bet > 0:
-                await db.deduct_coins(challenger_id, bet)
-                await db.deduct_coins(opponent_id, bet)
+                if await db.deduct_coins(challenger_id, bet, "Challenge bet") is None:
+                    await ctx.send(f"❌ {ctx.author.mention} no longer has {bet:,} coins. Challenge cancelled.")
+                    return
+                if await db.deduct_coins(opponent_id, bet, "Challenge bet") is None:
+                    await db.update_user_balance(challenger_id, bet, "Challenge bet refund")
+                    await ctx.send(f"❌ {opponent.mention} no longer has {bet:,} coins. Challenge cancelled.")
+                    return
             
             # Start the match
             # Note: This will use your existing match system but with 5 overs
@@ -9,7 +9,9 @@ from datetime import datetime, timedelta
 
 from config import COLORS, ECONOMY_SETTINGS, LEADERBOARD_SETTINGS, PLAYER_RARITIES
 from database.db import db
-from data.players import get_all_players
+from utils.draw_engine import draw_engine
+from utils.member_names import resolve_names
+from utils.outbound import outbound
 from utils.ovr_calculator import calculate_ovr, get_legendary_price
 
 
@@ -38,8 +40,8 @@ class LegendaryCommands(commands.Cog):
         
         # Check if it's Monday (reset day)
         if now.strftime('%A') == LEADERBOARD_SETTINGS['reset_day']:
-            # Get top 3 winners
-            leaderboard = await db.get_leaderboard_by_period('weekly', limit=3)
+            # Get top 3 winners of the week that just ended
+            leaderboard = await db.get_leaderboard_by_period('weekly', limit=3, previous=True)
             
             if leaderboard:
                 # Award prizes to top 3
@@ -53,21 +55,16 @@ class LegendaryCommands(commands.Cog):
                     num_players = 5 if idx == 1 else 3  # 1st gets 5 players, others get 3
                     mystery_players = []
                     
-                    all_players = get_all_players()
-                    # Higher rank = better rarity chances
-                    if idx == 1:
-                        rarity_weights = [30, 30, 25, 15]  # common, rare, epic, legendary
-                    elif idx == 2:
-                        rarity_weights = [40, 35, 20, 5]
-                    else:
-                        rarity_weights = [50, 30, 15, 5]
-                    
-                    rarities = ['common', 'rare', 'epic', 'legendary']
+                    # Higher rank = better rarity chances (utils.draw_engine.WEEKLY_RANK_WEIGHTS)
+                    cards, draw_seed = draw_engine.draw_cards(
+                        f"weekly_rank_{min(idx, 3)}", 'pack', count=num_players,
+                        context=f"weekly_reset rank={idx} user={user_id}"
+                    )
                     
-                    for _ in range(num_players):
-                        rarity = random.choices(rarities, weights=rarity_weights)[0]
-                        player = random.choice(all_players).copy()
+                    for rarity, drawn_player in cards:
+                        player = drawn_player.copy()
                         player['rarity'] = rarity
+                        player['draw_seed'] = draw_seed
                         
                         # Apply rarity boosts
                         rarity_boost = PLAYER_RARITIES[rarity]['boost']
@@ -121,10 +118,8 @@ class LegendaryCommands(commands.Cog):
                     
                     embed.set_footer(text="Keep playing to win next week!")
                     
-                    try:
-                        await channel.send(embed=embed)
-                    except:
-                        pass
+                    # Paced per channel so announcements queue behind live match prompts
+                    outbound.send(channel, embed=embed)
     
     @weekly_reset.before_loop
     async def before_weekly_reset(self):
@@ -161,16 +156,13 @@ class LegendaryCommands(commands.Cog):
         )
         
         medals = ["🥇", "🥈", "🥉"]
+        names = await resolve_names(self.bot, ctx.guild, [user_data['user_id'] for user_data in leaderboard])
         
         for idx, user_data in enumerate(leaderboard, 1):
             medal = medals[idx-1] if idx <= 3 else f"`{idx}.`"
             
             user_id = user_data['user_id']
-            try:
-                user = await self.bot.fetch_user(int(user_id))
-                username = user.display_name
-            except:
-                username = "Unknown User"
+            username = names.get(str(user_id), "Unknown User")
             
             wins = user_data.get('wins', 0)
             matches = user_data.get('matches_played', 0)
@@ -259,7 +251,6 @@ class LegendaryCommands(commands.Cog):
         ]
         
         # Select random legendary players
-        import random
         selected_legends = random.sample(legendary_players, min(num_players, len(legendary_players)))
         
         # Add auction data and calculate prices
@@ -327,24 +318,16 @@ class LegendaryCommands(commands.Cog):
             await ctx.send("⚠️ You have already joined this legendary auction!")
             return
         
-        # Check balance
+        # Charge entry fee (fails without debiting if the balance is too low)
         entry_fee = auction.get('entry_fee', ECONOMY_SETTINGS['legendary_auction_cost'])
-        balance = await db.get_user_balance(ctx.author.id)
-        
-        if balance < entry_fee:
+        if await db.remove_coins(ctx.author.id, entry_fee, "Legendary Auction Entry") is None:
+            balance = await db.get_user_balance(ctx.author.id)
             await ctx.send(
                 f"❌ Insufficient coins! Legendary auction entry costs **{entry_fee:,} coins**.\n"
                 f"You have **{balance:,} coins**. Play more matches to earn coins!"
             )
             return
         
-        # Charge entry fee
-        success = await db.remove_coins(ctx.author.id, entry_fee, "Legendary Auction Entry")
-        
-        if not success:
-            await ctx.send("❌ Failed to join auction! Please try again.")
-            return
-        
         # Add participant with coin-based budget
         participant = {
             "user_id": str(ctx.author.id),
@@ -357,6 +340,7 @@ class LegendaryCommands(commands.Cog):
             {"_id": auction['_id']},
             {"$addToSet": {"participants": participant}}
         )
+        await db.touch_guild_member(ctx.guild.id, ctx.author.id)
         
         embed = discord.Embed(
             title="💎 Joined Legendary Auction!",
@@ -471,10 +455,8 @@ class LegendaryCommands(commands.Cog):
                 return
         
         # Generate random pack
-        pack_types = ['bronze_pack', 'silver_pack', 'gold_pack']
-        weights = [60, 30, 10]  # 60% bronze, 30% silver, 10% gold
-        
-        pack_id = random.choices(pack_types, weights=weights)[0]
+        # 60% bronze, 30% silver, 10% gold
+        (pack_id,), _ = draw_engine.roll('free_pack', context=f"pack user={ctx.author.id}")
         pack_data = {
             'bronze_pack': {'name': 'Bronze Pack', 'players': 3, 'rarity': 'common'},
             'silver_pack': {'name': 'Silver Pack', 'players': 5, 'rarity': 'rare'},
@@ -484,7 +466,9 @@ class LegendaryCommands(commands.Cog):
         # Generate players
         from cogs.economy_commands import EconomyCommands
         eco_cog = EconomyCommands(self.bot)
-        players = await eco_cog.generate_pack_contents(pack_data)
+        players = await eco_cog.generate_pack_contents(
+            pack_data, context=f"pack {pack_id} user={ctx.author.id}"
+        )
         
         # Save to inventory
         await db.add_item_to_inventory(ctx.author.id, 'players', {'players': players})
@@ -517,6 +501,7 @@ class LegendaryCommands(commands.Cog):
             {"$set": {"last_pack_claim": datetime.utcnow()}},
             upsert=True
         )
+        db.invalidate_profile(ctx.author.id, 'economy')
         
         embed = discord.Embed(
             title=f"🎁 Free {pack_data['name']} Opened!",
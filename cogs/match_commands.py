@@ -12,6 +12,7 @@ from config import *
 from database.db import db
 from data.players import get_player_by_id
 from utils.stadium_manager import stadium_manager
+from utils.match_checkpoint import checkpoint_writer
 
 
 class MatchJoinView(View):
@@ -64,19 +65,23 @@ class MatchJoinView(View):
                 color=COLORS['primary']
             )
             
-            view = TossCoinView(self.players, self.overs, self.venue, self.cog)
+            view = TossCoinView(
+                self.players, self.overs, self.venue, self.cog,
+                conditions={'pitch': self.pitch, 'weather': self.weather}
+            )
             await interaction.followup.send(embed=toss_embed, view=view)
 
 
 class TossCoinView(View):
     """View for player to choose Head or Tail"""
     
-    def __init__(self, players, overs, venue, cog):
+    def __init__(self, players, overs, venue, cog, conditions=None):
         super().__init__(timeout=60)
         self.players = players
         self.overs = overs
         self.venue = venue
         self.cog = cog
+        self.conditions = conditions
     
     @discord.ui.button(label="Head", style=discord.ButtonStyle.primary, emoji="🔵")
     async def head_button(self, interaction: discord.Interaction, button: Button):
@@ -111,7 +116,7 @@ class TossCoinView(View):
             color=COLORS['success']
         )
         
-        view = TossChoiceView(toss_winner, self.players, self.overs, self.venue, self.cog)
+        view = TossChoiceView(toss_winner, self.players, self.overs, self.venue, self.cog, self.conditions)
         await interaction.followup.send(embed=result_embed, view=view)
         self.stop()
     
@@ -148,7 +153,7 @@ class TossCoinView(View):
             color=COLORS['success']
         )
         
-        view = TossChoiceView(toss_winner, self.players, self.overs, self.venue, self.cog)
+        view = TossChoiceView(toss_winner, self.players, self.overs, self.venue, self.cog, self.conditions)
         await interaction.followup.send(embed=result_embed, view=view)
         self.stop()
 
@@ -156,13 +161,14 @@ class TossCoinView(View):
 class TossChoiceView(View):
     """View for toss winner to choose bat/bowl"""
     
-    def __init__(self, toss_winner, players, overs, venue, cog):
+    def __init__(self, toss_winner, players, overs, venue, cog, conditions=None):
         super().__init__(timeout=60)
         self.toss_winner = toss_winner
         self.players = players
         self.overs = overs
         self.venue = venue
         self.cog = cog
+        self.conditions = conditions
         self.difficulty = "easy"  # Default to easy mode
     
     @discord.ui.button(label="🟢 Easy Mode", style=discord.ButtonStyle.success, emoji="👀", row=0)
@@ -227,7 +233,8 @@ class TossChoiceView(View):
             innings=1,
             target=None,
             guild=interaction.guild,
-            difficulty=self.difficulty
+            difficulty=self.difficulty,
+            conditions=self.conditions
         )
     
     @discord.ui.button(label="Bowl First", style=discord.ButtonStyle.danger, emoji="⚾", row=1)
@@ -258,7 +265,8 @@ class TossChoiceView(View):
             innings=1,
             target=None,
             guild=interaction.guild,
-            difficulty=self.difficulty
+            difficulty=self.difficulty,
+            conditions=self.conditions
         )
 
 
@@ -269,20 +277,65 @@ class MatchCommands(commands.Cog):
         self.bot = bot
         self.active_matches = {}
     
-    async def start_interactive_innings(self, channel, batting_user_id, bowling_user_id, overs, venue, innings, target, guild, difficulty="easy"):
+    async def cog_load(self):
+        """Start checkpoint writes and pick up matches interrupted by the last restart"""
+        checkpoint_writer.start()
+        asyncio.create_task(self.resume_live_matches())
+    
+    async def resume_live_matches(self):
+        """Rebuild engines from live_matches checkpoints and continue them"""
+        from utils.match_engine import ProfessionalMatchEngine
+        from utils.match_session import MatchSession
+        
+        await self.bot.wait_until_ready()
+        try:
+            checkpoints = await checkpoint_writer.load_live()
+        except Exception as e:
+            print(f"⚠️ Failed to load match checkpoints: {e}")
+            return
+        
+        resumed = 0
+        for doc in checkpoints:
+            channel = self.bot.get_channel(doc.get('channel_id'))
+            if channel is None:
+                # Channel deleted or bot removed from the guild
+                checkpoint_writer.discard(doc['_id'])
+                continue
+            try:
+                engine = await ProfessionalMatchEngine.from_checkpoint(doc, channel)
+            except Exception as e:
+                print(f"⚠️ Could not resume match {doc['_id']}: {e}")
+                checkpoint_writer.discard(doc['_id'])
+                continue
+            
+            session = MatchSession(engine)
+            self.active_matches[channel.id] = {
+                'overs': doc['overs'],
+                'venue': doc['venue'],
+                'creator': doc['batting_user_id'],
+                'status': 'live',
+                'match_id': doc['_id'],
+                'session': session
+            }
+            asyncio.create_task(session.play(resume=True))
+            resumed += 1
+        
+        if checkpoints:
+            print(f"🔄 Resumed {resumed}/{len(checkpoints)} live matches from checkpoints")
+    
+    async def start_interactive_innings(self, channel, batting_user_id, bowling_user_id, overs, venue, innings, target, guild, difficulty="easy", conditions=None):
         """Start professional interactive innings"""
         try:
             await channel.send(f"🏏 **Match Starting...** Loading teams...\n🎮 **Mode:** {difficulty.upper()}")
             
             from utils.match_engine import ProfessionalMatchEngine
+            from utils.match_session import MatchSession
             from database.db import db
             
-            batting_xi = await db.get_playing_xi(batting_user_id)
-            bowling_xi = await db.get_playing_xi(bowling_user_id)
-            
-            # Get team names
-            batting_team_data = await db.get_user_team(batting_user_id)
-            bowling_team_data = await db.get_user_team(bowling_user_id)
+            # Both teams in one query; XIs and names come from the same documents
+            batting_team_data, bowling_team_data = await db.get_user_teams(batting_user_id, bowling_user_id)
+            batting_xi = batting_team_data.get('playing_xi', []) if batting_team_data else []
+            bowling_xi = bowling_team_data.get('playing_xi', []) if bowling_team_data else []
             batting_team_name = batting_team_data.get('team_name') if batting_team_data else None
             bowling_team_name = bowling_team_data.get('team_name') if bowling_team_data else None
             
@@ -307,10 +360,15 @@ class MatchCommands(commands.Cog):
             engine = ProfessionalMatchEngine(
                 channel, batting_user_id, bowling_user_id,
                 batting_xi, bowling_xi, overs, venue, innings, target, guild, difficulty,
-                batting_team_name, bowling_team_name
+                batting_team_name, bowling_team_name, conditions
             )
             
-            await engine.start_innings()
+            session = MatchSession(engine)
+            match = self.active_matches.get(channel.id)
+            if match is not None:
+                # cmend needs the session to stop the engine and drop its checkpoint
+                match.update(status='live', match_id=engine.match_id, session=session)
+            await session.play()
             
         except Exception as e:
             await channel.send(f"❌ **Error starting match:** {str(e)}")
@@ -332,6 +390,10 @@ class MatchCommands(commands.Cog):
             await ctx.send("⚠️ A match is already in progress in this channel!")
             return
         
+        if checkpoint_writer.draining:
+            await ctx.send("⚠️ The bot is restarting - live matches will resume shortly, try again in a minute!")
+            return
+        
         if overs <= 10:
             match_info = {"name": "T10", "format": "T10"}
         elif overs <= 20:
@@ -397,6 +459,12 @@ class MatchCommands(commands.Cog):
         
         del self.active_matches[ctx.channel.id]
         
+        # Stop the running innings and drop its checkpoint so a restart doesn't resume it
+        if match_data.get('session'):
+            match_data['session'].cancel()
+        elif match_data.get('match_id'):
+            checkpoint_writer.discard(match_data['match_id'])
+        
         embed = discord.Embed(
             title="🛑 Match Ended",
             description=f"**{ctx.author.mention}** has ended the match.\n\nThe match has been cancelled.",
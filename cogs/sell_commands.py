@@ -6,8 +6,7 @@ from discord.ext import commands
 
 from config import COLORS
 from database.db import db
-from data.players import get_player_by_id
-from utils.ovr_calculator import calculate_ovr, get_market_value
+from data.players import CATALOG, get_player_by_id
 
 
 class SellCommands(commands.Cog):
@@ -44,10 +43,8 @@ class SellCommands(commands.Cog):
             await ctx.send("❌ You don't have any players!")
             return
         
-        # Get playing XI
-        playing_xi = await db.get_playing_xi(user_id)
-        if not playing_xi:
-            playing_xi = []
+        # Playing XI (same document)
+        playing_xi = user_team.get('playing_xi') or []
         
         # Get admin-assigned players (players that can't be sold)
         admin_assigned = user_team.get('admin_assigned_players', [])
@@ -81,8 +78,8 @@ class SellCommands(commands.Cog):
             for pid in sellable_players:
                 player = get_player_by_id(pid)
                 if player:
-                    overall = calculate_ovr(player)
-                    market_value = get_market_value(overall)
+                    overall = CATALOG.ovr(pid)
+                    market_value = CATALOG.market_value(pid)
                     
                     sell_value = int(market_value * 0.55)
                     
@@ -136,8 +133,8 @@ class SellCommands(commands.Cog):
             return
         
         # Calculate sell value
-        overall = calculate_ovr(player)
-        market_value = get_market_value(overall)
+        overall = CATALOG.ovr(player_id)
+        market_value = CATALOG.market_value(player_id)
         
         sell_value = int(market_value * 0.55)
         
@@ -187,7 +184,7 @@ class SellCommands(commands.Cog):
             await db.update_user_team(user_id, updated_players, user_team.get('budget_remaining', 0))
             
             # Add coins
-            await db.award_match_coins(user_id, sell_value)
+            user_balance = await db.award_match_coins(user_id, sell_value, "Player sold")
             
             # Success embed
             embed = discord.Embed(
@@ -199,7 +196,6 @@ class SellCommands(commands.Cog):
             embed.add_field(name="💰 Coins Received", value=f"{sell_value:,} coins", inline=True)
             
             # Show new balance
-            user_balance = await db.get_user_balance(user_id)
             embed.add_field(name="💵 New Balance", value=f"{user_balance:,} coins", inline=True)
             
             embed.set_footer(text="Use !cmshop to buy new packs or join auctions!")
@@ -4,9 +4,85 @@ Stats Commands - View statistics and leaderboards
 import discord
 from discord.ext import commands
 from datetime import datetime
+from functools import partial
 
 from config import COLORS
 from database.db import db
+from utils.keyset_pager import KeysetPager
+from utils.member_names import resolve_names
+
+
+HISTORY_PAGE_SIZE = 10
+
+
+class MatchHistoryView(KeysetPager):
+    """Match history pager, newest first"""
+    
+    def __init__(self, author_id, target):
+        super().__init__(author_id, partial(db.get_user_matches, target.id), 'created_at', HISTORY_PAGE_SIZE)
+        self.target = target
+        self.stats = None
+    
+    def build_embed(self):
+        target = self.target
+        embed = discord.Embed(
+            title=f"📊 {target.name}'s Match History",
+            color=COLORS['primary']
+        )
+        
+        stats = self.stats
+        if stats:
+            win_rate = stats.get('win_rate', 0)
+            overview = f"**Matches Played:** {stats.get('matches_played', 0)}\n"
+            overview += f"**Wins:** {stats.get('wins', 0)}\n"
+            overview += f"**Losses:** {stats.get('losses', 0)}\n"
+            overview += f"**Win Rate:** {win_rate:.1f}%"
+            embed.add_field(name="📈 Overall Stats", value=overview, inline=False)
+        
+        first = self.page * HISTORY_PAGE_SIZE
+        embed.add_field(name="📋 Recent Matches" if self.page == 0 else "📋 Older Matches", value="", inline=False)
+        
+        for idx, match in enumerate(self.pages[self.page], first + 1):
+            is_winner = match.get('winner_id') == str(target.id)
+            result_emoji = "✅" if is_winner else "❌"
+            
+            if match.get('team1_user') == str(target.id):
+                opponent_name = match.get('team2_name', 'Unknown')
+                user_score = match.get('team1_score', 'N/A')
+                opp_score = match.get('team2_score', 'N/A')
+            else:
+                opponent_name = match.get('team1_name', 'Unknown')
+                user_score = match.get('team2_score', 'N/A')
+                opp_score = match.get('team1_score', 'N/A')
+            
+            win_by = match.get('win_by', 'N/A')
+            venue = match.get('venue', 'Unknown Venue')
+            match_date = match.get('created_at', datetime.utcnow())
+            
+            if isinstance(match_date, datetime):
+                date_str = match_date.strftime('%d %b %Y')
+            else:
+                date_str = 'Unknown Date'
+            
+            result = f"{result_emoji} **vs {opponent_name}**\n"
+            result += f"Score: {user_score} vs {opp_score}\n"
+            
+            if is_winner:
+                result += f"🏆 Won by {win_by}\n"
+            else:
+                result += f"💔 Lost by {win_by}\n"
+            
+            result += f"📍 {venue} | 📅 {date_str}"
+            
+            embed.add_field(
+                name=f"Match #{idx}",
+                value=result,
+                inline=False
+            )
+        
+        total = stats.get('matches_played', 0) if stats else 0
+        embed.set_footer(text=f"Page {self.page + 1} | Total matches: {total}")
+        return embed
 
 
 class StatsCommands(commands.Cog):
@@ -40,6 +116,18 @@ class StatsCommands(commands.Cog):
         embed.add_field(name="🏏 Total Runs", value=stats['total_runs'], inline=True)
         embed.add_field(name="⚡ Total Wickets", value=stats['total_wickets'], inline=True)
         embed.add_field(name="🔥 Highest Score", value=stats['highest_score'], inline=True)
+        if stats['best_bowling']['wickets']:
+            embed.add_field(name="🎯 Best Bowling", value=f"{stats['best_bowling']['wickets']}/{stats['best_bowling']['runs']}", inline=True)
+        embed.add_field(name="📶 Win Streak", value=f"{stats['win_streak']} (best {stats['best_win_streak']})", inline=True)
+        
+        if stats['formats']:
+            format_lines = [
+                f"**{name.replace('_overs', '').replace('_', '.')} overs:** {split.get('matches', 0)} played, "
+                f"{split.get('wins', 0)} won | {split.get('runs', 0)} runs (HS {split.get('highest_score', 0)}), "
+                f"{split.get('wickets', 0)} wkts"
+                for name, split in sorted(stats['formats'].items(), key=lambda item: -item[1].get('matches', 0))
+            ]
+            embed.add_field(name="🏟️ By Format", value="\n".join(format_lines[:5]), inline=False)
         
         embed.set_thumbnail(url=target.display_avatar.url)
         embed.set_footer(text=f"Team: {stats.get('team_name', 'Unknown Team')}")
@@ -47,24 +135,27 @@ class StatsCommands(commands.Cog):
         await ctx.send(embed=embed)
     
     @commands.command(name='leaderboard')
-    async def leaderboard(self, ctx):
+    async def leaderboard(self, ctx, scope: str = 'server'):
         """
         View top players
-        Usage: !cmleaderboard
+        Usage: !cmleaderboard [server|global]
         """
-        top_teams = await db.get_leaderboard(limit=10)
+        server = scope.lower() != 'global' and ctx.guild is not None
+        top_teams = await db.get_leaderboard(guild_id=ctx.guild.id if server else None, limit=10)
         
         if not top_teams:
-            await ctx.send("❌ No teams found!")
+            await ctx.send("❌ No matches played in this server yet! Try `!cmleaderboard global`." if server else "❌ No teams found!")
             return
         
         embed = discord.Embed(
-            title="🏆 Cric Mater Leaderboard",
-            description="Top 10 Players",
+            title=f"🏆 {ctx.guild.name} Leaderboard" if server else "🏆 Cric Mater Leaderboard",
+            description="Top 10 Players (wins in this server)" if server else "Top 10 Players",
             color=COLORS['gold']
         )
         
         medals = ["🥇", "🥈", "🥉"]
+        # Names for every row at once: member cache first, one query for anyone not cached
+        names = await resolve_names(self.bot, ctx.guild, [team['user_id'] for team in top_teams if team.get('user_id')])
         
         for idx, team in enumerate(top_teams, 1):
             medal = medals[idx-1] if idx <= 3 else f"`{idx}.`"
@@ -78,24 +169,9 @@ class StatsCommands(commands.Cog):
             # Get team display name
             team_display_name = team.get('team_name')
             if not team_display_name:
-                # Fetch Discord username if custom team name not set
-                user_id = team.get('user_id')
-                if user_id:
-                    try:
-                        member = ctx.guild.get_member(int(user_id))
-                        if member:
-                            team_display_name = f"{member.display_name}'s Team"
-                        else:
-                            # Try bot.get_user if not in guild
-                            user = self.bot.get_user(int(user_id))
-                            if user:
-                                team_display_name = f"{user.name}'s Team"
-                            else:
-                                team_display_name = "Unknown Team"
-                    except:
-                        team_display_name = "Unknown Team"
-                else:
-                    team_display_name = "Unknown Team"
+                # Discord name if custom team name not set
+                name = names.get(str(team.get('user_id')))
+                team_display_name = f"{name}'s Team" if name else "Unknown Team"
             
             embed.add_field(
                 name=f"{medal} {team_display_name}",
@@ -113,70 +189,14 @@ class StatsCommands(commands.Cog):
         """
         target = member or ctx.author
         
-        matches = await db.get_user_matches(target.id, limit=10)
-        
-        if not matches:
+        view = MatchHistoryView(ctx.author.id, target)
+        if not await view.load_next():
             await ctx.send(f"❌ {target.mention} hasn't played any matches yet!")
             return
+        view.stats = await db.get_user_stats(target.id)
+        view.update_buttons()
         
-        stats = await db.get_user_stats(target.id)
-        
-        embed = discord.Embed(
-            title=f"📊 {target.name}'s Match History",
-            color=COLORS['primary']
-        )
-        
-        if stats:
-            win_rate = stats.get('win_rate', 0)
-            overview = f"**Matches Played:** {stats.get('matches_played', 0)}\n"
-            overview += f"**Wins:** {stats.get('wins', 0)}\n"
-            overview += f"**Losses:** {stats.get('losses', 0)}\n"
-            overview += f"**Win Rate:** {win_rate:.1f}%"
-            embed.add_field(name="📈 Overall Stats", value=overview, inline=False)
-        
-        embed.add_field(name="📋 Recent Matches (Last 10)", value="", inline=False)
-        
-        for idx, match in enumerate(matches[:10], 1):
-            is_winner = match.get('winner_id') == str(target.id)
-            result_emoji = "✅" if is_winner else "❌"
-            
-            if match.get('team1_user') == str(target.id):
-                opponent_name = match.get('team2_name', 'Unknown')
-                user_score = match.get('team1_score', 'N/A')
-                opp_score = match.get('team2_score', 'N/A')
-            else:
-                opponent_name = match.get('team1_name', 'Unknown')
-                user_score = match.get('team2_score', 'N/A')
-                opp_score = match.get('team1_score', 'N/A')
-            
-            win_by = match.get('win_by', 'N/A')
-            venue = match.get('venue', 'Unknown Venue')
-            match_date = match.get('created_at', datetime.utcnow())
-            
-            if isinstance(match_date, datetime):
-                date_str = match_date.strftime('%d %b %Y')
-            else:
-                date_str = 'Unknown Date'
-            
-            result = f"{result_emoji} **vs {opponent_name}**\n"
-            result += f"Score: {user_score} vs {opp_score}\n"
-            
-            if is_winner:
-                result += f"🏆 Won by {win_by}\n"
-            else:
-                result += f"💔 Lost by {win_by}\n"
-            
-            result += f"📍 {venue} | 📅 {date_str}"
-            
-            embed.add_field(
-                name=f"Match #{idx}",
-                value=result,
-                inline=False
-            )
-        
-        embed.set_footer(text=f"Keep playing to improve your stats! | Total matches: {len(matches)}")
-        
-        await ctx.send(embed=embed)
+        view.message = await ctx.send(embed=view.build_embed(), view=view)
 
 
 async def setup(bot):
@@ -251,11 +251,9 @@ class TeamCommands(commands.Cog):
         """
         target = member or ctx.author
         
-        # Get playing XI directly from database (primary method)
-        playing_xi = await db.get_playing_xi(target.id)
-        
-        # Also get team data for team name
+        # Playing XI and team name from the one team document
         team_data = await db.get_user_team(target.id)
+        playing_xi = team_data.get('playing_xi', []) if team_data else []
         
         if not playing_xi or len(playing_xi) == 0:
             await ctx.send(f"❌ {target.mention} hasn't set their playing XI yet! Use `!cmsetxi` to set it or ask an admin to use `!cmsetteam`")
@@ -357,6 +355,7 @@ class TeamCommands(commands.Cog):
             {"user_id": str(ctx.author.id)},
             {"$set": {"team_name": new_name, "updated_at": datetime.utcnow()}}
         )
+        db.invalidate_profile(ctx.author.id, 'teams')
         
         embed = discord.Embed(
             title="✅ Team Name Updated!",
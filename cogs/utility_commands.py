@@ -85,7 +85,7 @@ class UtilityCommands(commands.Cog):
         `!cmsetteamname <name>` - Change your team name
         `!cmswap <xi#> <sub#>` - Swap XI and sub player
         `!cmstats [@user]` - View match statistics
-        `!cmleaderboard` - Top teams ranking
+        `!cmleaderboard [global]` - Top teams in this server (or everywhere)
         `!cmmatchhistory [@user]` - View match history
         """
         embed.add_field(name="👥 Team Management", value=team, inline=False)
@@ -92,6 +92,7 @@ ECONOMY_SETTINGS = {
     'daily_bonus': 100,           # Daily login reward
     'starting_balance': 500,      # New user starting coins
     'legendary_auction_cost': 5000,  # Coins to enter legendary auction
+    'max_bulk_packs': 50,         # Max packs per `cmbuy <pack> <count>`
 }
 
 # Shop items
@@ -135,6 +136,64 @@ LEADERBOARD_SETTINGS = {
         3: {'coins': 10000, 'pack': 'gold_pack', 'title': '💎 Monthly Legend'},
     },
     'reset_day': 'Monday',  # Weekly reset
+    'bucket_retention_days': {'weekly': 28, 'monthly': 62},  # Period counters expire this long after the period ends
+    'cache_ttl': 30,        # Seconds a top-N query result is reused
+    'member_touch_interval': 600,  # Seconds before the same (guild, user) participation is written again
+}
+
+# Live match checkpoints (crash-safe resume after a restart)
+MATCH_CHECKPOINT_SETTINGS = {
+    'flush_interval': 1.0,    # Seconds between batched live_matches writes
+    'max_age_hours': 6,       # Older checkpoints are dropped instead of resumed
+}
+
+# Match console: one scoreboard + one controls message edited in place each ball
+MATCH_CONSOLE_SETTINGS = {
+    'enabled': True,          # False = classic mode (new message per prompt/result)
+    'feed_lines': 4,          # Recent ball results shown on the console scoreboard
+}
+
+# Outbound message scheduler (per-channel token buckets)
+OUTBOUND_SETTINGS = {
+    # Discord allows 5 messages per 5 seconds per channel: keep burst + rate * 5 <= 5
+    'rate': 0.8,              # Sustained messages/edits per second per channel
+    'burst': 1,               # Calls an idle channel may make back to back
+    'decorative_ttl': 15,     # Seconds a GIF/card may wait before it is dropped
+    'pressure_depth': 8,      # Queue depth at which queued GIFs/cards are dropped
+}
+
+# Ban cache for the global command check
+BAN_CACHE_SETTINGS = {
+    'refresh_interval': 60,   # Seconds between full reloads (picks up bans made by other bot processes)
+}
+
+# Batched writes to the transactions collection
+LEDGER_SETTINGS = {
+    'batch_size': 500,        # Entries per insert_many; a full batch is written immediately
+    'flush_interval': 0.25,   # Seconds a partial batch waits
+    'high_water': 10000,      # Backlog that counts as back-pressure in cmdbstats and the logs
+}
+
+# Per-user economy/teams document cache inside Database
+PROFILE_CACHE_SETTINGS = {
+    'max_entries': 5000,      # LRU bound (one entry per user per collection)
+    'ttl': 30,                # Seconds; bounds staleness from writes made by other bot processes
+}
+
+# MongoDB connection pool (one shared client for the whole bot)
+MONGODB_POOL_SETTINGS = {
+    'max_pool_size': 50,          # Concurrent connections per server
+    'min_pool_size': 5,           # Kept warm so match-end writes skip the handshake
+    'max_idle_time_ms': 300000,   # Idle connections above min_pool_size are closed after this
+    'wait_queue_timeout_ms': 5000,  # Fail a checkout instead of queueing forever when the pool is full
+}
+
+# Storage backend: 'mongodb' (MONGODB_URI) or 'sqlite' (one embedded file for single-process deployments and offline runs)
+STORAGE_SETTINGS = {
+    'backend': os.getenv('STORAGE_BACKEND', 'mongodb'),
+    'sqlite_path': os.getenv('SQLITE_PATH', 'data/cricket_bot.sqlite3'),
+    'sqlite_cache_mb': 16,        # Page cache per connection (one writer, one reader)
+    'ttl_sweep_interval': 60,     # Seconds between TTL index sweeps (MongoDB's TTL monitor also runs every 60s)
 }
 
 # Image paths
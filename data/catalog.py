@@ -0,0 +1,229 @@
+"""
+Player Catalog
+Indexed, in-memory view over PLAYERS_DATABASE built once at import time
+"""
+import random
+
+from utils.ovr_calculator import calculate_ovr, get_ovr_tier, get_market_value
+
+
+# OVR band per card rarity as (min inclusive, max exclusive); None = unbounded
+PACK_RARITY_BANDS = {
+    'common': (None, 80),
+    'rare': (80, 85),
+    'epic': (85, 90),
+    'legendary': (90, None),
+}
+
+# Free hourly claims favour lower-OVR cards and skip the very weakest players
+CLAIM_RARITY_BANDS = {
+    'common': (50, 75),
+    'rare': (75, 85),
+    'epic': (85, 90),
+    'legendary': (90, None),
+}
+
+
+def rarity_for_ovr(bands, ovr):
+    """Return the rarity whose band contains `ovr`, or None if it fits no band"""
+    for rarity, (low, high) in bands.items():
+        if (low is None or ovr >= low) and (high is None or ovr < high):
+            return rarity
+    return None
+
+
+class RarityBucket:
+    """Players in one rarity band with O(1) add, remove and random pick"""
+
+    def __init__(self):
+        self.players = []
+        self._index = {}
+
+    def __len__(self):
+        return len(self.players)
+
+    def add(self, player):
+        if player['id'] in self._index:
+            return
+        self._index[player['id']] = len(self.players)
+        self.players.append(player)
+
+    def remove(self, player_id):
+        idx = self._index.pop(player_id, None)
+        if idx is None:
+            return
+        # Swap the last player into the hole so removal stays O(1)
+        last = self.players.pop()
+        if idx < len(self.players):
+            self.players[idx] = last
+            self._index[last['id']] = idx
+
+    def pick(self, rng=random):
+        return self.players[rng.randrange(len(self.players))]
+
+
+class PlayerCatalog:
+    """O(1) player lookups plus role/country indexes and precomputed ratings"""
+
+    def __init__(self, players_by_role):
+        """
+        Build all indexes from a role-keyed player mapping
+
+        Args:
+            players_by_role (dict): Same shape as PLAYERS_DATABASE
+                ({"batsmen": [...], "bowlers": [...], ...})
+        """
+        self.players_by_role = players_by_role
+        self._players = []
+        self._by_id = {}
+        self._by_role = {}
+        self._by_country = {}
+        self._derived = {}
+        self._baseline = {}
+        self._rarity_bands = {}
+        self._rarity_of = {}
+        self._buckets = {}
+
+        for role_players in players_by_role.values():
+            for player in role_players:
+                self._players.append(player)
+                self._by_id[player['id']] = player
+                self._by_role.setdefault(player.get('role'), []).append(player)
+                self._by_country.setdefault(player.get('country'), []).append(player)
+                self._derived[player['id']] = self._compute(player)
+                self._baseline[player['id']] = (player.get('batting'), player.get('bowling'))
+
+        self.add_rarity_scheme('pack', PACK_RARITY_BANDS)
+        self.add_rarity_scheme('claim', CLAIM_RARITY_BANDS)
+
+    @staticmethod
+    def _compute(player):
+        """Precompute OVR, tier and market value for a player"""
+        ovr = calculate_ovr(player)
+        return {
+            'ovr': ovr,
+            'tier': get_ovr_tier(ovr),
+            'market_value': get_market_value(ovr)
+        }
+
+    def __len__(self):
+        return len(self._players)
+
+    def __contains__(self, player_id):
+        return player_id in self._by_id
+
+    def get(self, player_id):
+        """Find a player by ID (O(1))"""
+        return self._by_id.get(player_id)
+
+    def all(self):
+        """Get all players as a flat list (a new list, safe to shuffle/slice)"""
+        return list(self._players)
+
+    def by_role(self, role):
+        """Get all players of a role ('batsman', 'bowler', 'all_rounder', 'wicket_keeper') as a new list"""
+        return list(self._by_role.get(role, ()))
+
+    def by_country(self, country):
+        """Get all players from a country (flag emoji as stored on the player) as a new list"""
+        return list(self._by_country.get(country, ()))
+
+    def countries(self):
+        """Get every country present in the catalog"""
+        return list(self._by_country.keys())
+
+    def ovr(self, player_id):
+        """Precomputed OVR for a player, or None if unknown"""
+        derived = self._derived.get(player_id)
+        return derived['ovr'] if derived else None
+
+    def tier(self, player_id):
+        """Precomputed OVR tier for a player, or None if unknown"""
+        derived = self._derived.get(player_id)
+        return derived['tier'] if derived else None
+
+    def market_value(self, player_id):
+        """Precomputed market value for a player, or None if unknown"""
+        derived = self._derived.get(player_id)
+        return derived['market_value'] if derived else None
+
+    def search(self, query):
+        """Search players by (case-insensitive) name substring"""
+        query = query.lower()
+        return [p for p in self._players if query in p['name'].lower()]
+
+    def add_rarity_scheme(self, scheme, bands):
+        """
+        Bucket every player by OVR band so card draws are O(1) picks
+
+        Args:
+            scheme (str): Name used with draw()/rarity_bucket()
+            bands (dict): rarity -> (min OVR inclusive, max OVR exclusive)
+        """
+        self._rarity_bands[scheme] = bands
+        self._rarity_of[scheme] = {}
+        self._buckets[scheme] = {rarity: RarityBucket() for rarity in bands}
+        for player in self._players:
+            self._place(scheme, player)
+
+    def _place(self, scheme, player):
+        """Move a player into the bucket matching its current OVR"""
+        rarity_of = self._rarity_of[scheme]
+        buckets = self._buckets[scheme]
+        new_rarity = rarity_for_ovr(self._rarity_bands[scheme], self._derived[player['id']]['ovr'])
+        old_rarity = rarity_of.get(player['id'])
+        if old_rarity == new_rarity and player['id'] in rarity_of:
+            return
+        if old_rarity is not None:
+            buckets[old_rarity].remove(player['id'])
+        if new_rarity is not None:
+            buckets[new_rarity].add(player)
+        rarity_of[player['id']] = new_rarity
+
+    def rarity_bucket(self, scheme, rarity):
+        """Players currently in a rarity band (do not mutate the returned list)"""
+        return self._buckets[scheme][rarity].players
+
+    def draw(self, scheme, rarity, rng=random):
+        """
+        Pick a random player from a rarity band
+
+        Falls back to the whole catalog if the band is empty, as the
+        per-command filters used to.
+
+        Returns:
+            dict: The catalog player (copy before modifying)
+        """
+        bucket = self._buckets[scheme][rarity]
+        if len(bucket):
+            return bucket.pick(rng)
+        return self._players[rng.randrange(len(self._players))]
+
+    def refresh(self, player_id):
+        """
+        Recompute derived values and rarity buckets after a player's stats
+        were changed in place (admin overrides, startup override loading)
+
+        Returns:
+            dict: The refreshed player, or None if unknown
+        """
+        player = self._by_id.get(player_id)
+        if player is None:
+            return None
+        self._derived[player_id] = self._compute(player)
+        for scheme in self._buckets:
+            self._place(scheme, player)
+        return player
+
+    def revert(self, player_id):
+        """
+        Restore a player's import-time batting/bowling and refresh it
+
+        Returns:
+            dict: The reverted player, or None if unknown
+        """
+        player = self._by_id.get(player_id)
+        if player is None:
+            return None
+        player['batting'], player['bowling'] = self._baseline[player_id]
+        return self.refresh(player_id)
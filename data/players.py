@@ -2,6 +2,7 @@
 Real Cricket Players Database
 Data compiled from international cricket statistics and player databases
 """
+from data.catalog import PlayerCatalog
 
 PLAYERS_DATABASE = {
     # BATSMEN
@@ -247,31 +248,25 @@ PLAYERS_DATABASE = {
 
 }
 
+# Indexed view over PLAYERS_DATABASE, built once at import time
+CATALOG = PlayerCatalog(PLAYERS_DATABASE)
+
 def get_all_players():
     """Get all players as a flat list"""
-    all_players = []
-    for role_players in PLAYERS_DATABASE.values():
-        all_players.extend(role_players)
-    return all_players
+    return CATALOG.all()
 
 def get_player_by_id(player_id):
     """Find a player by ID"""
-    for role_players in PLAYERS_DATABASE.values():
-        for player in role_players:
-            if player["id"] == player_id:
-                return player
-    return None
+    return CATALOG.get(player_id)
 
 def get_players_by_role(role):
     """Get all players of a specific role"""
-    role_key = role + "s" if role != "wicket_keeper" else "wicket_keepers"
-    return PLAYERS_DATABASE.get(role_key, [])
+    return CATALOG.by_role(role)
+
+def get_players_by_country(country):
+    """Get all players from a specific country"""
+    return CATALOG.by_country(country)
 
 def search_players(query):
     """Search players by name"""
-    query = query.lower()
-    results = []
-    for player in get_all_players():
-        if query in player["name"].lower():
-            results.append(player)
-    return results
+    return CATALOG.search(query)
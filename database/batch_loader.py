@@ -0,0 +1,81 @@
+"""
+Batch Loader
+DataLoader-style lookups: keys requested in the same event-loop tick are answered by one $in query
+"""
+import asyncio
+import copy
+
+
+class BatchLoader:
+    """Per-collection loader keyed by user_id (or another unique field)"""
+
+    def __init__(self, database, collection_name, key_field='user_id'):
+        """
+        Args:
+            database: Database whose `db[collection_name]` is queried
+            collection_name (str): Collection to load from
+            key_field (str): Unique field the keys are matched against
+        """
+        self.database = database
+        self.collection_name = collection_name
+        self.key_field = key_field
+        self.pending = {}      # key -> futures waiting on this tick's batch
+        self.fields = set()    # Union of requested fields for this tick (None = whole documents)
+        self.stats = {'loads': 0, 'batches': 0, 'keys': 0}
+
+    def load(self, key, fields=None):
+        """
+        Document for `key` (or None), batched with every other load made this tick
+
+        Args:
+            key: Value of key_field (user IDs are compared as strings)
+            fields (iterable): Only these fields are needed (None for the whole document)
+
+        Returns:
+            asyncio.Future: Resolves to the document, projected to the tick's requested fields
+        """
+        loop = asyncio.get_running_loop()
+        if not self.pending:
+            # Everything requested before the loop gets back to us goes into one query
+            loop.call_soon(self._dispatch)
+        future = loop.create_future()
+        self.pending.setdefault(str(key), []).append(future)
+        if fields is None:
+            self.fields = None
+        elif self.fields is not None:
+            self.fields.update(fields)
+        self.stats['loads'] += 1
+        return future
+
+    def _dispatch(self):
+        batch, fields = self.pending, self.fields
+        self.pending, self.fields = {}, set()
+        projection = {field: 1 for field in fields} | {self.key_field: 1} if fields is not None else None
+        asyncio.ensure_future(self._run(batch, projection))
+
+    async def _run(self, batch, projection):
+        self.stats['batches'] += 1
+        self.stats['keys'] += len(batch)
+        try:
+            docs = await self.database.db[self.collection_name].find(
+                {self.key_field: {"$in": list(batch)}}, projection
+            ).to_list(length=None)
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        by_key = {doc[self.key_field]: doc for doc in docs}
+        for key, futures in batch.items():
+            document = by_key.get(key)
+            for i, future in enumerate(futures):
+                if not future.done():
+                    # Callers mutate what they get, so repeat requests for one key get their own copy
+                    future.set_result(document if i == 0 else copy.deepcopy(document))
+
+    def summary(self):
+        """Loads, batches and average keys per query"""
+        batches = self.stats['batches']
+        return {**self.stats, 'keys_per_batch': self.stats['keys'] / batches if batches else 0.0}
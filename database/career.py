@@ -0,0 +1,168 @@
+"""
+Career Statistics
+Numeric per-user career aggregates kept on the teams document, updated with $inc/$max as results are saved
+"""
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+
+# best_bowling is stored as one sortable number so $max can keep it: more wickets first, then fewer runs
+BOWLING_RUNS_SPAN = 10000
+
+
+def bowling_key(wickets, runs):
+    """Sortable best-bowling value for (wickets, runs conceded)"""
+    return wickets * BOWLING_RUNS_SPAN + (BOWLING_RUNS_SPAN - 1 - min(runs, BOWLING_RUNS_SPAN - 1))
+
+
+def best_bowling(key):
+    """(wickets, runs) back from a bowling_key value, or None if there is none"""
+    if not key:
+        return None
+    wickets, rest = divmod(key, BOWLING_RUNS_SPAN)
+    return wickets, BOWLING_RUNS_SPAN - 1 - rest
+
+
+def format_key(overs):
+    """Field name for a match format ('20_overs', 'The Hundred' -> '16_4_overs')"""
+    return f"{overs}".replace('.', '_') + "_overs"
+
+
+def parse_score(score):
+    """(runs, wickets) from a "runs/wickets" score, or None for "DNB" and malformed values"""
+    try:
+        runs, wickets = score.split('/')
+        return int(runs), int(wickets)
+    except (AttributeError, ValueError):
+        return None
+
+
+def match_figures(match, user_id):
+    """
+    One user's side of a saved match document
+
+    Returns:
+        dict: won, overs, batted ((runs, wickets lost) or None) and bowled ((wickets taken, runs conceded) or None)
+    """
+    user_id = str(user_id)
+    mine, theirs = ('team1', 'team2') if match.get('team1_user') == user_id else ('team2', 'team1')
+    batted = parse_score(match.get(f'{mine}_score'))
+    opponent = parse_score(match.get(f'{theirs}_score'))
+    return {
+        'won': match.get('winner_id') == user_id,
+        'overs': match.get('overs', 20),
+        'batted': batted,
+        'bowled': (opponent[1], opponent[0]) if opponent else None
+    }
+
+
+def career_update(figures):
+    """
+    Update operators that add one match to the career aggregates
+
+    The current win streak is $inc'd or reset here; best_win_streak needs the new
+    streak, so Database.update_match_result raises it with a follow-up $max.
+    """
+    fmt = f"career.formats.{format_key(figures['overs'])}"
+    inc = {"career.matches": 1, f"{fmt}.matches": 1}
+    maximum = {}
+    set_fields = {}
+    if figures['won']:
+        inc["career.wins"] = 1
+        inc[f"{fmt}.wins"] = 1
+        inc["career.win_streak"] = 1
+    else:
+        inc["career.losses"] = 1
+        set_fields["career.win_streak"] = 0
+    if figures['batted']:
+        runs, _ = figures['batted']
+        inc.update({"career.innings": 1, "career.runs": runs, f"{fmt}.runs": runs})
+        maximum.update({"career.highest_score": runs, f"{fmt}.highest_score": runs})
+    if figures['bowled']:
+        wickets, runs = figures['bowled']
+        inc.update({"career.wickets": wickets, "career.runs_conceded": runs, f"{fmt}.wickets": wickets})
+        maximum["career.best_bowling"] = bowling_key(wickets, runs)
+    update = {"$inc": inc}
+    if maximum:
+        update["$max"] = maximum
+    if set_fields:
+        update["$set"] = set_fields
+    return update
+
+
+def new_career():
+    return {'matches': 0, 'wins': 0, 'losses': 0, 'innings': 0, 'runs': 0, 'wickets': 0, 'runs_conceded': 0,
+            'highest_score': 0, 'best_bowling': 0, 'win_streak': 0, 'best_win_streak': 0, 'formats': {}}
+
+
+def apply_match(career, figures):
+    """In-memory equivalent of career_update (used by the backfill)"""
+    fmt = career['formats'].setdefault(
+        format_key(figures['overs']), {'matches': 0, 'wins': 0, 'runs': 0, 'wickets': 0, 'highest_score': 0}
+    )
+    career['matches'] += 1
+    fmt['matches'] += 1
+    if figures['won']:
+        career['wins'] += 1
+        fmt['wins'] += 1
+        career['win_streak'] += 1
+        career['best_win_streak'] = max(career['best_win_streak'], career['win_streak'])
+    else:
+        career['losses'] += 1
+        career['win_streak'] = 0
+    if figures['batted']:
+        runs, _ = figures['batted']
+        career['innings'] += 1
+        career['runs'] += runs
+        fmt['runs'] += runs
+        career['highest_score'] = max(career['highest_score'], runs)
+        fmt['highest_score'] = max(fmt['highest_score'], runs)
+    if figures['bowled']:
+        wickets, runs = figures['bowled']
+        career['wickets'] += wickets
+        career['runs_conceded'] += runs
+        fmt['wickets'] += wickets
+        career['best_bowling'] = max(career['best_bowling'], bowling_key(wickets, runs))
+
+
+async def backfill_career_stats(database, batch_size=1000):
+    """
+    Rebuild every user's career aggregates from the matches collection
+
+    Streams matches oldest first in batches (so streaks come out in order) and replaces
+    each user's `career` with one bulk write per batch of users. Matches that finish
+    while it runs may be overwritten, so run it when no matches are in progress.
+
+    Args:
+        database: Motor database (db.db)
+        batch_size (int): Match documents per cursor batch and teams updates per bulk write
+
+    Returns:
+        dict: matches read, users updated and the as_of cutoff
+    """
+    as_of = datetime.utcnow()
+    careers = {}
+    scanned = 0
+    # _id order is insertion order and walks the _id index instead of sorting the collection in memory
+    cursor = database.matches.find(
+        {"created_at": {"$lte": as_of}},
+        {"team1_user": 1, "team2_user": 1, "team1_score": 1, "team2_score": 1, "winner_id": 1, "overs": 1}
+    ).sort("_id", 1).batch_size(batch_size)
+    async for match in cursor:
+        scanned += 1
+        for side in ('team1_user', 'team2_user'):
+            user_id = match.get(side)
+            if user_id:
+                apply_match(careers.setdefault(user_id, new_career()), match_figures(match, user_id))
+
+    updated = 0
+    users = list(careers.items())
+    for start in range(0, len(users), batch_size):
+        requests = [
+            UpdateOne({"user_id": user_id}, {"$set": {"career": {**career, "as_of": as_of}}})
+            for user_id, career in users[start:start + batch_size]
+        ]
+        result = await database.teams.bulk_write(requests, ordered=False)
+        updated += result.modified_count
+    return {'matches': scanned, 'users': updated, 'as_of': as_of}
@@ -2,31 +2,217 @@
 Database models for MongoDB
 """
 from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
+import time
+from pymongo import ReturnDocument, UpdateOne, monitoring
 from datetime import datetime
-from config import MONGODB_URI, AUCTION_SETTINGS
+from config import (
+    MONGODB_URI, MONGODB_POOL_SETTINGS, PROFILE_CACHE_SETTINGS, LEDGER_SETTINGS, LEADERBOARD_SETTINGS, AUCTION_SETTINGS,
+    STORAGE_SETTINGS
+)
+from database.batch_loader import BatchLoader
+from database.career import career_update, match_figures, best_bowling
+from database.indexes import ensure_indexes
+from database.inventory import inventory_documents, migrate_inventory
+from database.leaderboards import PERIODS, bucket_updates, period_window
+from database.ledger import LedgerWriter
+from database.profile_cache import ProfileCache
+from database.query_stats import QueryCounter
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Connection pool counters (events arrive on driver threads; plain int updates only)"""
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        self.stats = {
+            'created': 0, 'closed': 0, 'checked_out': 0, 'in_use': 0, 'max_in_use': 0,
+            'checkout_failed': 0, 'pool_cleared': 0, 'wait_ms_total': 0.0, 'wait_ms_max': 0.0
+        }
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        self.stats['pool_cleared'] += 1
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_created(self, event):
+        self.stats['created'] += 1
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_closed(self, event):
+        self.stats['closed'] += 1
+    
+    def connection_check_out_started(self, event):
+        pass
+    
+    def connection_check_out_failed(self, event):
+        self.stats['checkout_failed'] += 1
+    
+    def connection_checked_out(self, event):
+        stats = self.stats
+        stats['checked_out'] += 1
+        stats['in_use'] += 1
+        stats['max_in_use'] = max(stats['max_in_use'], stats['in_use'])
+        # Checkout wait (pymongo 4.7+ reports it on the event)
+        duration = getattr(event, 'duration', None)
+        if duration is not None:
+            stats['wait_ms_total'] += duration * 1000
+            stats['wait_ms_max'] = max(stats['wait_ms_max'], duration * 1000)
+    
+    def connection_checked_in(self, event):
+        self.stats['in_use'] = max(0, self.stats['in_use'] - 1)
+
+
+# What match history pages render (get_user_matches projection)
+MATCH_HISTORY_FIELDS = (
+    "team1_user", "team1_name", "team1_score", "team2_user", "team2_name", "team2_score",
+    "winner_id", "win_by", "venue", "created_at"
+)
 
 
 class Database:
     def __init__(self):
         self.client = None
         self.db = None
+        self.pool_monitor = PoolMonitor()
+        self.query_counter = QueryCounter()
+        # Profile cache misses in the same tick share one $in query per collection
+        self.loaders = {name: BatchLoader(self, name) for name in ('teams', 'economy')}
+        # economy/teams documents by user_id; every write below updates or invalidates its entry
+        self.profile_cache = ProfileCache(PROFILE_CACHE_SETTINGS['max_entries'], PROFILE_CACHE_SETTINGS['ttl'])
+        self.leaderboard_cache = {}  # (period, bucket, limit) -> (expires_at, entries)
+        self.member_touches = {}     # (guild_id, user_id) -> when participation was last written
+        self.ledger = LedgerWriter(
+            self, LEDGER_SETTINGS['batch_size'], LEDGER_SETTINGS['flush_interval'], LEDGER_SETTINGS['high_water']
+        )
     
     async def connect(self):
-        """Connect to MongoDB"""
-        self.client = AsyncIOMotorClient(MONGODB_URI)
+        """Connect to the configured backend (no-op if this instance is already connected)"""
+        if self.client is not None:
+            return
+        if STORAGE_SETTINGS['backend'] == 'sqlite':
+            # Same collection API as Motor, so every query below and in the cogs runs unchanged
+            from database.sqlite_store import SQLiteClient
+            self.client = SQLiteClient(
+                STORAGE_SETTINGS['sqlite_path'],
+                event_listeners=[self.query_counter],
+                cache_mb=STORAGE_SETTINGS['sqlite_cache_mb'],
+                ttl_sweep_interval=STORAGE_SETTINGS['ttl_sweep_interval']
+            )
+            print(f"✅ Opened SQLite store at {STORAGE_SETTINGS['sqlite_path']}")
+        else:
+            self.client = AsyncIOMotorClient(
+                MONGODB_URI,
+                maxPoolSize=MONGODB_POOL_SETTINGS['max_pool_size'],
+                minPoolSize=MONGODB_POOL_SETTINGS['min_pool_size'],
+                maxIdleTimeMS=MONGODB_POOL_SETTINGS['max_idle_time_ms'],
+                waitQueueTimeoutMS=MONGODB_POOL_SETTINGS['wait_queue_timeout_ms'],
+                event_listeners=[self.pool_monitor, self.query_counter]
+            )
+            print("✅ Connected to MongoDB")
         self.db = self.client['cricket_bot']
-        print("✅ Connected to MongoDB")
+        try:
+            await ensure_indexes(self.db)
+        except Exception as e:
+            print(f"⚠️ Index bootstrap failed: {e}")
+        try:
+            await self.backfill_match_participants()
+        except Exception as e:
+            print(f"⚠️ Match participants backfill failed: {e}")
+        try:
+            await self.migrate_inventory()
+        except Exception as e:
+            print(f"⚠️ Inventory migration failed: {e}")
+        try:
+            # Ledger entries a crashed run never wrote
+            await self.ledger.recover()
+        except Exception as e:
+            print(f"⚠️ Ledger spool replay failed: {e}")
     
     async def close(self):
-        """Close MongoDB connection"""
+        """Close the database connection"""
         if self.client:
+            await self.ledger.close()
             self.client.close()
-            print("❌ Disconnected from MongoDB")
+            self.client = None
+            print("❌ Disconnected from the database")
+    
+    def pool_stats(self):
+        """
+        Connection pool usage since connect
+        
+        Returns:
+            dict: created/closed/open connections, checkouts, in_use (now and peak), failures and checkout wait
+        """
+        stats = dict(self.pool_monitor.stats)
+        stats['open'] = stats['created'] - stats['closed']
+        stats['max_pool_size'] = MONGODB_POOL_SETTINGS['max_pool_size']
+        stats['min_pool_size'] = MONGODB_POOL_SETTINGS['min_pool_size']
+        stats['wait_ms_avg'] = stats['wait_ms_total'] / stats['checked_out'] if stats['checked_out'] else 0.0
+        return stats
+    
+    # Profile cache
+    async def _profile(self, collection, user_id):
+        """economy/teams document for a user through the profile cache"""
+        user_id = str(user_id)
+        return await self.profile_cache.fetch((collection, user_id), lambda: self.loaders[collection].load(user_id))
+    
+    def invalidate_profile(self, user_id, *collections):
+        """Forget cached economy/teams documents after a write made outside these methods"""
+        for collection in collections or ('economy', 'teams'):
+            self.profile_cache.invalidate((collection, str(user_id)))
+    
+    # Coin balances
+    @staticmethod
+    def _debit_filter(user_id, amount):
+        """Match the user only if they can afford `amount`"""
+        return {
+            "user_id": str(user_id),
+            # Older docs only track 'coins' (see get_user_balance)
+            "$or": [
+                {"balance": {"$gte": amount}},
+                {"balance": {"$in": [0, None]}, "coins": {"$gte": amount}}
+            ]
+        }
+    
+    async def _apply_coins(self, query, inc, upsert=False):
+        """
+        $inc coin fields in one round trip and write the new totals through to the profile cache
+        
+        Returns:
+            int: New balance, or None if no document matched `query`
+        """
+        user = await self.db.economy.find_one_and_update(
+            query,
+            {"$inc": inc, "$set": {"updated_at": datetime.utcnow()}},
+            projection={"_id": 0, "balance": 1, "coins": 1, "total_earned": 1, "total_spent": 1},
+            upsert=upsert,
+            return_document=ReturnDocument.AFTER
+        )
+        if not user:
+            return None
+        self.profile_cache.update_fields(('economy', query['user_id']), {**user, "updated_at": datetime.utcnow()})
+        return user.get('balance', 0) or user.get('coins', 0)
     
     # User Team Management
     async def get_user_team(self, user_id):
         """Get user's team"""
-        return await self.db.teams.find_one({"user_id": str(user_id)})
+        return await self._profile('teams', user_id)
+    
+    async def get_user_teams(self, *user_ids):
+        """Teams for several users at once (one query for any not already cached)"""
+        return await asyncio.gather(*(self.get_user_team(user_id) for user_id in user_ids))
     
     async def create_user_team(self, user_id, team_name, players):
         """Create or update user's team"""
@@ -47,20 +233,18 @@ class Database:
             {"$set": team_data},
             upsert=True
         )
+        self.profile_cache.update_fields(('teams', str(user_id)), team_data)
         return team_data
     
     async def update_user_team(self, user_id, players, budget_remaining):
         """Update user's team after auction"""
-        await self.db.teams.update_one(
-            {"user_id": str(user_id)},
-            {
-                "$set": {
-                    "players": players,
-                    "budget_remaining": budget_remaining,
-                    "updated_at": datetime.utcnow()
-                }
-            }
-        )
+        fields = {
+            "players": players,
+            "budget_remaining": budget_remaining,
+            "updated_at": datetime.utcnow()
+        }
+        await self.db.teams.update_one({"user_id": str(user_id)}, {"$set": fields})
+        self.profile_cache.update_fields(('teams', str(user_id)), fields)
     
     async def increment_matches_played(self, user_id):
         """Increment matches played count"""
@@ -71,17 +255,50 @@ class Database:
                 "$set": {"updated_at": datetime.utcnow()}
             }
         )
+        self.invalidate_profile(user_id, 'teams')
     
-    async def update_match_result(self, user_id, won):
-        """Update win/loss record"""
+    async def update_match_result(self, user_id, won, match=None):
+        """
+        Update win/loss record
+        
+        Args:
+            user_id: Discord user ID
+            won (bool): Whether this user won
+            match (dict): The saved match document; adds the match to the career aggregates
+        """
         field = "wins" if won else "losses"
-        await self.db.teams.update_one(
+        update = career_update(match_figures(match, user_id)) if match else {"$inc": {}}
+        update["$inc"].update({field: 1, "matches_played": 1})
+        update.setdefault("$set", {})["updated_at"] = datetime.utcnow()
+        team = await self.db.teams.find_one_and_update(
             {"user_id": str(user_id)},
-            {
-                "$inc": {field: 1, "matches_played": 1},
-                "$set": {"updated_at": datetime.utcnow()}
-            },
-            upsert=True
+            update,
+            projection={"career.win_streak": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if match and won:
+            # $max can't read the streak it just incremented, so raise the best in a second (idempotent) write
+            await self.db.teams.update_one(
+                {"user_id": str(user_id)},
+                {"$max": {"career.best_win_streak": team['career']['win_streak']}}
+            )
+        
+        # Per-guild record for that server's leaderboard
+        if match and match.get('guild_id'):
+            await self.db.guild_members.update_one(
+                {"guild_id": str(match['guild_id']), "user_id": str(user_id)},
+                {
+                    "$inc": {field: 1, "matches_played": 1},
+                    "$set": {"last_active": datetime.utcnow()}
+                },
+                upsert=True
+            )
+        
+        # Weekly and monthly counters for the period leaderboards
+        await self.db.leaderboards.bulk_write(
+            [UpdateOne(query, update, upsert=True) for query, update in bucket_updates(user_id, won)],
+            ordered=False
         )
         
         # Also update economy collection
@@ -93,56 +310,32 @@ class Database:
             },
             upsert=True
         )
+        self.invalidate_profile(user_id)
     
     async def award_match_coins(self, user_id, amount, reason="Match reward"):
-        """Award coins to user after match"""
-        await self.db.economy.update_one(
+        """Award coins to user after match; returns the new balance"""
+        return await self._apply_coins(
             {"user_id": str(user_id)},
-            {
-                "$inc": {
-                    "coins": amount,
-                    "balance": amount,
-                    "total_earned": amount if amount > 0 else 0
-                },
-                "$set": {"updated_at": datetime.utcnow()}
-            },
+            {"coins": amount, "balance": amount, "total_earned": amount if amount > 0 else 0},
             upsert=True
         )
     
     async def deduct_coins(self, user_id, amount, reason="Penalty"):
-        """Deduct coins from user"""
-        user = await self.get_economy_user(user_id)
-        if user and user.get('coins', 0) >= amount:
-            await self.db.economy.update_one(
-                {"user_id": str(user_id)},
-                {
-                    "$inc": {
-                        "coins": -amount,
-                        "balance": -amount,
-                        "total_spent": amount
-                    },
-                    "$set": {"updated_at": datetime.utcnow()}
-                }
-            )
-            return True
-        return False
+        """Deduct coins from user if they can afford it; returns the new balance, or None"""
+        return await self.remove_coins(user_id, amount, reason)
     
     async def set_playing_xi(self, user_id, playing_xi):
         """Set user's playing XI"""
-        await self.db.teams.update_one(
-            {"user_id": str(user_id)},
-            {
-                "$set": {
-                    "playing_xi": playing_xi,
-                    "updated_at": datetime.utcnow()
-                }
-            },
-            upsert=True
-        )
+        fields = {
+            "playing_xi": playing_xi,
+            "updated_at": datetime.utcnow()
+        }
+        await self.db.teams.update_one({"user_id": str(user_id)}, {"$set": fields}, upsert=True)
+        self.profile_cache.update_fields(('teams', str(user_id)), fields)
     
     async def get_playing_xi(self, user_id):
         """Get user's playing XI"""
-        team = await self.db.teams.find_one({"user_id": str(user_id)})
+        team = await self.get_user_team(user_id)
         if team:
             return team.get("playing_xi", [])
         return []
@@ -151,66 +344,91 @@ class Database:
     async def save_match(self, match_data):
         """Save match details"""
         match_data['created_at'] = datetime.utcnow()
+        # One multikey-indexed field to look matches up by either side
+        match_data['participants'] = list(dict.fromkeys([match_data.get('team1_user'), match_data.get('team2_user')]))
         result = await self.db.matches.insert_one(match_data)
         return str(result.inserted_id)
     
-    async def get_user_matches(self, user_id, limit=10):
-        """Get user's recent matches"""
-        cursor = self.db.matches.find(
-            {"$or": [{"team1_user": str(user_id)}, {"team2_user": str(user_id)}]}
-        ).sort("created_at", -1).limit(limit)
+    async def get_user_matches(self, user_id, limit=10, before=None, fields=MATCH_HISTORY_FIELDS):
+        """
+        Get user's matches, newest first, one keyset page at a time
+        
+        Args:
+            user_id: Discord user ID
+            limit (int): Page size
+            before (tuple): (created_at, _id) of the last match on the previous page;
+                deeper pages cost the same as the first
+            fields (tuple): Fields to return (None for whole documents)
         
+        Returns:
+            list: Match documents
+        """
+        query = {"participants": str(user_id)}
+        if before:
+            created_at, last_id = before
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": last_id}}
+            ]
+        projection = {field: 1 for field in fields} if fields else None
+        cursor = self.db.matches.find(query, projection).sort([("created_at", -1), ("_id", -1)]).limit(limit)
         return await cursor.to_list(length=limit)
     
+    async def backfill_match_participants(self):
+        """One-time: add `participants` to matches saved before the field existed"""
+        if await self.db.system.find_one({"_id": "match_participants_backfill"}):
+            return
+        result = await self.db.matches.update_many(
+            {"participants": {"$exists": False}},
+            [{"$set": {"participants": ["$team1_user", "$team2_user"]}}]
+        )
+        await self.db.system.update_one(
+            {"_id": "match_participants_backfill"},
+            {"$set": {"date": datetime.utcnow(), "updated": result.modified_count}},
+            upsert=True
+        )
+        print(f"📋 Added participants to {result.modified_count} saved matches")
+    
+    async def migrate_inventory(self):
+        """One-time: move economy.items arrays into the inventory collection"""
+        if await self.db.system.find_one({"_id": "inventory_migration"}):
+            return
+        report = await migrate_inventory(self.db)
+        await self.db.system.update_one(
+            {"_id": "inventory_migration"},
+            {"$set": {"date": datetime.utcnow(), **report}},
+            upsert=True
+        )
+        # Cached economy documents may still carry the old arrays
+        self.profile_cache.clear()
+        print(f"🎒 Moved {report['documents']} inventory entries for {report['users']} users out of economy documents")
+    
     async def get_user_stats(self, user_id):
-        """Get comprehensive user statistics"""
+        """Get comprehensive user statistics (one read of the teams document's career aggregates)"""
         team = await self.get_user_team(user_id)
         if not team:
             return None
         
-        matches = await self.get_user_matches(user_id, limit=100)
-        
+        career = team.get("career", {})
+        bowling = best_bowling(career.get("best_bowling"))
         stats = {
             "team_name": team.get("team_name", "Unknown"),
             "matches_played": team.get("matches_played", 0),
             "wins": team.get("wins", 0),
             "losses": team.get("losses", 0),
             "win_rate": 0,
-            "total_runs": 0,
-            "total_wickets": 0,
-            "highest_score": 0,
-            "best_bowling": {"wickets": 0, "runs": 999}
+            "total_runs": career.get("runs", 0),
+            "total_wickets": career.get("wickets", 0),
+            "highest_score": career.get("highest_score", 0),
+            "best_bowling": {"wickets": bowling[0], "runs": bowling[1]} if bowling else {"wickets": 0, "runs": 999},
+            "win_streak": career.get("win_streak", 0),
+            "best_win_streak": career.get("best_win_streak", 0),
+            "formats": career.get("formats", {})
         }
         
         if stats['matches_played'] > 0:
             stats['win_rate'] = (stats['wins'] / stats['matches_played']) * 100
         
-        # Calculate additional stats from matches
-        for match in matches:
-            try:
-                if match.get('team1_user') == str(user_id):
-                    score_str = match.get('team1_score', '0/0')
-                    if isinstance(score_str, str) and '/' in score_str:
-                        runs, wickets = score_str.split('/')
-                        runs = int(runs)
-                        wickets = int(wickets)
-                        stats['total_runs'] += runs
-                        stats['total_wickets'] += wickets
-                        if runs > stats['highest_score']:
-                            stats['highest_score'] = runs
-                else:
-                    score_str = match.get('team2_score', '0/0')
-                    if isinstance(score_str, str) and '/' in score_str:
-                        runs, wickets = score_str.split('/')
-                        runs = int(runs)
-                        wickets = int(wickets)
-                        stats['total_runs'] += runs
-                        stats['total_wickets'] += wickets
-                        if runs > stats['highest_score']:
-                            stats['highest_score'] = runs
-            except (ValueError, AttributeError):
-                continue
-        
         return stats
     
     # Auction System
@@ -341,20 +559,73 @@ class Database:
     
     # Leaderboard
     async def get_leaderboard(self, guild_id=None, limit=10):
-        """Get top players leaderboard"""
-        query = {}
-        if guild_id:
-            # Would need to track guild_id in team data
-            pass
+        """
+        Get top players leaderboard
         
-        cursor = self.db.teams.find(query).sort("wins", -1).limit(limit)
-        return await cursor.to_list(length=limit)
+        Args:
+            guild_id: Rank only users who have played in this guild, by their wins there
+            limit (int): Number of entries
+        
+        Returns:
+            list: Team documents (all-time) or guild_members entries with team_name added
+        """
+        if not guild_id:
+            return await self._cached_leaderboard(
+                ('all', None, limit), lambda: self.db.teams.find({}).sort("wins", -1).limit(limit).to_list(length=limit)
+            )
+        
+        async def load():
+            entries = await self.db.guild_members.find(
+                {"guild_id": str(guild_id)},
+                {"_id": 0, "user_id": 1, "wins": 1, "losses": 1, "matches_played": 1}
+            ).sort([("wins", -1), ("matches_played", 1)]).limit(limit).to_list(length=limit)
+            names = await self.get_team_names([entry['user_id'] for entry in entries])
+            for entry in entries:
+                entry['team_name'] = names.get(entry['user_id'])
+            return entries
+        
+        return await self._cached_leaderboard(('guild', str(guild_id), limit), load)
+    
+    async def get_team_names(self, user_ids):
+        """user_id -> team_name for many users in one query"""
+        cursor = self.db.teams.find({"user_id": {"$in": [str(u) for u in user_ids]}}, {"_id": 0, "user_id": 1, "team_name": 1})
+        return {team['user_id']: team.get('team_name') async for team in cursor}
+    
+    async def touch_guild_member(self, guild_id, user_id):
+        """Record that a user took part in something in a guild (auction, challenge); at most one write per interval"""
+        key = (str(guild_id), str(user_id))
+        now = time.monotonic()
+        interval = LEADERBOARD_SETTINGS['member_touch_interval']
+        if now - self.member_touches.get(key, -interval) < interval:
+            return
+        if len(self.member_touches) > 10000:
+            self.member_touches = {k: t for k, t in self.member_touches.items() if now - t < interval}
+        self.member_touches[key] = now
+        await self.db.guild_members.update_one(
+            {"guild_id": key[0], "user_id": key[1]},
+            {
+                "$setOnInsert": {"wins": 0, "losses": 0, "matches_played": 0},
+                "$set": {"last_active": datetime.utcnow()}
+            },
+            upsert=True
+        )
+    
+    async def _cached_leaderboard(self, key, load):
+        """Reuse a top-N result for LEADERBOARD_SETTINGS['cache_ttl'] seconds"""
+        now = time.monotonic()
+        cached = self.leaderboard_cache.get(key)
+        if cached and cached[0] > now:
+            return list(cached[1])
+        entries = await load()
+        # Bounded by the handful of (period, bucket, limit) combinations in use
+        self.leaderboard_cache = {k: v for k, v in self.leaderboard_cache.items() if v[0] > now}
+        self.leaderboard_cache[key] = (now + LEADERBOARD_SETTINGS['cache_ttl'], entries)
+        return list(entries)
     
     # Economy System
     async def get_economy_user(self, user_id):
-        """Get user's economy data (includes coins, items, stats)"""
-        user = await self.db.economy.find_one({"user_id": str(user_id)})
-        return user
+        """Get user's economy data (coins, boosts, stats; owned items live in the inventory collection)"""
+        return await self._profile('economy', user_id)
     
     async def create_economy_user(self, user_id, starting_coins=50000):
         """Create new economy user with starting balance"""
@@ -367,121 +638,226 @@ class Database:
             "matches_played": 0,
             "matches_won": 0,
             "last_daily": None,
-            "items": [],
             "boosts": [],
-            "inventory": [],
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
-        await self.db.economy.insert_one(user_data)
+        # Upsert: the unique user_id index turns a racing second insert into an error
+        await self.db.economy.update_one(
+            {"user_id": str(user_id)},
+            {"$setOnInsert": user_data},
+            upsert=True
+        )
+        self.invalidate_profile(user_id, 'economy')
         return user_data
     
     async def get_user_balance(self, user_id):
         """Get user's coin balance"""
-        user = await self.db.economy.find_one({"user_id": str(user_id)})
+        user = await self.get_economy_user(user_id)
         if not user:
-            # Create new economy entry
+            # Create new economy entry (upsert, in case another command created it meanwhile)
             from config import ECONOMY_SETTINGS
-            await self.db.economy.insert_one({
-                "user_id": str(user_id),
-                "balance": ECONOMY_SETTINGS['starting_balance'],
-                "coins": ECONOMY_SETTINGS['starting_balance'],
-                "total_earned": 0,
-                "total_spent": 0,
-                "last_daily": None,
-                "items": [],
-                "boosts": [],
-                "created_at": datetime.utcnow()
-            })
-            return ECONOMY_SETTINGS['starting_balance']
+            user = await self.db.economy.find_one_and_update(
+                {"user_id": str(user_id)},
+                {"$setOnInsert": {
+                    "balance": ECONOMY_SETTINGS['starting_balance'],
+                    "coins": ECONOMY_SETTINGS['starting_balance'],
+                    "total_earned": 0,
+                    "total_spent": 0,
+                    "last_daily": None,
+                    "boosts": [],
+                    "created_at": datetime.utcnow()
+                }},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            self.profile_cache.put(('economy', str(user_id)), user)
         return user.get('balance', 0) or user.get('coins', 0)
     
     async def add_coins(self, user_id, amount, reason=""):
-        """Add coins to user balance"""
-        await self.db.economy.update_one(
+        """Add coins to user balance; returns the new balance"""
+        balance = await self._apply_coins(
             {"user_id": str(user_id)},
-            {
-                "$inc": {"balance": amount, "coins": amount, "total_earned": amount},
-                "$set": {"updated_at": datetime.utcnow()}
-            },
+            {"balance": amount, "coins": amount, "total_earned": amount},
             upsert=True
         )
-        
-        # Log transaction
-        await self.db.transactions.insert_one({
-            "user_id": str(user_id),
-            "amount": amount,
-            "type": "earn",
-            "reason": reason,
-            "timestamp": datetime.utcnow()
-        })
+        self.ledger.record(user_id, amount, "earn", reason)
+        return balance
     
     async def remove_coins(self, user_id, amount, reason=""):
-        """Remove coins from user balance"""
-        balance = await self.get_user_balance(user_id)
-        if balance < amount:
-            return False
-        
-        await self.db.economy.update_one(
-            {"user_id": str(user_id)},
-            {
-                "$inc": {"balance": -amount, "coins": -amount, "total_spent": amount},
-                "$set": {"updated_at": datetime.utcnow()}
-            }
-        )
+        """
+        Atomically debit coins if the user can afford them
         
-        # Log transaction
-        await self.db.transactions.insert_one({
-            "user_id": str(user_id),
-            "amount": -amount,
-            "type": "spend",
-            "reason": reason,
-            "timestamp": datetime.utcnow()
-        })
+        The balance check and the $inc are one conditional update, so concurrent
+        debits can never take the balance below zero.
         
-        return True
+        Returns:
+            int: New balance, or None if the balance was too low (nothing debited)
+        """
+        balance = await self._apply_coins(
+            self._debit_filter(user_id, amount),
+            {"balance": -amount, "coins": -amount, "total_spent": amount}
+        )
+        if balance is None:
+            return None
+        self.ledger.record(user_id, -amount, "spend", reason)
+        return balance
     
-    async def update_user_balance(self, user_id, amount):
-        """Update user balance by adding or subtracting amount"""
-        await self.db.economy.update_one(
-            {"user_id": str(user_id)},
+    async def update_user_balance(self, user_id, amount, reason="Balance update"):
+        """Update user balance by adding or subtracting amount (unconditionally); returns the new balance"""
+        balance = await self._apply_coins({"user_id": str(user_id)}, {"balance": amount, "coins": amount}, upsert=True)
+        self.ledger.record(user_id, amount, "earn" if amount > 0 else "spend", reason)
+        return balance
+    
+    async def add_item_to_inventory(self, user_id, item_id, item_data):
+        """Add an item to user's inventory ({'players': [...]} grants become one card per player)"""
+        documents = inventory_documents(user_id, item_id, item_data)
+        if documents:
+            await self.db.inventory.insert_many(documents)
+    
+    async def purchase_items(self, user_id, price, items, reason=""):
+        """
+        Atomically debit `price`, add `items` to the inventory with one insert,
+        then log a single ledger entry (the debit is refunded if the insert fails)
+
+        Args:
+            user_id: Discord user ID
+            price (int): Total coins to debit
+            items (list): (item_id, item_data) pairs to add to inventory
+            reason (str): Ledger reason
+
+        Returns:
+            dict: Updated economy document, or None if the balance was too low
+        """
+        now = datetime.utcnow()
+        user = await self.db.economy.find_one_and_update(
+            self._debit_filter(user_id, price),
             {
-                "$inc": {"balance": amount, "coins": amount},
-                "$set": {"updated_at": datetime.utcnow()}
+                "$inc": {"balance": -price, "coins": -price, "total_spent": price},
+                "$set": {"updated_at": now}
             },
-            upsert=True
+            return_document=ReturnDocument.AFTER
         )
+        if not user:
+            return None
+        self.profile_cache.put(('economy', str(user_id)), user)
         
-        # Log transaction
-        transaction_type = "earn" if amount > 0 else "spend"
-        await self.db.transactions.insert_one({
-            "user_id": str(user_id),
-            "amount": amount,
-            "type": transaction_type,
-            "reason": "Balance update",
-            "timestamp": datetime.utcnow()
-        })
+        documents = [doc for item_id, item_data in items for doc in inventory_documents(user_id, item_id, item_data, now)]
+        try:
+            if documents:
+                await self.db.inventory.insert_many(documents)
+        except Exception:
+            await self._apply_coins({"user_id": str(user_id)}, {"balance": price, "coins": price, "total_spent": -price})
+            raise
+        
+        self.ledger.record(user_id, -price, "spend", reason, items=len(items))
+        return user
     
-    async def add_item_to_inventory(self, user_id, item_id, item_data):
-        """Add item to user's inventory"""
-        await self.db.economy.update_one(
-            {"user_id": str(user_id)},
-            {
-                "$push": {
-                    "items": {
-                        "item_id": item_id,
-                        "data": item_data,
-                        "acquired_at": datetime.utcnow()
-                    }
-                }
-            },
-            upsert=True
+    async def add_players_to_squad(self, user_id, team_name, player_ids, max_squad=20):
+        """
+        Add players to a squad (capped at `max_squad`) and fill an empty
+        Playing XI, creating the team if needed, with one read and one write
+        
+        Draws can repeat a player, so IDs are deduped in order and any already
+        in the squad are skipped (the duplicate cards stay in the inventory).
+
+        Returns:
+            list: Player IDs that were newly added to the squad
+        """
+        team = await self.get_user_team(user_id)
+        now = datetime.utcnow()
+        current = team.get('players', []) if team else []
+        new_ids = [player_id for player_id in dict.fromkeys(player_ids) if player_id not in current]
+        
+        if not team:
+            squad = new_ids[:max_squad]
+            team_data = {
+                "user_id": str(user_id),
+                "team_name": team_name,
+                "players": squad,
+                "playing_xi": squad[:11],
+                "budget_remaining": AUCTION_SETTINGS['initial_budget'],
+                "matches_played": 0,
+                "wins": 0,
+                "losses": 0,
+                "created_at": now,
+                "updated_at": now
+            }
+            await self.db.teams.update_one({"user_id": str(user_id)}, {"$set": team_data}, upsert=True)
+            self.profile_cache.update_fields(('teams', str(user_id)), team_data)
+            return squad
+        
+        added = new_ids[:max(0, max_squad - len(current))]
+        squad = current + added
+        update = {"players": squad, "updated_at": now}
+        if not team.get('playing_xi'):
+            update["playing_xi"] = list(dict.fromkeys(squad))[:11]
+        await self.db.teams.update_one({"user_id": str(user_id)}, {"$set": update})
+        self.profile_cache.update_fields(('teams', str(user_id)), update)
+        return added
+    
+    # Inventory
+    async def get_user_inventory(self, user_id, limit=10, before=None):
+        """
+        A page of the user's inventory, newest first
+        
+        Args:
+            user_id: Discord user ID
+            limit (int): Page size
+            before (tuple): (acquired_at, _id) of the last entry on the previous page
+        
+        Returns:
+            list: Inventory documents (item_id, data, acquired_at; cards also have player_id)
+        """
+        query = {"owner_id": str(user_id)}
+        if before:
+            acquired_at, last_id = before
+            query["$or"] = [
+                {"acquired_at": {"$lt": acquired_at}},
+                {"acquired_at": acquired_at, "_id": {"$lt": last_id}}
+            ]
+        cursor = self.db.inventory.find(query).sort([("acquired_at", -1), ("_id", -1)]).limit(limit)
+        return await cursor.to_list(length=limit)
+    
+    async def count_inventory(self, user_id):
+        """
+        Returns:
+            tuple: (player cards, other items) the user owns
+        """
+        total, cards = await asyncio.gather(
+            self.db.inventory.count_documents({"owner_id": str(user_id)}),
+            self.db.inventory.count_documents({"owner_id": str(user_id), "player_id": {"$ne": None}})
+        )
+        return cards, total - cards
+    
+    async def get_owned_player_ids(self, user_id):
+        """IDs of every player card the user owns"""
+        cursor = self.db.inventory.find(
+            {"owner_id": str(user_id), "player_id": {"$ne": None}}, {"_id": 0, "player_id": 1}
+        )
+        return {doc['player_id'] async for doc in cursor}
+    
+    async def find_owned_player(self, user_id, player_ids):
+        """The user's most recently acquired card for any of `player_ids`, or None"""
+        if not player_ids:
+            return None
+        return await self.db.inventory.find_one(
+            {"owner_id": str(user_id), "player_id": {"$in": list(player_ids)}},
+            sort=[("acquired_at", -1)]
         )
     
-    async def get_user_inventory(self, user_id):
-        """Get user's inventory"""
-        user = await self.db.economy.find_one({"user_id": str(user_id)})
-        return user.get('items', []) if user else []
+    async def transfer_player(self, from_user_id, to_user_id, card_id):
+        """
+        Move one card (by its inventory _id) between users in a single conditional update
+        
+        Returns:
+            dict: The moved card, or None if `from_user_id` no longer owns it
+        """
+        return await self.db.inventory.find_one_and_update(
+            {"_id": card_id, "owner_id": str(from_user_id)},
+            {"$set": {"owner_id": str(to_user_id), "acquired_at": datetime.utcnow()}, "$unset": {"migrated": ""}},
+            return_document=ReturnDocument.AFTER
+        )
     
     async def add_boost(self, user_id, boost_type, boost_value, duration):
         """Add temporary boost to user"""
@@ -502,10 +878,11 @@ class Database:
             },
             upsert=True
         )
+        self.invalidate_profile(user_id, 'economy')
     
     async def get_active_boosts(self, user_id):
         """Get user's active boosts"""
-        user = await self.db.economy.find_one({"user_id": str(user_id)})
+        user = await self.get_economy_user(user_id)
         if not user:
             return []
         
@@ -522,12 +899,13 @@ class Database:
                 {"user_id": str(user_id)},
                 {"$set": {"boosts": active_boosts}}
             )
+            self.profile_cache.update_fields(('economy', str(user_id)), {"boosts": active_boosts})
         
         return active_boosts
     
     async def claim_daily_reward(self, user_id):
         """Claim daily login reward"""
-        user = await self.db.economy.find_one({"user_id": str(user_id)})
+        user = await self.get_economy_user(user_id)
         
         if user and user.get('last_daily'):
             last_daily = user['last_daily']
@@ -545,6 +923,7 @@ class Database:
             {"$set": {"last_daily": datetime.utcnow()}},
             upsert=True
         )
+        self.invalidate_profile(user_id, 'economy')
         
         return True, ECONOMY_SETTINGS['daily_bonus']
     
@@ -597,43 +976,35 @@ class Database:
         return str(result.inserted_id)
     
     # Weekly/Monthly Leaderboard
-    async def get_leaderboard_by_period(self, period='weekly', limit=10):
-        """Get leaderboard for specific period"""
-        now = datetime.utcnow()
+    async def get_leaderboard_by_period(self, period='weekly', limit=10, previous=False):
+        """
+        Top players by wins within the current (or just finished) week or month
         
-        if period == 'weekly':
-            from datetime import timedelta
-            start_date = now - timedelta(days=7)
-        elif period == 'monthly':
-            from datetime import timedelta
-            start_date = now - timedelta(days=30)
-        else:
-            start_date = datetime.min
+        Args:
+            period (str): 'weekly' or 'monthly' (anything else is the all-time leaderboard)
+            limit (int): Number of entries
+            previous (bool): Rank the period that just ended (for prizes)
         
-        # Get users with matches in period
-        pipeline = [
-            {
-                "$match": {
-                    "updated_at": {"$gte": start_date}
-                }
-            },
-            {
-                "$sort": {"wins": -1}
-            },
-            {
-                "$limit": limit
-            }
-        ]
+        Returns:
+            list: Dicts with user_id, wins, losses and matches_played for that period
+        """
+        if period not in PERIODS:
+            return await self.get_leaderboard(limit=limit)
         
-        cursor = self.db.teams.aggregate(pipeline)
-        return await cursor.to_list(length=limit)
+        bucket, _, _ = period_window(period, previous=previous)
+        return await self._cached_leaderboard(
+            (period, bucket, limit),
+            lambda: self.db.leaderboards.find(
+                {"period": period, "bucket": bucket},
+                {"_id": 0, "user_id": 1, "wins": 1, "losses": 1, "matches_played": 1}
+            ).sort([("wins", -1), ("matches_played", 1)]).limit(limit).to_list(length=limit)
+        )
     
     async def award_leaderboard_prizes(self, period='weekly'):
         """Award prizes to top players"""
-        from config import LEADERBOARD_SETTINGS
-        
         prizes = LEADERBOARD_SETTINGS.get(f'{period}_prizes', {})
-        leaderboard = await self.get_leaderboard_by_period(period, limit=len(prizes))
+        # The period that just ended, not the one that just started
+        leaderboard = await self.get_leaderboard_by_period(period, limit=len(prizes), previous=True)
         
         awarded = []
         for idx, user_data in enumerate(leaderboard, 1):
@@ -0,0 +1,393 @@
+"""
+Document Semantics
+The subset of MongoDB query, update, projection and sort behaviour the bot relies on, in plain Python
+"""
+import copy
+from datetime import datetime
+from functools import cmp_to_key
+
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+
+
+MISSING = object()
+
+
+def get_values(doc, path):
+    """
+    Every value a dotted path reaches, descending through arrays the way MongoDB does
+
+    Returns:
+        list: (value, via_array) pairs; empty if the path is missing
+    """
+    values = [(doc, False)]
+    for part in path.split('.'):
+        reached = []
+        for value, via_array in values:
+            if isinstance(value, dict):
+                if part in value:
+                    reached.append((value[part], via_array))
+            elif isinstance(value, list):
+                if part.isdigit() and int(part) < len(value):
+                    reached.append((value[int(part)], True))
+                for item in value:
+                    if isinstance(item, dict) and part in item:
+                        reached.append((item[part], True))
+        values = reached
+    return values
+
+
+def _candidates(doc, path):
+    """Values a condition on `path` is tested against: each reached value, plus the elements of reached arrays"""
+    found = []
+    for value, _ in get_values(doc, path):
+        found.append(value)
+        if isinstance(value, list):
+            found.extend(value)
+    return found
+
+
+# MongoDB's cross-type sort order (BSON comparison order)
+def _type_rank(value):
+    if value is None or value is MISSING:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, dict):
+        return 4
+    if isinstance(value, list):
+        return 5
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime):
+        return 9
+    return 10
+
+
+def compare(a, b):
+    """-1, 0 or 1 in MongoDB order (types first, then values)"""
+    rank_a, rank_b = _type_rank(a), _type_rank(b)
+    if rank_a != rank_b:
+        return -1 if rank_a < rank_b else 1
+    if rank_a == 1:
+        return 0
+    if rank_a in (4, 5):
+        a, b = repr(a), repr(b)
+    return (a > b) - (a < b)
+
+
+def _equal(a, b):
+    return _type_rank(a) == _type_rank(b) and (a == b or (a in (None, MISSING) and b in (None, MISSING)))
+
+
+def _operator_matches(doc, path, operator, argument):
+    values = _candidates(doc, path)
+    if operator == '$eq':
+        return any(_equal(v, argument) for v in values) or (argument is None and not values)
+    if operator == '$ne':
+        return not _operator_matches(doc, path, '$eq', argument)
+    if operator in ('$gt', '$gte', '$lt', '$lte'):
+        wanted = {'$gt': (1,), '$gte': (0, 1), '$lt': (-1,), '$lte': (-1, 0)}[operator]
+        return any(_type_rank(v) == _type_rank(argument) and compare(v, argument) in wanted for v in values)
+    if operator == '$in':
+        return any(_operator_matches(doc, path, '$eq', choice) for choice in argument)
+    if operator == '$nin':
+        return not _operator_matches(doc, path, '$in', argument)
+    if operator == '$exists':
+        return bool(get_values(doc, path)) == bool(argument)
+    if operator == '$elemMatch':
+        for value, _ in get_values(doc, path):
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, dict) and matches(item, argument):
+                        return True
+                    if not isinstance(item, dict) and all(
+                        _operator_matches({'v': item}, 'v', op, arg) for op, arg in argument.items()
+                    ):
+                        return True
+        return False
+    if operator == '$size':
+        return any(isinstance(v, list) and len(v) == argument for v, _ in get_values(doc, path))
+    if operator == '$not':
+        return not _condition_matches(doc, path, argument)
+    raise OperationFailure(f"unknown operator: {operator}", code=2)
+
+
+def _condition_matches(doc, path, condition):
+    if isinstance(condition, dict) and condition and all(key.startswith('$') for key in condition):
+        return all(_operator_matches(doc, path, op, arg) for op, arg in condition.items())
+    return _operator_matches(doc, path, '$eq', condition)
+
+
+def matches(doc, query):
+    """True if `doc` satisfies the query filter"""
+    for key, condition in (query or {}).items():
+        if key == '$or':
+            if not any(matches(doc, branch) for branch in condition):
+                return False
+        elif key == '$and':
+            if not all(matches(doc, branch) for branch in condition):
+                return False
+        elif key == '$nor':
+            if any(matches(doc, branch) for branch in condition):
+                return False
+        elif not _condition_matches(doc, key, condition):
+            return False
+    return True
+
+
+def positional_index(doc, query, array_path):
+    """Index of the first element of `array_path` the query matched (for "field.$" updates)"""
+    prefix = array_path + '.'
+    conditions = {key[len(prefix):]: value for key, value in (query or {}).items() if key.startswith(prefix)}
+    if array_path in (query or {}):
+        conditions = {'$elem': query[array_path]}
+    for i, item in enumerate(_resolve(doc, array_path) or []):
+        if '$elem' in conditions:
+            if _condition_matches({'v': item}, 'v', conditions['$elem']):
+                return i
+        elif isinstance(item, dict) and matches(item, conditions):
+            return i
+    raise OperationFailure("The positional operator did not find the match needed from the query.", code=2)
+
+
+def _resolve(doc, path):
+    value = doc
+    for part in path.split('.'):
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return None
+    return value
+
+
+def _parent(doc, path, create=True):
+    """(container, last key) for a dotted path, creating intermediate documents when asked"""
+    parts = path.split('.')
+    target = doc
+    for part in parts[:-1]:
+        if isinstance(target, list):
+            if not part.isdigit() or int(part) >= len(target):
+                return None, None
+            target = target[int(part)]
+            continue
+        if part not in target or not isinstance(target[part], (dict, list)):
+            if not create:
+                return None, None
+            target[part] = {}
+        target = target[part]
+    last = parts[-1]
+    if isinstance(target, list):
+        return (target, int(last)) if last.isdigit() else (None, None)
+    return target, last
+
+
+def _get(container, key):
+    if isinstance(container, list):
+        return container[key] if key < len(container) else MISSING
+    return container.get(key, MISSING) if container is not None else MISSING
+
+
+def _put(container, key, value):
+    if container is None:
+        raise OperationFailure(f"Cannot create field '{key}' inside an array element", code=28)
+    if isinstance(container, list):
+        container.extend([None] * (key + 1 - len(container)))
+    container[key] = value
+
+
+def _expression(doc, value):
+    """Aggregation-pipeline update values: "$field" references, recursively through lists and documents"""
+    if isinstance(value, str) and value.startswith('$'):
+        resolved = _resolve(doc, value[1:])
+        return copy.deepcopy(resolved)
+    if isinstance(value, list):
+        return [_expression(doc, v) for v in value]
+    if isinstance(value, dict):
+        return {k: _expression(doc, v) for k, v in value.items()}
+    return value
+
+
+def apply_update(doc, update, query=None, inserting=False):
+    """
+    Apply update operators (or an aggregation-pipeline $set list) to `doc` in place
+
+    Args:
+        doc (dict): Document to modify
+        update (dict or list): Update document, or a pipeline of {"$set": ...} stages
+        query (dict): The filter that selected `doc` (for positional "$" paths)
+        inserting (bool): The document is being upserted ($setOnInsert applies)
+
+    Returns:
+        bool: Whether anything changed
+    """
+    before = copy.deepcopy(doc)
+    if isinstance(update, list):
+        for stage in update:
+            for operator, fields in stage.items():
+                if operator not in ('$set', '$addFields'):
+                    raise OperationFailure(f"Unsupported pipeline update stage: {operator}", code=2)
+                values = {path: _expression(doc, value) for path, value in fields.items()}
+                for path, value in values.items():
+                    container, key = _parent(doc, path)
+                    _put(container, key, value)
+        return doc != before
+
+    for operator, fields in update.items():
+        if operator == '$setOnInsert' and not inserting:
+            continue
+        for path, argument in fields.items():
+            if '.$.' in path or path.endswith('.$'):
+                array_path = path.split('.$', 1)[0]
+                path = path.replace('.$', f'.{positional_index(doc, query, array_path)}', 1)
+            _apply_operator(doc, operator, path, argument)
+    return doc != before
+
+
+def _apply_operator(doc, operator, path, argument):
+    if operator == '$unset':
+        container, key = _parent(doc, path, create=False)
+        if isinstance(container, dict):
+            container.pop(key, None)
+        elif isinstance(container, list) and key < len(container):
+            container[key] = None
+        return
+
+    container, key = _parent(doc, path)
+    current = _get(container, key)
+    if operator in ('$set', '$setOnInsert'):
+        _put(container, key, copy.deepcopy(argument))
+    elif operator == '$inc':
+        if current is MISSING or current is None:
+            current = 0
+        if not isinstance(current, (int, float)) or isinstance(current, bool):
+            raise OperationFailure(f"Cannot apply $inc to a value of non-numeric type ({path})", code=14)
+        _put(container, key, current + argument)
+    elif operator in ('$max', '$min'):
+        order = compare(argument, current)
+        if current is MISSING or (order > 0 if operator == '$max' else order < 0):
+            _put(container, key, copy.deepcopy(argument))
+    elif operator in ('$push', '$addToSet'):
+        if current is MISSING:
+            current = []
+            _put(container, key, current)
+        if not isinstance(current, list):
+            raise OperationFailure(f"The field '{path}' must be an array", code=2)
+        items = argument['$each'] if isinstance(argument, dict) and '$each' in argument else [argument]
+        for item in items:
+            if operator == '$push' or not any(_equal(existing, item) for existing in current):
+                current.append(copy.deepcopy(item))
+    elif operator == '$pull':
+        if isinstance(current, list):
+            current[:] = [item for item in current if not _pull_matches(item, argument)]
+    else:
+        raise OperationFailure(f"Unknown modifier: {operator}", code=9)
+
+
+def _pull_matches(item, condition):
+    if isinstance(condition, dict) and isinstance(item, dict) and not all(k.startswith('$') for k in condition):
+        return matches(item, condition)
+    return _condition_matches({'v': item}, 'v', condition)
+
+
+def upsert_seed(query):
+    """The document an upsert starts from: the filter's plain equality fields"""
+    doc = {}
+    for key, condition in (query or {}).items():
+        if key.startswith('$'):
+            continue
+        if isinstance(condition, dict) and condition and all(k.startswith('$') for k in condition):
+            if '$eq' not in condition:
+                continue
+            condition = condition['$eq']
+        container, last = _parent(doc, key)
+        _put(container, last, copy.deepcopy(condition))
+    return doc
+
+
+def project(doc, projection):
+    """
+    Apply a find() projection (inclusion or exclusion, dotted paths allowed)
+
+    Args:
+        doc (dict): Full document
+        projection (dict or list): {field: 1} / {field: 0} or a list of fields (None keeps everything)
+    """
+    if not projection:
+        return doc
+    if not isinstance(projection, dict):
+        projection = {field: 1 for field in projection}
+    include_id = bool(projection.get('_id', 1))
+    fields = {k: v for k, v in projection.items() if k != '_id'}
+    if any(fields.values()) or (not fields and '_id' in projection and include_id):
+        result = {'_id': doc['_id']} if include_id and '_id' in doc else {}
+        for path in fields:
+            _copy_path(doc, result, path.split('.'))
+        return result
+    result = copy.deepcopy(doc)
+    if not include_id:
+        result.pop('_id', None)
+    for path in fields:
+        container, key = _parent(result, path, create=False)
+        if isinstance(container, dict):
+            container.pop(key, None)
+    return result
+
+
+def _copy_path(source, target, parts):
+    if isinstance(source, list):
+        items = [item for item in source if isinstance(item, dict)]
+        target_list = target if isinstance(target, list) else []
+        for i, item in enumerate(items):
+            if i >= len(target_list):
+                target_list.append({})
+            _copy_path(item, target_list[i], parts)
+        return
+    head = parts[0]
+    if not isinstance(source, dict) or head not in source:
+        return
+    if len(parts) == 1:
+        target[head] = copy.deepcopy(source[head])
+        return
+    value = source[head]
+    if isinstance(value, list):
+        target[head] = target.get(head, [])
+        _copy_path(value, target[head], parts[1:])
+    elif isinstance(value, dict):
+        target[head] = target.get(head, {})
+        _copy_path(value, target[head], parts[1:])
+
+
+class SortKey:
+    """Sort key for one document under a [(field, direction)] spec (arrays sort by their min/max element)"""
+
+    __slots__ = ('values', 'directions')
+
+    def __init__(self, doc, spec):
+        self.directions = [direction for _, direction in spec]
+        self.values = []
+        for field, direction in spec:
+            values = _candidates(doc, field)
+            values = [v for v in values if not isinstance(v, list)] or [MISSING]
+            pick = min if direction > 0 else max
+            self.values.append(pick(values, key=cmp_to_key(compare)))
+
+    def __lt__(self, other):
+        for a, b, direction in zip(self.values, other.values, self.directions):
+            order = compare(a, b)
+            if order:
+                return order < 0 if direction > 0 else order > 0
+        return False
+
+
+def sort_spec(key_or_list, direction=None):
+    """Normalise cursor.sort() arguments to [(field, 1 or -1)]"""
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction or 1)]
+    return [(field, d) for field, d in key_or_list]
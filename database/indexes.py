@@ -0,0 +1,152 @@
+"""
+Database Indexes
+Every index the bot's queries rely on, created idempotently at connect, plus $indexStats usage reports
+"""
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+
+from config import MATCH_CHECKPOINT_SETTINGS
+
+
+# collection -> [(name, keys, options)]
+INDEXES = {
+    'teams': [
+        ('user_id_unique', [('user_id', ASCENDING)], {'unique': True}),
+        ('wins_desc', [('wins', DESCENDING)], {}),                       # get_leaderboard
+    ],
+    'economy': [
+        ('user_id_unique', [('user_id', ASCENDING)], {'unique': True}),
+    ],
+    'bans': [
+        ('user_id_unique', [('user_id', ASCENDING)], {'unique': True}),  # checked on every command
+    ],
+    'achievements': [
+        ('user_id_unique', [('user_id', ASCENDING)], {'unique': True}),
+    ],
+    'player_overrides': [
+        ('player_id_unique', [('player_id', ASCENDING)], {'unique': True}),
+    ],
+    'matches': [
+        # get_user_matches: keyset pages walk this index in (created_at, _id) order
+        ('participants_created', [('participants', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)], {}),
+    ],
+    'inventory': [
+        # find_owned_player / transfer_player / get_owned_player_ids
+        ('owner_player', [('owner_id', ASCENDING), ('player_id', ASCENDING)], {}),
+        # get_user_inventory: keyset pages walk this index in (acquired_at, _id) order
+        ('owner_acquired', [('owner_id', ASCENDING), ('acquired_at', DESCENDING), ('_id', DESCENDING)], {}),
+    ],
+    'transactions': [
+        ('user_id_timestamp', [('user_id', ASCENDING), ('timestamp', DESCENDING)], {}),
+    ],
+    'auctions': [
+        ('guild_status', [('guild_id', ASCENDING), ('status', ASCENDING)], {}),
+    ],
+    'legendary_auctions': [
+        ('guild_status', [('guild_id', ASCENDING), ('status', ASCENDING)], {}),
+    ],
+    'trades': [
+        ('receiver_status', [('receiver_id', ASCENDING), ('status', ASCENDING)], {}),
+        ('sender_status', [('sender_id', ASCENDING), ('status', ASCENDING)], {}),
+    ],
+    'leaderboards': [
+        ('period_bucket_user_unique', [('period', ASCENDING), ('bucket', ASCENDING), ('user_id', ASCENDING)],
+         {'unique': True}),
+        # get_leaderboard_by_period: top-N of one bucket is a walk of this index
+        ('period_bucket_rank', [('period', ASCENDING), ('bucket', ASCENDING), ('wins', DESCENDING),
+                                ('matches_played', ASCENDING)], {}),
+        ('expires_at_ttl', [('expires_at', ASCENDING)], {'expireAfterSeconds': 0}),
+    ],
+    'guild_members': [
+        ('guild_user_unique', [('guild_id', ASCENDING), ('user_id', ASCENDING)], {'unique': True}),
+        # get_leaderboard(guild_id=...): a guild's top-N is a walk of this index
+        ('guild_rank', [('guild_id', ASCENDING), ('wins', DESCENDING), ('matches_played', ASCENDING)], {}),
+    ],
+    'live_matches': [
+        # Abandoned checkpoints expire on their own; load_live() also skips them at startup
+        ('updated_at_ttl', [('updated_at', ASCENDING)],
+         {'expireAfterSeconds': int(MATCH_CHECKPOINT_SETTINGS['max_age_hours'] * 3600)}),
+    ],
+}
+
+# Indexes no query uses any more, dropped at connect if present
+RETIRED_INDEXES = {
+    'matches': ['team1_user_created', 'team2_user_created'],  # replaced by participants_created
+}
+
+# Server error codes
+NAMESPACE_NOT_FOUND = 26
+INDEX_NOT_FOUND = 27
+DUPLICATE_KEY = 11000
+INDEX_OPTIONS_CONFLICT = 85
+INDEX_KEY_SPECS_CONFLICT = 86
+
+
+async def ensure_indexes(database):
+    """
+    Create every index in INDEXES (existing identical indexes are a no-op)
+
+    An index whose options changed is dropped and rebuilt; a unique index blocked by
+    duplicate documents is skipped and reported so startup never fails on it.
+
+    Returns:
+        dict: ensured (count), rebuilt, dropped and failed ("collection.name: reason") lists
+    """
+    report = {'ensured': 0, 'rebuilt': [], 'dropped': [], 'failed': []}
+    for collection_name, indexes in INDEXES.items():
+        collection = database[collection_name]
+        for name, keys, options in indexes:
+            try:
+                await collection.create_index(keys, name=name, **options)
+                report['ensured'] += 1
+            except OperationFailure as e:
+                error = e
+                if e.code in (INDEX_OPTIONS_CONFLICT, INDEX_KEY_SPECS_CONFLICT):
+                    try:
+                        await collection.drop_index(name)
+                        await collection.create_index(keys, name=name, **options)
+                        report['rebuilt'].append(f"{collection_name}.{name}")
+                        continue
+                    except OperationFailure as rebuild_error:
+                        error = rebuild_error
+                reason = "duplicate values" if error.code == DUPLICATE_KEY else (error.details or {}).get('errmsg', str(error))
+                report['failed'].append(f"{collection_name}.{name}: {reason}")
+
+    for collection_name, names in RETIRED_INDEXES.items():
+        for name in names:
+            try:
+                await database[collection_name].drop_index(name)
+                report['dropped'].append(f"{collection_name}.{name}")
+            except OperationFailure as e:
+                if e.code not in (NAMESPACE_NOT_FOUND, INDEX_NOT_FOUND):
+                    report['failed'].append(f"{collection_name}.{name}: {(e.details or {}).get('errmsg', str(e))}")
+
+    print(f"🗂️ Indexes ready ({report['ensured']} ensured, {len(report['rebuilt'])} rebuilt, "
+          f"{len(report['dropped'])} dropped, {len(report['failed'])} failed)")
+    for failure in report['failed']:
+        print(f"⚠️ Index not created - {failure}")
+    return report
+
+
+async def index_usage(database):
+    """
+    Per-index usage since the server last restarted ($indexStats)
+
+    Returns:
+        list: Dicts with collection, name, ops and since, least used first
+    """
+    usage = []
+    for collection_name in INDEXES:
+        try:
+            stats = await database[collection_name].aggregate([{'$indexStats': {}}]).to_list(length=None)
+        except OperationFailure:
+            continue
+        for stat in stats:
+            usage.append({
+                'collection': collection_name,
+                'name': stat['name'],
+                'ops': stat['accesses']['ops'],
+                'since': stat['accesses']['since']
+            })
+    usage.sort(key=lambda u: u['ops'])
+    return usage
@@ -0,0 +1,80 @@
+"""
+Inventory
+Owned items and player cards as one document each in the inventory collection, plus the migration off economy.items
+"""
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+
+# item_id of a player card; everything else (packs, consumables, prizes) keeps its shop item_id
+CARD = 'player'
+# acquired_at for legacy entries saved without one (they sort as the oldest)
+UNKNOWN_ACQUIRED = datetime(1970, 1, 1)
+
+
+def inventory_documents(user_id, item_id, item_data, acquired_at=None):
+    """
+    Inventory documents for one grant
+
+    A 'players' grant ({'players': [...]}, as packs, giveaways and trades give them)
+    becomes one card per player so each can be looked up and moved on its own.
+
+    Returns:
+        list: Documents for the inventory collection
+    """
+    acquired_at = acquired_at or datetime.utcnow()
+    if item_id == 'players':
+        return [
+            {"owner_id": str(user_id), "item_id": CARD, "player_id": player.get('id'), "data": player,
+             "acquired_at": acquired_at}
+            for player in (item_data or {}).get('players', [])
+        ]
+    return [{"owner_id": str(user_id), "item_id": item_id, "data": item_data, "acquired_at": acquired_at}]
+
+
+async def migrate_inventory(database, batch_size=500):
+    """
+    Move every economy.items array into the inventory collection
+
+    Streams the economy documents that still have `items` in _id order. Each batch
+    first deletes anything an interrupted run already migrated for those users,
+    then inserts their documents and $unsets `items`, so repeating it is safe.
+
+    Args:
+        database: Motor database (db.db)
+        batch_size (int): Economy documents per batch
+
+    Returns:
+        dict: users and inventory documents migrated
+    """
+    report = {'users': 0, 'documents': 0}
+    batch = []
+    cursor = database.economy.find({"items": {"$exists": True}}, {"user_id": 1, "items": 1}).sort("_id", 1).batch_size(batch_size)
+    async for economy in cursor:
+        batch.append(economy)
+        if len(batch) >= batch_size:
+            await _migrate_batch(database, batch, report)
+            batch = []
+    if batch:
+        await _migrate_batch(database, batch, report)
+    return report
+
+
+async def _migrate_batch(database, batch, report):
+    await database.inventory.delete_many({"owner_id": {"$in": [e['user_id'] for e in batch]}, "migrated": True})
+    documents = []
+    for economy in batch:
+        for item in economy.get('items') or []:
+            for document in inventory_documents(
+                economy['user_id'], item.get('item_id'), item.get('data'), item.get('acquired_at') or UNKNOWN_ACQUIRED
+            ):
+                document['migrated'] = True
+                documents.append(document)
+    if documents:
+        await database.inventory.insert_many(documents, ordered=False)
+    await database.economy.bulk_write(
+        [UpdateOne({"_id": economy['_id']}, {"$unset": {"items": ""}}) for economy in batch], ordered=False
+    )
+    report['users'] += len(batch)
+    report['documents'] += len(documents)
@@ -0,0 +1,55 @@
+"""
+Period Leaderboards
+Per-user win counters bucketed by ISO week and calendar month, expired by a TTL index once old
+"""
+from datetime import datetime, timedelta
+
+from config import LEADERBOARD_SETTINGS
+
+
+PERIODS = ('weekly', 'monthly')
+
+
+def period_window(period, now=None, previous=False):
+    """
+    Bucket id and [start, end) of the week or month containing `now`
+
+    Args:
+        period (str): 'weekly' (ISO week, Monday start) or 'monthly'
+        now (datetime): UTC time (defaults to now)
+        previous (bool): The period before, i.e. the one that just finished
+
+    Returns:
+        tuple: (bucket id like '2026-W42' or '2026-10', start, end)
+    """
+    now = now or datetime.utcnow()
+    day = datetime(now.year, now.month, now.day)
+    if period == 'weekly':
+        start = day - timedelta(days=day.weekday())
+        if previous:
+            start -= timedelta(days=7)
+        year, week, _ = start.isocalendar()
+        return f"{year}-W{week:02d}", start, start + timedelta(days=7)
+    if period == 'monthly':
+        start = day.replace(day=1)
+        if previous:
+            start = (start - timedelta(days=1)).replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1)
+        return f"{start.year}-{start.month:02d}", start, end
+    raise ValueError(f"Unknown leaderboard period: {period}")
+
+
+def bucket_updates(user_id, won, now=None):
+    """(filter, update) pairs adding one result to the user's current weekly and monthly buckets"""
+    updates = []
+    for period in PERIODS:
+        bucket, _, end = period_window(period, now)
+        updates.append((
+            {"period": period, "bucket": bucket, "user_id": str(user_id)},
+            {
+                "$inc": {"wins" if won else "losses": 1, "matches_played": 1},
+                # Kept a while after the period ends so the prize job can still rank it
+                "$setOnInsert": {"expires_at": end + timedelta(days=LEADERBOARD_SETTINGS['bucket_retention_days'][period])}
+            }
+        ))
+    return updates
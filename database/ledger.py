@@ -0,0 +1,229 @@
+"""
+Transaction Ledger
+Coin movements queued in memory, spooled to disk and written to the transactions collection in batches
+"""
+import asyncio
+import os
+import time
+from datetime import datetime
+
+from bson import ObjectId, json_util
+from pymongo.errors import BulkWriteError
+
+
+DUPLICATE_KEY = 11000
+SPOOL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'ledger_spool.jsonl')
+
+
+class LedgerWriter:
+    """
+    Buffers transaction documents and writes them with insert_many off the command path
+
+    Every entry is appended to a local spool file as it is recorded and the spool is
+    rewritten to the unwritten backlog after each flush, so entries queued when the
+    process dies are replayed by recover() on the next start. Entries carry their _id
+    from the moment they're recorded, which makes a replay of an already-written
+    entry a harmless duplicate key.
+    """
+
+    def __init__(self, database, batch_size=500, flush_interval=0.25, high_water=10000, spool_path=SPOOL_PATH):
+        """
+        Args:
+            database: Database whose `db.transactions` receives the entries
+            batch_size (int): Entries per insert_many; a full batch is flushed immediately
+            flush_interval (float): Seconds a partial batch waits before it is flushed
+            high_water (int): Backlog size that counts as back-pressure (warned about once per episode)
+            spool_path (str): Crash-safety spool file (None disables spooling)
+        """
+        self.database = database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.high_water = high_water
+        self.spool_path = spool_path
+        self.buffer = []
+        self._spool = None
+        self._wakeup = None
+        self._task = None
+        self._over_high_water = False
+        self._failing = False
+        self._flush_lock = asyncio.Lock()  # One flush at a time, so the spool rewrite never drops an in-flight batch
+        self.stats = {'recorded': 0, 'written': 0, 'batches': 0, 'write_errors': 0, 'recovered': 0,
+                      'size_flushes': 0, 'timer_flushes': 0, 'max_buffered': 0, 'high_water_events': 0,
+                      'flush_ms_total': 0.0, 'flush_ms_max': 0.0}
+
+    def record(self, user_id, amount, type, reason, **extra):
+        """Queue one ledger entry (never waits on the database)"""
+        entry = {
+            "_id": ObjectId(),
+            "user_id": str(user_id),
+            "amount": amount,
+            "type": type,
+            "reason": reason,
+            **extra,
+            "timestamp": datetime.utcnow()
+        }
+        self.buffer.append(entry)
+        self._append_spool([entry])
+        self.stats['recorded'] += 1
+        self._track_backlog()
+        self._start()
+        if len(self.buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _start(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    def _track_backlog(self):
+        size = len(self.buffer)
+        self.stats['max_buffered'] = max(self.stats['max_buffered'], size)
+        if size >= self.high_water and not self._over_high_water:
+            self._over_high_water = True
+            self.stats['high_water_events'] += 1
+            print(f"⚠️ Ledger backlog at {size} entries - transactions writes are falling behind")
+        elif size < self.high_water // 2:
+            self._over_high_water = False
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                self.stats['size_flushes'] += 1
+            except asyncio.TimeoutError:
+                if not self.buffer:
+                    continue
+                self.stats['timer_flushes'] += 1
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        """
+        Write everything buffered so far
+
+        Returns:
+            bool: False if a batch failed (it stays buffered and spooled for the next flush)
+        """
+        async with self._flush_lock:
+            return await self._flush()
+
+    async def _flush(self):
+        ok = True
+        while self.buffer:
+            batch = self.buffer[:self.batch_size]
+            del self.buffer[:self.batch_size]
+            start = time.perf_counter()
+            try:
+                await self.database.db.transactions.insert_many(batch, ordered=False)
+            except asyncio.CancelledError:
+                # close() cancelled the loop mid-write: keep the batch for its final flush
+                self.buffer[:0] = batch
+                raise
+            except Exception as e:
+                # A retried entry that did land is a duplicate key: count it as written
+                if isinstance(e, BulkWriteError):
+                    failed = {error['index'] for error in e.details.get('writeErrors', [])
+                              if error.get('code') != DUPLICATE_KEY}
+                    self.stats['written'] += len(batch) - len(failed)
+                    batch = [entry for index, entry in enumerate(batch) if index in failed]
+                    if not batch:
+                        self._count_batch(start)
+                        continue
+                self.buffer[:0] = batch
+                self.stats['write_errors'] += 1
+                if not self._failing:
+                    print(f"⚠️ Ledger flush failed, retrying ({len(self.buffer)} entries buffered): {e}")
+                self._failing = True
+                ok = False
+                break
+            self.stats['written'] += len(batch)
+            self._count_batch(start)
+            if self._failing:
+                self._failing = False
+                print("✅ Ledger writes recovered")
+        self._rewrite_spool()
+        return ok
+
+    def _count_batch(self, start):
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats['batches'] += 1
+        self.stats['flush_ms_total'] += elapsed
+        self.stats['flush_ms_max'] = max(self.stats['flush_ms_max'], elapsed)
+
+    async def recover(self):
+        """Queue entries left in the spool by a previous run and flush them"""
+        if not self.spool_path or not os.path.exists(self.spool_path):
+            return 0
+        entries = []
+        with open(self.spool_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json_util.loads(line))
+                except ValueError:
+                    # Torn last line from a crash mid-write
+                    continue
+        if not entries:
+            return 0
+        # Ahead of anything recorded since startup, which the spool also holds
+        spooled = {entry['_id'] for entry in entries}
+        self.buffer = entries + [entry for entry in self.buffer if entry['_id'] not in spooled]
+        self.stats['recovered'] += len(entries)
+        print(f"📒 Replaying {len(entries)} spooled ledger entries")
+        if not await self.flush():
+            # Keep retrying in the background
+            self._start()
+        return len(entries)
+
+    def _append_spool(self, entries):
+        if not self.spool_path:
+            return
+        try:
+            if self._spool is None:
+                os.makedirs(os.path.dirname(self.spool_path), exist_ok=True)
+                self._spool = open(self.spool_path, 'a', encoding='utf-8')
+            self._spool.write(''.join(json_util.dumps(entry) + '\n' for entry in entries))
+            self._spool.flush()
+        except OSError as e:
+            print(f"⚠️ Ledger spool write failed: {e}")
+
+    def _rewrite_spool(self):
+        """Replace the spool with the unwritten backlog"""
+        if not self.spool_path:
+            return
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        try:
+            if not self.buffer:
+                if os.path.exists(self.spool_path):
+                    os.remove(self.spool_path)
+                return
+            tmp_path = self.spool_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(''.join(json_util.dumps(entry) + '\n' for entry in self.buffer))
+            os.replace(tmp_path, self.spool_path)
+        except OSError as e:
+            print(f"⚠️ Ledger spool rewrite failed: {e}")
+
+    async def close(self):
+        """Stop the flush loop and write the backlog (whatever still fails stays in the spool)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        return await self.flush()
+
+    def summary(self):
+        """Counters, backlog depth and age, and flush latency"""
+        batches = self.stats['batches']
+        oldest = self.buffer[0]['timestamp'] if self.buffer else None
+        return {
+            **self.stats,
+            'buffered': len(self.buffer),
+            'high_water': self.high_water,
+            'oldest_age_s': (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0,
+            'flush_ms_avg': self.stats['flush_ms_total'] / batches if batches else 0.0
+        }
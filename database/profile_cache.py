@@ -0,0 +1,120 @@
+"""
+Profile Cache
+Bounded LRU + TTL cache of per-user economy/teams documents with coalesced concurrent fetches
+"""
+import asyncio
+from collections import OrderedDict
+import copy
+import time
+
+
+class ProfileCache:
+    """(collection, user_id) -> document; callers get private copies, so mutating one never leaks into the cache"""
+
+    def __init__(self, max_entries=5000, ttl=30.0):
+        """
+        Args:
+            max_entries (int): Least recently used entries beyond this are evicted
+            ttl (float): Seconds before a cached document is re-read (bounds staleness
+                from writes made by other bot processes)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (expires_at, document or None)
+        self.inflight = {}            # key -> future shared by concurrent fetches (dropped by writes)
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'expired': 0, 'evicted': 0,
+                      'invalidated': 0, 'write_through': 0}
+
+    def _get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, document = entry
+        if time.monotonic() >= expires_at:
+            del self.entries[key]
+            self.stats['expired'] += 1
+            return False, None
+        self.entries.move_to_end(key)
+        return True, document
+
+    def put(self, key, document):
+        """Cache a document (None caches "no such user")"""
+        self.entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(document))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats['evicted'] += 1
+
+    async def fetch(self, key, loader):
+        """
+        Cached document for key, calling `loader` (coroutine function) on a miss
+
+        Concurrent misses for the same key share one loader call.
+        """
+        found, document = self._get(key)
+        if found:
+            self.stats['hits'] += 1
+            return copy.deepcopy(document)
+
+        future = self.inflight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            return copy.deepcopy(await asyncio.shield(future))
+
+        self.stats['misses'] += 1
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            document = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; retrieve it here so an unawaited future doesn't warn
+            future.exception()
+            raise
+        finally:
+            # A write during the query removed our future: the result may predate it, so don't cache it
+            current = self.inflight.get(key) is future
+            if current:
+                del self.inflight[key]
+
+        future.set_result(document)
+        if current:
+            self.put(key, document)
+        return copy.deepcopy(document)
+
+    def update_fields(self, key, fields):
+        """Write-through for a $set: patch the cached copy if there is one"""
+        self.inflight.pop(key, None)
+        found, document = self._get(key)
+        if found and document is not None:
+            document.update(copy.deepcopy(fields))
+            self.stats['write_through'] += 1
+        elif found:
+            # Cached as missing: an upsert just created it with fields we don't fully know
+            self.invalidate(key)
+
+    def invalidate(self, key):
+        """Drop a key after a write whose result isn't known locally ($inc, $push, upserts)"""
+        # A fetch started before this write must not be reused by later readers
+        self.inflight.pop(key, None)
+        if self.entries.pop(key, None) is not None:
+            self.stats['invalidated'] += 1
+
+    def clear(self):
+        """Drop every entry (after a bulk rewrite that bypassed Database)"""
+        self.inflight.clear()
+        self.stats['invalidated'] += len(self.entries)
+        self.entries.clear()
+
+    def summary(self):
+        """Size, hit rate and counters"""
+        lookups = self.stats['hits'] + self.stats['misses'] + self.stats['coalesced']
+        return {
+            **self.stats,
+            'size': len(self.entries),
+            'max_entries': self.max_entries,
+            'hit_rate': (self.stats['hits'] + self.stats['coalesced']) / lookups if lookups else 0.0
+        }
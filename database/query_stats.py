@@ -0,0 +1,58 @@
+"""
+Query Statistics
+Counts the database commands each bot command issues, via a driver command listener
+"""
+from contextvars import ContextVar
+
+from pymongo import monitoring
+
+
+# The running command's counter; Motor runs driver calls with the caller's context, so the listener sees it
+current_scope = ContextVar('db_query_scope', default=None)
+
+
+class QueryCounter(monitoring.CommandListener):
+    """Database commands per bot command (events arrive on driver threads; plain int updates only)"""
+
+    def __init__(self):
+        self.total = 0
+        self.by_command = {}   # command name -> {'calls', 'queries', 'max'}
+
+    def started(self, event):
+        self.total += 1
+        scope = current_scope.get()
+        if scope is not None:
+            scope['queries'] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def begin(self, name):
+        """Start counting for a bot command; returns the token for end()"""
+        return current_scope.set({'name': name, 'queries': 0})
+
+    def end(self, token):
+        """Stop counting and fold the command's total into by_command"""
+        scope = current_scope.get()
+        current_scope.reset(token)
+        if scope is None:
+            return 0
+        stats = self.by_command.setdefault(scope['name'], {'calls': 0, 'queries': 0, 'max': 0})
+        stats['calls'] += 1
+        stats['queries'] += scope['queries']
+        stats['max'] = max(stats['max'], scope['queries'])
+        return scope['queries']
+
+    def summary(self, top=10):
+        """
+        Commands issuing the most queries per call
+
+        Returns:
+            list: (command, calls, average queries, max queries), highest average first
+        """
+        rows = [(name, s['calls'], s['queries'] / s['calls'], s['max']) for name, s in self.by_command.items() if s['calls']]
+        rows.sort(key=lambda row: -row[2])
+        return rows[:top]
@@ -0,0 +1,787 @@
+"""
+SQLite Document Store
+Embedded, Motor-compatible collections over SQLite (WAL, prepared statements, JSON expression indexes)
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+import json
+import os
+import sqlite3
+import time
+from types import SimpleNamespace
+
+from bson import ObjectId
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne, monitoring
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.results import BulkWriteResult, DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+from database.documents import SortKey, apply_update, get_values, matches, project, sort_spec, upsert_seed
+
+
+# Datetimes and ObjectIds are stored as tagged strings so they survive JSON and sort correctly in SQL
+DATE_TAG = '\x01d:'
+OID_TAG = '\x01o:'
+DUPLICATE_KEY = 11000
+INDEX_NOT_FOUND = 27
+INDEX_OPTIONS_CONFLICT = 85
+
+
+def encode(value):
+    """Document (or value) -> JSON-safe form; datetimes keep millisecond precision like BSON"""
+    if isinstance(value, dict):
+        return {str(k): encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode(v) for v in value]
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return DATE_TAG + value.replace(microsecond=value.microsecond // 1000 * 1000).isoformat(timespec='microseconds')
+    if isinstance(value, ObjectId):
+        return OID_TAG + str(value)
+    return value
+
+
+def decode(value):
+    if isinstance(value, dict):
+        return {k: decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [decode(v) for v in value]
+    if isinstance(value, str) and value.startswith('\x01'):
+        if value.startswith(DATE_TAG):
+            return datetime.fromisoformat(value[len(DATE_TAG):])
+        if value.startswith(OID_TAG):
+            return ObjectId(value[len(OID_TAG):])
+    return value
+
+
+def _quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _json_path(field):
+    return "'$" + ''.join('."' + part.replace("'", "''").replace('"', '\\"') + '"' for part in field.split('.')) + "'"
+
+
+def _expr(field):
+    """SQL for a field's value; index definitions and queries must produce identical text for the index to apply"""
+    return 'id' if field == '_id' else f"json_extract(doc, {_json_path(field)})"
+
+
+def _scalar(value):
+    return value is not None and not isinstance(value, (dict, list, tuple))
+
+
+def _dumps(doc):
+    return json.dumps(encode(doc), separators=(',', ':'))
+
+
+def _loads(text):
+    return decode(json.loads(text))
+
+
+class SQLiteStore:
+    """One database file: a writer thread and a reader thread, each with its own connection"""
+
+    def __init__(self, path, listeners=(), cache_mb=16, ttl_sweep_interval=60):
+        self.path = path
+        self.listeners = [listener for listener in listeners if isinstance(listener, monitoring.CommandListener)]
+        self.cache_mb = cache_mb
+        self.ttl_sweep_interval = ttl_sweep_interval
+        # SQLite allows one writer at a time; WAL lets the reader run alongside it
+        self.writer = ThreadPoolExecutor(1, thread_name_prefix='sqlite-writer')
+        self.reader = ThreadPoolExecutor(1, thread_name_prefix='sqlite-reader')
+        self.write_conn = None
+        self.read_conn = None
+        self.tables = set()
+        self.indexes = {}    # table -> {name: {'keys': [[field, direction]], 'unique': bool, 'ttl': seconds or None}}
+        self.multikey = {}   # table -> indexed fields that have held arrays (matched through the table$keys side table)
+        self.last_sweep = time.monotonic()
+        self._opened = None
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, isolation_level=None, cached_statements=512)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_mb * 1024)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _open_writer(self):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = self.write_conn = self._connect()
+        conn.execute('CREATE TABLE IF NOT EXISTS "$indexes" (tbl TEXT, name TEXT, spec TEXT, PRIMARY KEY (tbl, name))')
+        conn.execute('CREATE TABLE IF NOT EXISTS "$multikey" (tbl TEXT, field TEXT, PRIMARY KEY (tbl, field))')
+        self.tables = {
+            name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            if not name.startswith('$') and not name.endswith('$keys')
+        }
+        for table, name, spec in conn.execute('SELECT tbl, name, spec FROM "$indexes"'):
+            self.indexes.setdefault(table, {})[name] = json.loads(spec)
+        for table, field in conn.execute('SELECT tbl, field FROM "$multikey"'):
+            self.multikey.setdefault(table, set()).add(field)
+
+    def _open_reader(self):
+        self.read_conn = self._connect()
+
+    async def open(self):
+        """Open both connections once; concurrent first callers share the same attempt"""
+        if self._opened is None:
+            self._opened = asyncio.ensure_future(self._open())
+        await self._opened
+
+    async def _open(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.writer, self._open_writer)
+        await loop.run_in_executor(self.reader, self._open_reader)
+
+    def notify(self, command_name, database_name):
+        """Tell command listeners (QueryCounter) about an operation, from the caller's context"""
+        if self.listeners:
+            event = SimpleNamespace(command_name=command_name, database_name=database_name)
+            for listener in self.listeners:
+                listener.started(event)
+
+    async def write(self, fn, *args):
+        await self.open()
+        return await asyncio.get_running_loop().run_in_executor(self.writer, self._in_transaction, fn, args)
+
+    async def read(self, fn, *args):
+        await self.open()
+        return await asyncio.get_running_loop().run_in_executor(self.reader, fn, self.read_conn, *args)
+
+    def _in_transaction(self, fn, args):
+        conn = self.write_conn
+        if time.monotonic() - self.last_sweep >= self.ttl_sweep_interval:
+            self._sweep_expired(conn)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn, *args)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            # Tables created inside the failed transaction are gone again
+            self.tables &= {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    # Schema
+    def ensure_table(self, conn, table):
+        if table in self.tables:
+            return
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} (id PRIMARY KEY, doc TEXT NOT NULL)")
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {_quote(table + '$keys')} (doc_id NOT NULL REFERENCES {_quote(table)}(id) "
+            f"ON DELETE CASCADE, field TEXT NOT NULL, value)"
+        )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote(table + '$keys$field_value')} "
+                     f"ON {_quote(table + '$keys')} (field, value)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote(table + '$keys$doc')} ON {_quote(table + '$keys')} (doc_id)")
+        self.tables.add(table)
+
+    def indexed_fields(self, table):
+        return {field for spec in self.indexes.get(table, {}).values() for field, _ in spec['keys']} - {'_id'}
+
+    def _sweep_expired(self, conn):
+        """TTL indexes: delete documents whose indexed date is older than expireAfterSeconds (MongoDB sweeps every 60s)"""
+        self.last_sweep = time.monotonic()
+        now = datetime.utcnow()
+        for table, indexes in self.indexes.items():
+            for spec in indexes.values():
+                if spec.get('ttl') is None or table not in self.tables:
+                    continue
+                expr = _expr(spec['keys'][0][0])
+                conn.execute(
+                    f"DELETE FROM {_quote(table)} WHERE {expr} >= ? AND {expr} < ?",
+                    (DATE_TAG, encode(now - timedelta(seconds=spec['ttl'])))
+                )
+
+    def close(self):
+        for executor, conn in ((self.writer, 'write_conn'), (self.reader, 'read_conn')):
+            connection = getattr(self, conn)
+            if connection is not None:
+                executor.submit(connection.close).result()
+                setattr(self, conn, None)
+            executor.shutdown(wait=True)
+
+
+class SQLiteClient:
+    """Stands in for AsyncIOMotorClient: client[name] is a database, all stored in one SQLite file"""
+
+    def __init__(self, path, event_listeners=(), cache_mb=16, ttl_sweep_interval=60):
+        """
+        Args:
+            path (str): Database file (created with its directory if missing)
+            event_listeners (list): Command listeners are notified of every operation, like the driver does
+            cache_mb (int): SQLite page cache per connection
+            ttl_sweep_interval (float): Seconds between TTL index sweeps
+        """
+        self.store = SQLiteStore(path, event_listeners, cache_mb, ttl_sweep_interval)
+        self.databases = {}
+
+    def __getitem__(self, name):
+        if name not in self.databases:
+            self.databases[name] = SQLiteDatabase(self, name)
+        return self.databases[name]
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+
+    async def drop_database(self, name):
+        name = getattr(name, 'name', name)
+        prefix = f"{name}."
+
+        def drop(conn):
+            for table in [t for t in self.store.tables if t.startswith(prefix)]:
+                conn.execute(f"DROP TABLE IF EXISTS {_quote(table + '$keys')}")
+                conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+                conn.execute('DELETE FROM "$indexes" WHERE tbl = ?', (table,))
+                conn.execute('DELETE FROM "$multikey" WHERE tbl = ?', (table,))
+                self.store.tables.discard(table)
+                self.store.indexes.pop(table, None)
+                self.store.multikey.pop(table, None)
+        self.store.notify('dropDatabase', name)
+        await self.store.write(drop)
+        self.databases.pop(name, None)
+
+    def close(self):
+        self.store.close()
+
+
+class SQLiteDatabase:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+        self.collections = {}
+
+    def __getitem__(self, name):
+        if name not in self.collections:
+            self.collections[name] = SQLiteCollection(self, name)
+        return self.collections[name]
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+
+    async def command(self, command, *args, **kwargs):
+        """Only ping is meaningful for an embedded store"""
+        name = command if isinstance(command, str) else next(iter(command))
+        if name != 'ping':
+            raise OperationFailure(f"Command {name} is not supported by the SQLite backend", code=59)
+        self.client.store.notify(name, self.name)
+        await self.client.store.open()
+        return {'ok': 1.0}
+
+    async def list_collection_names(self):
+        await self.client.store.open()
+        prefix = f"{self.name}."
+        return sorted(t[len(prefix):] for t in self.client.store.tables if t.startswith(prefix))
+
+
+class SQLiteCursor:
+    """find() cursor: sort/skip/limit/batch_size chain, async iteration and to_list like Motor's"""
+
+    def __init__(self, collection, query, projection):
+        self.collection = collection
+        self.query = query or {}
+        self.projection = projection
+        self.sort_spec = None
+        self.skip_count = 0
+        self.limit_count = 0
+        self.batch = 101
+        self.rows = None      # Generator over matching documents, advanced only on the reader thread
+        self.buffer = []
+        self.exhausted = False
+
+    def sort(self, key_or_list, direction=None):
+        self.sort_spec = sort_spec(key_or_list, direction)
+        return self
+
+    def skip(self, count):
+        self.skip_count = count
+        return self
+
+    def limit(self, count):
+        self.limit_count = abs(count)
+        return self
+
+    def batch_size(self, count):
+        self.batch = count or 101
+        return self
+
+    def _next_batch(self, conn):
+        if self.rows is None:
+            self.rows = self.collection._select(
+                conn, self.query, self.sort_spec, self.skip_count, self.limit_count, self.projection
+            )
+        return list(islice(self.rows, self.batch))
+
+    async def _fill(self):
+        store = self.collection.store
+        store.notify('getMore' if self.rows is not None else 'find', self.collection.database.name)
+        docs = await store.read(self._next_batch)
+        if len(docs) < self.batch:
+            self.exhausted = True
+        self.buffer.extend(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.buffer:
+            if self.exhausted:
+                raise StopAsyncIteration
+            await self._fill()
+            if not self.buffer:
+                raise StopAsyncIteration
+        return self.buffer.pop(0)
+
+    async def to_list(self, length=None):
+        docs = []
+        while length is None or len(docs) < length:
+            if not self.buffer:
+                if self.exhausted:
+                    break
+                await self._fill()
+                continue
+            take = len(self.buffer) if length is None else length - len(docs)
+            docs.extend(self.buffer[:take])
+            del self.buffer[:take]
+        return docs
+
+
+class _UnsupportedCursor:
+    def __init__(self, error):
+        self.error = error
+
+    async def to_list(self, length=None):
+        raise self.error
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise self.error
+
+
+class SQLiteCollection:
+    """The Motor collection methods the bot uses, with MongoDB semantics from database.documents"""
+
+    def __init__(self, database, name):
+        self.database = database
+        self.name = name
+        self.table = f"{database.name}.{name}"
+        self.store = database.client.store
+
+    # Query translation
+    def _where(self, query):
+        """
+        SQL WHERE for the filter's indexed fields
+
+        Returns:
+            tuple: (sql or None, params, exact); rows still need matches() unless exact
+        """
+        clauses, params, exact = [], [], True
+        for key, condition in query.items():
+            if key == '$or' or key == '$and':
+                branches = [self._where(branch) for branch in condition]
+                exact = exact and all(branch_exact for _, _, branch_exact in branches)
+                if all(sql for sql, _, _ in branches):
+                    joiner = ' OR ' if key == '$or' else ' AND '
+                    clauses.append('(' + joiner.join(f'({sql})' for sql, _, _ in branches) + ')')
+                    for _, branch_params, _ in branches:
+                        params.extend(branch_params)
+                elif key == '$and':
+                    for sql, branch_params, _ in branches:
+                        if sql:
+                            clauses.append(f'({sql})')
+                            params.extend(branch_params)
+                continue
+            clause = self._field_clause(key, condition)
+            if clause is None:
+                exact = False
+                continue
+            sql, clause_params, clause_exact = clause
+            clauses.append(sql)
+            params.extend(clause_params)
+            exact = exact and clause_exact
+        return (' AND '.join(clauses) or None), params, exact
+
+    def _field_clause(self, field, condition):
+        if field != '_id' and field not in self.store.indexed_fields(self.table):
+            return None
+        if not (isinstance(condition, dict) and condition and all(k.startswith('$') for k in condition)):
+            condition = {'$eq': condition}
+        expr = _expr(field)
+        multikey = field in self.store.multikey.get(self.table, ())
+        clauses, params, exact = [], [], True
+        for operator, argument in condition.items():
+            if operator in ('$eq', '$in'):
+                values = [argument] if operator == '$eq' else list(argument)
+                if not values or not all(_scalar(v) for v in values):
+                    exact = False
+                    continue
+                values = [encode(v) for v in values]
+                marks = ', '.join('?' * len(values))
+                if multikey:
+                    clauses.append(f"({expr} IN ({marks}) OR id IN (SELECT doc_id FROM {_quote(self.table + '$keys')} "
+                                   f"WHERE field = '{field.replace(chr(39), chr(39) * 2)}' AND value IN ({marks})))")
+                    params.extend(values + values)
+                else:
+                    clauses.append(f"{expr} IN ({marks})" if len(values) > 1 else f"{expr} = ?")
+                    params.extend(values)
+            elif operator in ('$gt', '$gte', '$lt', '$lte') and _scalar(argument) and not multikey:
+                sign = {'$gt': '>', '$gte': '>=', '$lt': '<', '$lte': '<='}[operator]
+                clauses.append(f"{expr} {sign} ?")
+                params.append(encode(argument))
+                # Keep the comparison inside the argument's type, as MongoDB does
+                if isinstance(argument, (datetime, ObjectId)):
+                    tag = DATE_TAG if isinstance(argument, datetime) else OID_TAG
+                    clauses.append(f"{expr} >= ? AND {expr} < ?")
+                    params.extend([tag, tag[:-1] + ';'])
+                elif isinstance(argument, (int, float)) and not isinstance(argument, bool):
+                    clauses.append(f"{expr} < ''")
+                else:
+                    exact = False
+            else:
+                exact = False
+        if not clauses:
+            return None
+        return ' AND '.join(clauses), params, exact
+
+    def _order_by(self, spec):
+        """ORDER BY for a sort SQLite can do itself (indexed, never-array fields), else None"""
+        indexed = self.store.indexed_fields(self.table) | {'_id'}
+        multikey = self.store.multikey.get(self.table, set())
+        if any(field not in indexed or field in multikey for field, _ in spec):
+            return None
+        return ', '.join(f"{_expr(field)} {'ASC' if direction > 0 else 'DESC'}" for field, direction in spec)
+
+    def _select(self, conn, query, spec=None, skip=0, limit=0, projection=None):
+        """Generator over matching documents (runs on whichever thread owns `conn`)"""
+        if self.table not in self.store.tables:
+            return
+        where, params, exact = self._where(query)
+        order = self._order_by(spec) if spec else ''
+        sql = f"SELECT doc FROM {_quote(self.table)}"
+        if where:
+            sql += f" WHERE {where}"
+        if order:
+            sql += f" ORDER BY {order}"
+        pushed = exact and order is not None
+        if pushed and (limit or skip):
+            sql += " LIMIT ? OFFSET ?"
+            params = params + [limit or -1, skip]
+        docs = (_loads(text) for (text,) in conn.execute(sql, params))
+        if not exact:
+            docs = (doc for doc in docs if matches(doc, query))
+        if spec and order is None:
+            docs = iter(sorted(docs, key=lambda doc: SortKey(doc, spec)))
+        if not pushed and (limit or skip):
+            docs = islice(docs, skip, skip + limit if limit else None)
+        for doc in docs:
+            yield project(doc, projection)
+
+    def _first(self, conn, query, sort=None):
+        return next(self._select(conn, query, sort_spec(sort) if sort else None, limit=1), None)
+
+    # Writes (run inside the writer's transaction)
+    def _index_rows(self, conn, doc_id, doc, replace=False):
+        """Side-table rows for indexed fields that hold arrays, so equality on an element can use an index"""
+        side = _quote(self.table + '$keys')
+        if replace:
+            conn.execute(f"DELETE FROM {side} WHERE doc_id = ?", (doc_id,))
+        for field in self.store.indexed_fields(self.table):
+            reached = get_values(doc, field)
+            if not any(via_array or isinstance(value, list) for value, via_array in reached):
+                continue
+            if field not in self.store.multikey.setdefault(self.table, set()):
+                conn.execute('INSERT OR IGNORE INTO "$multikey" VALUES (?, ?)', (self.table, field))
+                self.store.multikey[self.table].add(field)
+            values = set()
+            for value, _ in reached:
+                for item in value if isinstance(value, list) else [value]:
+                    if _scalar(item):
+                        values.add(encode(item))
+            conn.executemany(f"INSERT INTO {side} (doc_id, field, value) VALUES (?, ?, ?)",
+                             [(doc_id, field, value) for value in values])
+
+    def _insert(self, conn, doc):
+        if '_id' not in doc:
+            doc['_id'] = ObjectId()
+        doc_id = encode(doc['_id'])
+        try:
+            conn.execute(f"INSERT INTO {_quote(self.table)} (id, doc) VALUES (?, ?)", (doc_id, _dumps(doc)))
+        except sqlite3.IntegrityError as e:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.table} ({e})", DUPLICATE_KEY,
+                                    {'code': DUPLICATE_KEY, 'errmsg': str(e)})
+        self._index_rows(conn, doc_id, doc)
+        return doc['_id']
+
+    def _replace(self, conn, doc):
+        doc_id = encode(doc['_id'])
+        try:
+            conn.execute(f"UPDATE {_quote(self.table)} SET doc = ? WHERE id = ?", (_dumps(doc), doc_id))
+        except sqlite3.IntegrityError as e:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.table} ({e})", DUPLICATE_KEY,
+                                    {'code': DUPLICATE_KEY, 'errmsg': str(e)})
+        self._index_rows(conn, doc_id, doc, replace=True)
+
+    def _update(self, conn, query, update, upsert=False, many=False, replacement=False):
+        """Returns (matched, modified, upserted_id, document before, document after)"""
+        if not replacement and isinstance(update, dict) and not all(key.startswith('$') for key in update):
+            raise ValueError('update only works with $ operators')
+        self.store.ensure_table(conn, self.table)
+        matched = modified = 0
+        before = after = None
+        for doc in list(self._select(conn, query, limit=0 if many else 1)):
+            matched += 1
+            before = doc
+            if replacement:
+                new = {'_id': doc['_id'], **{k: v for k, v in update.items() if k != '_id'}}
+            else:
+                new = _loads(_dumps(doc))
+                if not apply_update(new, update, query):
+                    after = new
+                    continue
+            self._replace(conn, new)
+            modified += 1
+            after = new
+        if matched or not upsert:
+            return matched, modified, None, before, after
+        new = upsert_seed(query)
+        if replacement:
+            new = {**({'_id': new['_id']} if '_id' in new else {}), **update}
+        else:
+            apply_update(new, update, query, inserting=True)
+        upserted_id = self._insert(conn, new)
+        return 0, 0, upserted_id, None, new
+
+    def _delete(self, conn, query, many):
+        if self.table not in self.store.tables:
+            return 0
+        ids = [encode(doc['_id']) for doc in self._select(conn, query, limit=0 if many else 1, projection={'_id': 1})]
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            conn.execute(f"DELETE FROM {_quote(self.table)} WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+        return len(ids)
+
+    # Motor API
+    def find(self, filter=None, projection=None, **kwargs):
+        cursor = SQLiteCursor(self, filter, projection)
+        if kwargs.get('sort'):
+            cursor.sort(kwargs['sort'])
+        if kwargs.get('limit'):
+            cursor.limit(kwargs['limit'])
+        if kwargs.get('skip'):
+            cursor.skip(kwargs['skip'])
+        return cursor
+
+    async def find_one(self, filter=None, projection=None, sort=None, **kwargs):
+        if filter is not None and not isinstance(filter, dict):
+            filter = {'_id': filter}
+        self.store.notify('find', self.database.name)
+        spec = sort_spec(sort) if sort else None
+        return await self.store.read(
+            lambda conn: next(self._select(conn, filter or {}, spec, limit=1, projection=projection), None)
+        )
+
+    async def count_documents(self, filter, **kwargs):
+        self.store.notify('aggregate', self.database.name)
+
+        def count(conn):
+            if self.table not in self.store.tables:
+                return 0
+            where, params, exact = self._where(filter)
+            if exact:
+                sql = f"SELECT COUNT(*) FROM {_quote(self.table)}" + (f" WHERE {where}" if where else '')
+                return conn.execute(sql, params).fetchone()[0]
+            return sum(1 for _ in self._select(conn, filter, projection={'_id': 1}))
+        return await self.store.read(count)
+
+    async def estimated_document_count(self, **kwargs):
+        return await self.count_documents({})
+
+    async def insert_one(self, document, **kwargs):
+        self.store.notify('insert', self.database.name)
+
+        def insert(conn):
+            self.store.ensure_table(conn, self.table)
+            return self._insert(conn, document)
+        return InsertOneResult(await self.store.write(insert), True)
+
+    async def insert_many(self, documents, ordered=True, **kwargs):
+        self.store.notify('insert', self.database.name)
+        documents = list(documents)
+        await self._bulk([InsertOne(doc) for doc in documents], ordered)
+        return InsertManyResult([doc['_id'] for doc in documents if '_id' in doc], True)
+
+    async def update_one(self, filter, update, upsert=False, **kwargs):
+        self.store.notify('update', self.database.name)
+        matched, modified, upserted_id, _, _ = await self.store.write(self._update, filter, update, upsert)
+        return UpdateResult(self._update_raw(matched, modified, upserted_id), True)
+
+    async def update_many(self, filter, update, upsert=False, **kwargs):
+        self.store.notify('update', self.database.name)
+        matched, modified, upserted_id, _, _ = await self.store.write(self._update, filter, update, upsert, True)
+        return UpdateResult(self._update_raw(matched, modified, upserted_id), True)
+
+    async def replace_one(self, filter, replacement, upsert=False, **kwargs):
+        self.store.notify('update', self.database.name)
+        matched, modified, upserted_id, _, _ = await self.store.write(
+            self._update, filter, replacement, upsert, False, True
+        )
+        return UpdateResult(self._update_raw(matched, modified, upserted_id), True)
+
+    @staticmethod
+    def _update_raw(matched, modified, upserted_id):
+        raw = {'n': matched + (1 if upserted_id is not None else 0), 'nModified': modified, 'ok': 1.0}
+        if upserted_id is not None:
+            raw['upserted'] = upserted_id
+        return raw
+
+    async def find_one_and_update(self, filter, update, projection=None, sort=None, upsert=False,
+                                  return_document=False, **kwargs):
+        self.store.notify('findAndModify', self.database.name)
+
+        def find_and_modify(conn):
+            query = filter
+            if sort:
+                # Pin the update to the first document in sort order
+                first = self._first(conn, filter, sort)
+                query = {'_id': first['_id']} if first else filter
+            _, _, _, before, after = self._update(conn, query, update, upsert)
+            document = after if return_document else before
+            return project(document, projection) if document is not None else None
+        return await self.store.write(find_and_modify)
+
+    async def find_one_and_delete(self, filter, projection=None, sort=None, **kwargs):
+        self.store.notify('findAndModify', self.database.name)
+
+        def find_and_delete(conn):
+            if self.table not in self.store.tables:
+                return None
+            doc = self._first(conn, filter, sort)
+            if doc is not None:
+                conn.execute(f"DELETE FROM {_quote(self.table)} WHERE id = ?", (encode(doc['_id']),))
+                doc = project(doc, projection)
+            return doc
+        return await self.store.write(find_and_delete)
+
+    async def delete_one(self, filter, **kwargs):
+        self.store.notify('delete', self.database.name)
+        return DeleteResult({'n': await self.store.write(self._delete, filter, False), 'ok': 1.0}, True)
+
+    async def delete_many(self, filter, **kwargs):
+        self.store.notify('delete', self.database.name)
+        return DeleteResult({'n': await self.store.write(self._delete, filter, True), 'ok': 1.0}, True)
+
+    async def bulk_write(self, requests, ordered=True, **kwargs):
+        """InsertOne/UpdateOne/UpdateMany/ReplaceOne/DeleteOne/DeleteMany in one transaction"""
+        self.store.notify('bulkWrite', self.database.name)
+        return BulkWriteResult(await self._bulk(list(requests), ordered), True)
+
+    async def _bulk(self, requests, ordered):
+
+        def run(conn):
+            self.store.ensure_table(conn, self.table)
+            totals = {'writeErrors': [], 'writeConcernErrors': [], 'nInserted': 0, 'nUpserted': 0,
+                      'nMatched': 0, 'nModified': 0, 'nRemoved': 0, 'upserted': []}
+            for index, request in enumerate(requests):
+                try:
+                    conn.execute("SAVEPOINT op")
+                    if isinstance(request, InsertOne):
+                        self._insert(conn, request._doc)
+                        totals['nInserted'] += 1
+                    elif isinstance(request, (UpdateOne, UpdateMany, ReplaceOne)):
+                        matched, modified, upserted_id, _, _ = self._update(
+                            conn, request._filter, request._doc, request._upsert,
+                            isinstance(request, UpdateMany), isinstance(request, ReplaceOne)
+                        )
+                        totals['nMatched'] += matched
+                        totals['nModified'] += modified
+                        if upserted_id is not None:
+                            totals['nUpserted'] += 1
+                            totals['upserted'].append({'index': index, '_id': upserted_id})
+                    elif isinstance(request, (DeleteOne, DeleteMany)):
+                        totals['nRemoved'] += self._delete(conn, request._filter, isinstance(request, DeleteMany))
+                    else:
+                        raise TypeError(f"{request!r} is not a valid request")
+                    conn.execute("RELEASE op")
+                except (OperationFailure, sqlite3.IntegrityError) as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    totals['writeErrors'].append({
+                        'index': index, 'code': getattr(e, 'code', None) or DUPLICATE_KEY, 'errmsg': str(e),
+                        'op': getattr(request, '_doc', None) or getattr(request, '_filter', None)
+                    })
+                    if ordered:
+                        break
+            return totals
+
+        totals = await self.store.write(run)
+        if totals['writeErrors']:
+            raise BulkWriteError(totals)
+        return totals
+
+    def aggregate(self, pipeline, **kwargs):
+        return _UnsupportedCursor(OperationFailure("aggregate is not supported by the SQLite backend", code=115))
+
+    # Indexes
+    async def create_index(self, keys, name=None, unique=False, expireAfterSeconds=None, **kwargs):
+        """Expression index over json_extract of each key (TTL indexes are swept by the writer)"""
+        keys = [[keys, 1]] if isinstance(keys, str) else [[field, direction] for field, direction in keys]
+        name = name or '_'.join(f"{field}_{direction}" for field, direction in keys)
+        spec = {'keys': keys, 'unique': bool(unique), 'ttl': expireAfterSeconds}
+        self.store.notify('createIndexes', self.database.name)
+
+        def create(conn):
+            self.store.ensure_table(conn, self.table)
+            existing = self.store.indexes.get(self.table, {}).get(name)
+            if existing == spec:
+                return name
+            if existing is not None:
+                raise OperationFailure(f"An existing index has the same name ({name}) as the requested index",
+                                       INDEX_OPTIONS_CONFLICT)
+            columns = ', '.join(f"{_expr(field)} {'ASC' if direction > 0 else 'DESC'}" for field, direction in keys)
+            try:
+                conn.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX {_quote(self.table + '$' + name)} "
+                             f"ON {_quote(self.table)} ({columns})")
+            except sqlite3.IntegrityError as e:
+                raise OperationFailure(f"E11000 duplicate key error building {name}: {e}", DUPLICATE_KEY)
+            conn.execute('INSERT INTO "$indexes" VALUES (?, ?, ?)', (self.table, name, json.dumps(spec)))
+            self.store.indexes.setdefault(self.table, {})[name] = spec
+            # Existing documents with arrays in the new index's fields
+            for (doc_id, text) in conn.execute(f"SELECT id, doc FROM {_quote(self.table)}").fetchall():
+                self._index_rows(conn, doc_id, _loads(text), replace=True)
+            return name
+        return await self.store.write(create)
+
+    async def drop_index(self, name):
+        self.store.notify('dropIndexes', self.database.name)
+
+        def drop(conn):
+            if name not in self.store.indexes.get(self.table, {}):
+                raise OperationFailure(f"index not found with name [{name}]", INDEX_NOT_FOUND)
+            conn.execute(f"DROP INDEX IF EXISTS {_quote(self.table + '$' + name)}")
+            conn.execute('DELETE FROM "$indexes" WHERE tbl = ? AND name = ?', (self.table, name))
+            del self.store.indexes[self.table][name]
+        await self.store.write(drop)
+
+    async def index_information(self):
+        await self.store.open()
+        info = {'_id_': {'key': [('_id', 1)]}}
+        for name, spec in self.store.indexes.get(self.table, {}).items():
+            info[name] = {'key': [tuple(key) for key in spec['keys']]}
+            if spec['unique']:
+                info[name]['unique'] = True
+            if spec['ttl'] is not None:
+                info[name]['expireAfterSeconds'] = spec['ttl']
+        return info
@@ -43,7 +43,10 @@ def check_dependencies():
 
 def check_environment():
     """Check environment variables"""
-    required_vars = ['DISCORD_TOKEN', 'MONGODB_URI', 'ADMIN_IDS']
+    required_vars = ['DISCORD_TOKEN', 'ADMIN_IDS']
+    # The embedded SQLite backend needs no connection string
+    if os.getenv('STORAGE_BACKEND', 'mongodb') != 'sqlite':
+        required_vars.insert(1, 'MONGODB_URI')
     results = []
     
     # Check .env file
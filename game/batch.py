@@ -0,0 +1,257 @@
+"""
+Batch Match Simulator
+NumPy Monte Carlo over many independent innings in lockstep, for balancing outcome tables
+
+Run with: python -m game.batch --innings 1000000 --overs 20 [--matches] [--check]
+"""
+import argparse
+import math
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from game.rules import SHOTS, SHOT_OUTCOMES, DEFAULT_OUTCOMES
+
+
+WICKET = -1
+CHUNK_SIZE = 250000
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("Batch simulation needs numpy (pip install numpy)")
+
+
+def compile_outcome_tables(shot_outcomes=None, shots=None):
+    """
+    Turn per-shot (outcome, weight) lists into padded cumulative arrays
+
+    Args:
+        shot_outcomes (dict): Same shape as game.rules.SHOT_OUTCOMES (defaults to it)
+        shots (list): Shot order (defaults to game.rules.SHOTS)
+
+    Returns:
+        tuple: (cumulative probabilities [shots, k], outcome values [shots, k]);
+            values are runs with 0 for a dot ball and WICKET for a wicket
+    """
+    _require_numpy()
+    shot_outcomes = shot_outcomes or SHOT_OUTCOMES
+    shots = shots or SHOTS
+    width = max(len(shot_outcomes.get(shot, DEFAULT_OUTCOMES)) for shot in shots)
+    cumulative = np.full((len(shots), width), np.inf)
+    values = np.zeros((len(shots), width), dtype=np.int64)
+
+    for row, shot in enumerate(shots):
+        weights = shot_outcomes.get(shot, DEFAULT_OUTCOMES)
+        total = float(sum(w for _, w in weights))
+        running = 0.0
+        for col, (outcome, weight) in enumerate(weights):
+            running += weight
+            cumulative[row, col] = running / total
+            values[row, col] = WICKET if outcome == 'wicket' else (0 if outcome == 'dot' else outcome)
+        # Guard the last real bucket against floating point shortfall
+        cumulative[row, len(weights) - 1] = np.inf
+
+    return cumulative, values
+
+
+class BatchSimulator:
+    """Advance many innings one ball at a time with vectorized sampling"""
+
+    def __init__(self, overs, shot_weights=None, shot_outcomes=None, seed=None, xi_size=11):
+        """
+        Args:
+            overs (int): Overs per innings
+            shot_weights (dict): Batting policy as shot -> weight (default: uniform, like random_shot)
+            shot_outcomes (dict): Outcome tables to test (default: game.rules.SHOT_OUTCOMES)
+            seed (int): Seed for numpy's Generator
+            xi_size (int): Batsmen per side
+        """
+        _require_numpy()
+        self.overs = overs
+        # Same end condition as InningsState (balls < overs * 6)
+        self.max_balls = math.ceil(overs * 6)
+        self.xi_size = xi_size
+        self.rng = np.random.default_rng(seed)
+        self.cumulative, self.values = compile_outcome_tables(shot_outcomes)
+
+        if shot_weights:
+            weights = np.array([shot_weights.get(s, 0.0) for s in SHOTS], dtype=float)
+        else:
+            weights = np.ones(len(SHOTS))
+        self.shot_cdf = np.cumsum(weights / weights.sum())
+        self.shot_cdf[-1] = np.inf
+
+    def simulate(self, count, targets=None):
+        """
+        Simulate `count` innings (optionally chasing per-innings targets)
+
+        Returns:
+            dict: numpy arrays runs, wickets, balls, top_score
+        """
+        rng = self.rng
+        runs = np.zeros(count, dtype=np.int64)
+        wickets = np.zeros(count, dtype=np.int64)
+        balls = np.zeros(count, dtype=np.int64)
+        striker = np.zeros(count, dtype=np.int64)
+        non_striker = np.ones(count, dtype=np.int64)
+        next_batsman = np.full(count, 2, dtype=np.int64)
+        batsman_runs = np.zeros((count, self.xi_size), dtype=np.int64)
+        if targets is None:
+            targets = np.zeros(count, dtype=np.int64)
+
+        active = np.arange(count)
+        while active.size:
+            n = active.size
+            shots = np.searchsorted(self.shot_cdf, rng.random(n), side='right')
+            u = rng.random(n)
+            # bisect: number of cumulative entries <= u
+            col = (self.cumulative[shots] <= u[:, None]).sum(axis=1)
+            outcome = self.values[shots, col]
+
+            out = outcome == WICKET
+            scored = np.where(out, 0, outcome)
+            on_strike = striker[active]
+
+            runs[active] += scored
+            balls[active] += 1
+            wickets[active] += out
+            batsman_runs[active, on_strike] += scored
+
+            # Odd runs swap strike; a wicket brings in the next batsman on strike
+            odd = (outcome == 1) | (outcome == 3)
+            swap = active[odd]
+            striker[swap], non_striker[swap] = non_striker[swap], striker[swap].copy()
+            fallen = active[out]
+            striker[fallen] = np.minimum(next_batsman[fallen], self.xi_size - 1)
+            next_batsman[fallen] += 1
+
+            a_runs = runs[active]
+            a_targets = targets[active]
+            finished = (
+                (balls[active] >= self.max_balls)
+                | (wickets[active] >= 10)
+                | (out & (next_batsman[active] > self.xi_size))
+                | ((a_targets > 0) & (a_runs >= a_targets))
+            )
+            active = active[~finished]
+
+        return {
+            'runs': runs,
+            'wickets': wickets,
+            'balls': balls,
+            'top_score': batsman_runs.max(axis=1)
+        }
+
+    def simulate_matches(self, count):
+        """Simulate `count` matches: first innings, then a chase of runs + 1"""
+        first = self.simulate(count)
+        second = self.simulate(count, targets=first['runs'] + 1)
+        return {
+            'innings1': first,
+            'innings2': second,
+            'team1_wins': int((first['runs'] > second['runs']).sum()),
+            'team2_wins': int((second['runs'] > first['runs']).sum()),
+            'ties': int((first['runs'] == second['runs']).sum())
+        }
+
+
+def summarize(innings):
+    """Run-rate, run and wicket distributions for a batch of innings"""
+    runs = innings['runs']
+    balls = innings['balls']
+    wickets = innings['wickets']
+    return {
+        'innings': int(runs.size),
+        'mean_runs': float(runs.mean()),
+        'stdev_runs': float(runs.std()),
+        'run_percentiles': {p: float(np.percentile(runs, p)) for p in (5, 25, 50, 75, 95)},
+        'run_rate': float(runs.sum() / (balls.sum() / 6)),
+        'mean_balls': float(balls.mean()),
+        'mean_wickets': float(wickets.mean()),
+        'wicket_distribution': (np.bincount(wickets, minlength=11) / runs.size).tolist(),
+        'all_out': float((wickets >= 10).mean()),
+        'mean_top_score': float(innings['top_score'].mean()),
+    }
+
+
+def check_against_oracle(overs=20, innings=20000, seed=7):
+    """
+    Compare batch statistics with the pure-Python MatchSimulator (the oracle)
+
+    Returns:
+        bool: True if mean runs, wickets and balls agree within 4 standard errors
+    """
+    from game.simulator import MatchSimulator, random_xi
+    import random
+
+    xi_rng = random.Random(seed)
+    xi1, xi2 = random_xi(xi_rng), random_xi(xi_rng)
+    oracle = MatchSimulator(xi1, xi2, overs, seed=seed, track=False, model=None)
+    reference = [oracle.play_innings(xi1, xi2) for _ in range(innings)]
+    batch = BatchSimulator(overs, seed=seed).simulate(innings)
+
+    ok = True
+    for key in ('runs', 'wickets', 'balls'):
+        ref = np.array([r[key] for r in reference], dtype=float)
+        got = batch[key].astype(float)
+        stderr = np.sqrt(ref.var() / ref.size + got.var() / got.size)
+        diff = abs(ref.mean() - got.mean())
+        passed = diff <= 4 * stderr
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {key:<8} oracle {ref.mean():8.3f} | batch {got.mean():8.3f} | diff {diff:.3f} (4σ {4 * stderr:.3f})")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vectorized Monte Carlo innings simulator")
+    parser.add_argument('--innings', type=int, default=1000000)
+    parser.add_argument('--overs', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--matches', action='store_true', help="simulate matches (first innings + chase)")
+    parser.add_argument('--check', action='store_true', help="compare against the pure-Python simulator first")
+    args = parser.parse_args(argv)
+
+    _require_numpy()
+    if args.check and not check_against_oracle(args.overs):
+        raise SystemExit(1)
+
+    sim = BatchSimulator(args.overs, seed=args.seed)
+    start = time.perf_counter()
+    chunks = []
+    results = {'team1_wins': 0, 'team2_wins': 0, 'ties': 0}
+    remaining = args.innings
+    while remaining > 0:
+        size = min(CHUNK_SIZE, remaining)
+        if args.matches:
+            match = sim.simulate_matches(size)
+            chunks.extend([match['innings1'], match['innings2']])
+            for key in results:
+                results[key] += match[key]
+        else:
+            chunks.append(sim.simulate(size))
+        remaining -= size
+    elapsed = time.perf_counter() - start
+
+    innings = {key: np.concatenate([c[key] for c in chunks]) for key in chunks[0]}
+    stats = summarize(innings)
+    total_balls = int(innings['balls'].sum())
+    print(f"🏏 {stats['innings']:,} innings of {args.overs} overs in {elapsed:.2f}s "
+          f"({stats['innings'] / elapsed:,.0f} innings/s, {total_balls / elapsed:,.0f} balls/s)")
+    print(f"📊 Runs: mean {stats['mean_runs']:.1f} | stdev {stats['stdev_runs']:.1f} | "
+          + " | ".join(f"p{p} {v:.0f}" for p, v in stats['run_percentiles'].items()))
+    print(f"⚡ Run rate: {stats['run_rate']:.2f} per over | balls/innings {stats['mean_balls']:.1f} | "
+          f"top score {stats['mean_top_score']:.1f}")
+    print(f"🎯 Wickets: mean {stats['mean_wickets']:.2f} | all out {stats['all_out']:.1%}")
+    print("   " + " ".join(f"{w}:{p:.1%}" for w, p in enumerate(stats['wicket_distribution'])))
+    if args.matches:
+        total = args.innings
+        print(f"🏆 Team 1 {results['team1_wins'] / total:.1%} | Team 2 (chasing) "
+              f"{results['team2_wins'] / total:.1%} | Tie {results['ties'] / total:.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,292 @@
+"""
+Outcome Model
+Ratings- and conditions-aware ball outcome tables, compiled once into cumulative weights
+"""
+import random
+from bisect import bisect, bisect_right
+
+from game.rules import SHOTS, SHOT_OUTCOMES, DEFAULT_OUTCOMES, PACE_TYPES, BALL_LENGTHS, SPIN_DELIVERIES
+
+
+# Rating buckets: <60, 60-69, 70-79, 80-89, 90+
+RATING_EDGES = [60, 70, 80, 90]
+NEUTRAL_BUCKET = 2
+
+DIFFICULTIES = ['easy', 'hard']
+PITCHES = [None, 'Grassy', 'Dry', 'Flat', 'Two-paced']
+# Weather grouped by its pitch_impact (config.WEATHER_CONDITIONS)
+WEATHER_CLASSES = ['neutral', 'batting', 'bowling']
+
+# Deliveries grouped into classes that change how shots come off
+DELIVERY_CLASSES = [
+    None, 'good_length', 'full', 'yorker', 'bouncer', 'full_toss', 'slow', 'spin_stock', 'spin_variation'
+]
+SWING_PACE = {'Outswing', 'Inswing', 'Reverse Swing'}
+SPIN_STOCK = {'Off Spin', 'Leg Spin', 'Arm Ball', 'Topspin', 'Slider', 'Drifter'}
+LENGTH_CLASSES = {
+    'Good Length': 'good_length', 'Full': 'full', 'Yorker': 'yorker',
+    'Bouncer': 'bouncer', 'Full Toss': 'full_toss'
+}
+
+BOUNDARIES = (4, 6)
+
+# Per rating bucket of edge (batter bucket - bowler bucket)
+EDGE_WICKET = 0.08
+EDGE_BOUNDARY = 0.06
+EDGE_DOT = 0.04
+
+# (delivery class, shot or None for all shots) -> {'wicket'|'boundary'|'dot': multiplier}
+DELIVERY_MATCHUPS = {
+    ('yorker', None): {'boundary': 0.8},
+    ('yorker', 'loft'): {'wicket': 1.3},
+    ('yorker', 'pull'): {'wicket': 1.3},
+    ('bouncer', 'pull'): {'boundary': 1.2, 'wicket': 1.1},
+    ('bouncer', 'drive'): {'wicket': 1.3},
+    ('bouncer', 'leave'): {'wicket': 0.5},
+    ('full_toss', None): {'boundary': 1.4, 'wicket': 0.6},
+    ('full', 'drive'): {'boundary': 1.2},
+    ('full', 'flick'): {'boundary': 1.1},
+    ('good_length', 'loft'): {'wicket': 1.1},
+    ('good_length', 'defend'): {'wicket': 0.8},
+    ('slow', 'loft'): {'wicket': 1.2},
+    ('spin_stock', 'sweep'): {'boundary': 1.1},
+    ('spin_variation', None): {'wicket': 1.15},
+    ('spin_variation', 'leave'): {'wicket': 1.5},
+}
+# Extra edge for swing deliveries on shots played away from the body
+SWING_MATCHUPS = {'drive': {'wicket': 1.2}, 'cut': {'wicket': 1.2}}
+
+DIFFICULTY_EFFECTS = {'hard': {'wicket': 1.1}}
+PITCH_EFFECTS = {
+    'Flat': {'boundary': 1.15, 'wicket': 0.9},
+    'Two-paced': {'dot': 1.1, 'wicket': 1.05},
+}
+# Grassy pitches help pace, dry pitches help spin
+PITCH_BOWLER_EFFECTS = {('Grassy', False): {'wicket': 1.15}, ('Dry', True): {'wicket': 1.15}}
+WEATHER_EFFECTS = {'batting': {'boundary': 1.05}, 'bowling': {'wicket': 1.05}}
+
+
+def rating_bucket(rating):
+    """Bucket index for a 0-100 rating (None -> neutral)"""
+    if rating is None:
+        return NEUTRAL_BUCKET
+    return bisect_right(RATING_EDGES, rating)
+
+
+def delivery_class(delivery):
+    """
+    Classify a delivery label ("Quick Yorker", "Googly", ...)
+
+    Returns:
+        tuple: (class name or None, is_spin, is_swing)
+    """
+    if not delivery:
+        return None, False, False
+    for spin_deliveries in SPIN_DELIVERIES.values():
+        if delivery in spin_deliveries:
+            return ('spin_stock' if delivery in SPIN_STOCK else 'spin_variation'), True, False
+    for pace in PACE_TYPES:
+        if delivery.startswith(pace + ' '):
+            length = delivery[len(pace) + 1:]
+            if pace == 'Slow':
+                return 'slow', False, False
+            return LENGTH_CLASSES.get(length), False, pace in SWING_PACE
+    return None, False, False
+
+
+def weather_class(weather):
+    """'batting', 'bowling' or 'neutral' from a WEATHER_CONDITIONS entry (or None)"""
+    if not weather:
+        return 'neutral'
+    impact = weather.get('pitch_impact', 0) if isinstance(weather, dict) else 0
+    if impact > 0:
+        return 'batting'
+    if impact < 0:
+        return 'bowling'
+    return 'neutral'
+
+
+def _apply(weights, effects):
+    """Scale outcome weights in place by {'wicket'|'boundary'|'dot': multiplier}"""
+    if not effects:
+        return
+    for i, (outcome, weight) in enumerate(weights):
+        if outcome == 'wicket':
+            factor = effects.get('wicket', 1.0)
+        elif outcome == 'dot':
+            factor = effects.get('dot', 1.0)
+        elif outcome in BOUNDARIES:
+            factor = effects.get('boundary', 1.0)
+        else:
+            continue
+        weights[i] = (outcome, weight * factor)
+
+
+def outcome_weights(shot, klass=None, is_spin=False, is_swing=False, batter_bucket=NEUTRAL_BUCKET,
+                    bowler_bucket=NEUTRAL_BUCKET, difficulty='easy', pitch=None, weather='neutral'):
+    """
+    Adjusted (outcome, weight) list for one situation
+
+    Neutral inputs (equal buckets, unknown delivery, easy, no conditions)
+    reproduce game.rules.SHOT_OUTCOMES exactly.
+    """
+    weights = list(SHOT_OUTCOMES.get(shot, DEFAULT_OUTCOMES))
+
+    edge = batter_bucket - bowler_bucket
+    if edge:
+        _apply(weights, {
+            'wicket': max(0.4, 1 - EDGE_WICKET * edge),
+            'boundary': max(0.4, 1 + EDGE_BOUNDARY * edge),
+            'dot': max(0.4, 1 - EDGE_DOT * edge),
+        })
+
+    if klass:
+        _apply(weights, DELIVERY_MATCHUPS.get((klass, None)))
+        if shot is not None:
+            _apply(weights, DELIVERY_MATCHUPS.get((klass, shot)))
+    if is_swing:
+        _apply(weights, SWING_MATCHUPS.get(shot))
+
+    _apply(weights, DIFFICULTY_EFFECTS.get(difficulty))
+    _apply(weights, PITCH_EFFECTS.get(pitch))
+    if klass:
+        _apply(weights, PITCH_BOWLER_EFFECTS.get((pitch, is_spin)))
+    _apply(weights, WEATHER_EFFECTS.get(weather))
+    return weights
+
+
+class OutcomeModel:
+    """Every (shot, delivery, ratings, difficulty, pitch, weather) table precompiled for bisect sampling"""
+
+    def __init__(self):
+        self.shot_index = {shot: i for i, shot in enumerate(SHOTS)}
+        self.pitch_index = {pitch: i for i, pitch in enumerate(PITCHES)}
+        self.weather_index = {w: i for i, w in enumerate(WEATHER_CLASSES)}
+        self.difficulty_index = {d: i for i, d in enumerate(DIFFICULTIES)}
+        self.buckets = len(RATING_EDGES) + 1
+        self.conditions_stride = len(DIFFICULTIES) * len(PITCHES) * len(WEATHER_CLASSES)
+
+        # Deliveries are classified once per label; only combinations that exist become tables
+        self.delivery_variants = [(None, False, False)]
+        labels = [f"{pace} {length}" for pace in PACE_TYPES for length in BALL_LENGTHS]
+        for spin_deliveries in SPIN_DELIVERIES.values():
+            labels.extend(spin_deliveries)
+        for label in labels:
+            variant = delivery_class(label)
+            if variant not in self.delivery_variants:
+                self.delivery_variants.append(variant)
+        self._variant_index = {v: i for i, v in enumerate(self.delivery_variants)}
+        self._delivery_cache = {}
+
+        # Unknown shots fall back to DEFAULT_OUTCOMES like calculate_outcome did
+        self.shot_index[None] = len(SHOTS)
+        self.tables = []
+        for shot in SHOTS + [None]:
+            for variant in self.delivery_variants:
+                self._compile_shot_variant(shot, *variant)
+
+    def _compile_shot_variant(self, shot, klass, is_spin, is_swing):
+        """
+        Compile every ratings/difficulty/conditions table for one shot and delivery
+
+        Same result as outcome_weights(); the per-axis multipliers are just
+        combined directly instead of rebuilding the weight list each time.
+        """
+        weights = outcome_weights(shot, klass, is_spin, is_swing)
+        outcomes = tuple(outcome for outcome, _ in weights)
+        base = [weight for _, weight in weights]
+        categories = [
+            'wicket' if o == 'wicket' else 'dot' if o == 'dot' else 'boundary' if o in BOUNDARIES else None
+            for o in outcomes
+        ]
+
+        def factors(effects):
+            effects = effects or {}
+            return tuple(effects.get(c, 1.0) if c else 1.0 for c in categories)
+
+        edge_factors = {}
+        for edge in range(-(self.buckets - 1), self.buckets):
+            edge_factors[edge] = factors({
+                'wicket': max(0.4, 1 - EDGE_WICKET * edge),
+                'boundary': max(0.4, 1 + EDGE_BOUNDARY * edge),
+                'dot': max(0.4, 1 - EDGE_DOT * edge),
+            } if edge else None)
+        difficulty_factors = [factors(DIFFICULTY_EFFECTS.get(d)) for d in DIFFICULTIES]
+        pitch_factors = []
+        for pitch in PITCHES:
+            pf = factors(PITCH_EFFECTS.get(pitch))
+            bf = factors(PITCH_BOWLER_EFFECTS.get((pitch, is_spin)) if klass else None)
+            pitch_factors.append(tuple(a * b for a, b in zip(pf, bf)))
+        weather_factors = [factors(WEATHER_EFFECTS.get(w)) for w in WEATHER_CLASSES]
+
+        n = len(base)
+        for batter_bucket in range(self.buckets):
+            for bowler_bucket in range(self.buckets):
+                ef = edge_factors[batter_bucket - bowler_bucket]
+                edged = [base[k] * ef[k] for k in range(n)]
+                for df in difficulty_factors:
+                    with_difficulty = [edged[k] * df[k] for k in range(n)]
+                    for pf in pitch_factors:
+                        with_pitch = [with_difficulty[k] * pf[k] for k in range(n)]
+                        for wf in weather_factors:
+                            cumulative = []
+                            total = 0.0
+                            for k in range(n):
+                                total += with_pitch[k] * wf[k]
+                                cumulative.append(total)
+                            self.tables.append((outcomes, cumulative, total))
+
+    def delivery_variant(self, delivery):
+        """Delivery-variant axis index for a delivery label (cached per label)"""
+        variant = self._delivery_cache.get(delivery)
+        if variant is None:
+            variant = self._variant_index[delivery_class(delivery)]
+            self._delivery_cache[delivery] = variant
+        return variant
+
+    def condition_offset(self, difficulty='easy', pitch=None, weather=None):
+        """Table offset for match-wide settings (fixed for a whole innings)"""
+        i = self.difficulty_index.get(difficulty, 0)
+        i = i * len(PITCHES) + self.pitch_index.get(pitch, 0)
+        return i * len(WEATHER_CLASSES) + self.weather_index[weather_class(weather)]
+
+    def situation_index(self, shot, delivery, batter_bucket, bowler_bucket, offset=0):
+        """Flat table index from precomputed rating buckets and condition offset"""
+        i = self.shot_index.get(shot, self.shot_index[None]) * len(self.delivery_variants) + self.delivery_variant(delivery)
+        i = (i * self.buckets + batter_bucket) * self.buckets + bowler_bucket
+        return i * self.conditions_stride + offset
+
+    def index(self, shot, delivery=None, batting=None, bowling=None, difficulty='easy', pitch=None, weather=None):
+        """Flat table index for a situation (ratings are raw 0-100 values)"""
+        return self.situation_index(
+            shot, delivery, rating_bucket(batting), rating_bucket(bowling),
+            self.condition_offset(difficulty, pitch, weather)
+        )
+
+    def sample_index(self, index, rng=random):
+        """Draw an outcome from a precompiled table"""
+        outcomes, cumulative, total = self.tables[index]
+        return outcomes[bisect(cumulative, rng.random() * total)]
+
+    def sample(self, shot, delivery=None, batting=None, bowling=None, difficulty='easy',
+               pitch=None, weather=None, rng=random):
+        """Draw a ball outcome ('dot', 'wicket' or runs) for a situation"""
+        return self.sample_index(
+            self.index(shot, delivery, batting, bowling, difficulty, pitch, weather), rng
+        )
+
+    def probabilities(self, shot, delivery=None, batting=None, bowling=None, difficulty='easy',
+                      pitch=None, weather=None):
+        """Outcome -> probability for a situation"""
+        outcomes, cumulative, total = self.tables[
+            self.index(shot, delivery, batting, bowling, difficulty, pitch, weather)
+        ]
+        probs = {}
+        previous = 0.0
+        for outcome, running in zip(outcomes, cumulative):
+            probs[outcome] = probs.get(outcome, 0.0) + (running - previous) / total
+            previous = running
+        return probs
+
+
+outcome_model = OutcomeModel()
@@ -0,0 +1,283 @@
+"""
+Cricket Match Rules
+Outcome tables, bowler rotation, strike rotation and innings end conditions shared by
+the Discord match engine and the headless simulator
+"""
+import random
+from bisect import bisect
+
+
+SHOTS = ['drive', 'loft', 'defend', 'sweep', 'cut', 'leave', 'pull', 'flick']
+
+# Fast bowlers pick a pace type then a length ("Quick Yorker")
+PACE_TYPES = ['Quick', 'Outswing', 'Inswing', 'Reverse Swing', 'Slow']
+BALL_LENGTHS = ['Good Length', 'Full', 'Yorker', 'Bouncer', 'Full Toss']
+SPIN_DELIVERIES = {
+    'off_spin': ['Off Spin', 'Carrom Ball', 'Doosra', 'Arm Ball', 'Topspin'],
+    'leg_spin': ['Leg Spin', 'Googly', 'Flipper', 'Slider', 'Drifter'],
+}
+FAST_DELIVERIES = [f"{pace} {length}" for pace in PACE_TYPES for length in BALL_LENGTHS]
+
+OFF_SPINNER_NAMES = ['ashwin', 'lyon', 'moeen', 'jadeja']
+LEG_SPINNER_NAMES = ['kuldeep', 'chahal', 'rashid', 'zampa', 'adil']
+
+# (outcome, weight) per shot; outcome is 'dot', 'wicket' or runs
+SHOT_OUTCOMES = {
+    'defend': [('dot', 70), (1, 25), ('wicket', 5)],
+    'drive': [(4, 30), (2, 25), (1, 20), ('dot', 15), ('wicket', 10)],
+    'loft': [(6, 25), (4, 20), (1, 15), ('wicket', 40)],
+    'sweep': [(4, 30), (2, 25), (1, 20), ('wicket', 25)],
+    'cut': [(4, 35), (2, 20), (1, 25), ('dot', 10), ('wicket', 10)],
+    'leave': [('dot', 95), ('wicket', 5)],
+    'pull': [(6, 20), (4, 30), (1, 20), ('wicket', 30)],
+    'flick': [(2, 30), (1, 40), (4, 15), ('wicket', 15)]
+}
+DEFAULT_OUTCOMES = [('dot', 50), (1, 30), ('wicket', 20)]
+
+
+def _cumulative(weights):
+    """(outcomes, cumulative weights, total) for bisect sampling"""
+    outcomes = tuple(outcome for outcome, _ in weights)
+    cumulative = []
+    total = 0
+    for _, weight in weights:
+        total += weight
+        cumulative.append(total)
+    return outcomes, cumulative, total
+
+
+_OUTCOME_TABLES = {shot: _cumulative(weights) for shot, weights in SHOT_OUTCOMES.items()}
+_DEFAULT_TABLE = _cumulative(DEFAULT_OUTCOMES)
+
+
+def sample_outcome(shot, rng=random):
+    """Draw a ball outcome for a shot (same distribution as random.choices over SHOT_OUTCOMES)"""
+    outcomes, cumulative, total = _OUTCOME_TABLES.get(shot, _DEFAULT_TABLE)
+    return outcomes[bisect(cumulative, rng.random() * total)]
+
+
+def bowler_specialty(bowler):
+    """'off_spin', 'leg_spin' or 'fast' for a player dict"""
+    name = bowler['name'].lower()
+    if any(n in name for n in OFF_SPINNER_NAMES):
+        return "off_spin"
+    if any(n in name for n in LEG_SPINNER_NAMES):
+        return "leg_spin"
+    if bowler.get('bowl_type') == 'spin':
+        # Default spinners to off spin if not identified
+        return "off_spin"
+    return "fast"
+
+
+def deliveries_for(specialty):
+    """Every delivery a bowler of this specialty can bowl"""
+    return SPIN_DELIVERIES.get(specialty, FAST_DELIVERIES)
+
+
+def per_bowler_limit(overs):
+    """Max overs per bowler (T20: 4, ODI: 10, otherwise a fifth of the innings)"""
+    if overs <= 20:
+        return 4
+    elif overs >= 50:
+        return 10
+    # default conservative limit for other match lengths
+    return max(1, int(overs) // 5)
+
+
+class InningsState:
+    """Score, strike, bowler rotation and end conditions for one innings"""
+
+    def __init__(self, batting_xi, bowling_xi, overs, target=None, tracker=None):
+        self.batting_xi = batting_xi
+        self.bowling_xi = bowling_xi
+        self.overs = overs
+        self.target = target
+        self.tracker = tracker
+
+        self.striker_id = None
+        self.non_striker_id = None
+        self.runs = 0
+        self.wickets = 0
+        self.balls = 0
+        self.max_balls = overs * 6
+
+        # Current bowler, and last over's bowler (to prevent consecutive overs)
+        self.current_bowler_id = None
+        self.last_bowler_id = None
+        self.bowler_limit = per_bowler_limit(overs)
+        self.bowler_overs = {}
+
+        # Available batsmen (not yet in)
+        self.available_batsmen = batting_xi.copy()
+        self.striker_out = False
+
+    STATE_FIELDS = (
+        'striker_id', 'non_striker_id', 'runs', 'wickets', 'balls', 'current_bowler_id',
+        'last_bowler_id', 'bowler_overs', 'available_batsmen', 'striker_out'
+    )
+
+    def state_dict(self):
+        """Plain-data copy of the mutable innings state (for checkpoints)"""
+        state = {field: getattr(self, field) for field in self.STATE_FIELDS}
+        state['bowler_overs'] = dict(self.bowler_overs)
+        state['available_batsmen'] = list(self.available_batsmen)
+        return state
+
+    def load_state(self, state):
+        """Restore the mutable innings state from state_dict()"""
+        for field in self.STATE_FIELDS:
+            if field in state:
+                setattr(self, field, state[field])
+        self.bowler_overs = dict(self.bowler_overs)
+        self.available_batsmen = list(self.available_batsmen)
+
+    def is_complete(self):
+        """Overs used up, all out (or nobody left to bat) or target reached"""
+        if self.balls >= self.max_balls or self.wickets >= 10:
+            return True
+        if self.striker_out and not self.available_batsmen:
+            return True
+        return bool(self.target) and self.runs >= self.target
+
+    def set_openers(self, striker_id, non_striker_id):
+        self.striker_id = striker_id
+        self.non_striker_id = non_striker_id
+        self.available_batsmen.remove(striker_id)
+        self.available_batsmen.remove(non_striker_id)
+
+    def set_new_batsman(self, batsman_id):
+        """Send in the next batsman on strike after a wicket"""
+        self.striker_id = batsman_id
+        self.available_batsmen.remove(batsman_id)
+        self.striker_out = False
+
+    def allowed_bowlers(self):
+        """
+        Bowlers who may bowl the next over: not the previous over's bowler and
+        under the per-bowler limit, relaxing the rules rather than deadlocking
+        """
+        limit = self.bowler_limit
+        bowler_overs = self.bowler_overs
+        allowed = [
+            player_id for player_id in self.bowling_xi
+            if player_id != self.last_bowler_id and bowler_overs.get(player_id, 0) < limit
+        ]
+        if allowed:
+            return allowed
+
+        # Relax the no-consecutive constraint
+        allowed = [p for p in self.bowling_xi if bowler_overs.get(p, 0) < limit]
+        if allowed:
+            return allowed
+
+        # As last resort, allow all (prevents deadlock)
+        return self.bowling_xi.copy()
+
+    def apply_ball(self, outcome, shot=None):
+        """
+        Apply one delivery's outcome: score, strike rotation and over changes
+
+        Returns:
+            bool: True if this ball completed the over
+        """
+        self.balls += 1
+
+        if self.tracker is not None:
+            self.tracker.add_ball(
+                self.striker_id, self.current_bowler_id,
+                0 if outcome == 'wicket' or outcome == 'dot' else outcome,
+                outcome, shot
+            )
+
+        if outcome == 'wicket':
+            self.wickets += 1
+            self.striker_out = True
+        elif outcome != 'dot':
+            self.runs += outcome
+            # Swap batsmen on odd runs
+            if outcome == 1 or outcome == 3:
+                self.striker_id, self.non_striker_id = self.non_striker_id, self.striker_id
+
+        if self.balls % 6 == 0:
+            bowler_id = self.current_bowler_id
+            self.bowler_overs[bowler_id] = self.bowler_overs.get(bowler_id, 0) + 1
+            self.last_bowler_id = bowler_id
+            # Clearing current bowler so the next over needs a new selection
+            self.current_bowler_id = None
+            return True
+        return False
+
+
+class InningsSummary:
+    """Read-only scorecard of a finished innings, kept once its InningsState and tracker are released"""
+
+    __slots__ = ('innings', 'runs', 'wickets', 'balls', 'overs', 'target', 'batting', 'bowling', 'runs_per_over')
+
+    def __init__(self, innings, runs, wickets, balls, overs, target=None, batting=(), bowling=(), runs_per_over=()):
+        """
+        Args:
+            batting: (player_id, runs, balls, fours, sixes) per batsman who faced, in batting order
+            bowling: (player_id, balls, runs, wickets) per bowler who bowled
+            runs_per_over: Runs in each over, including a final partial over
+        """
+        values = {
+            'innings': innings, 'runs': runs, 'wickets': wickets, 'balls': balls, 'overs': overs, 'target': target,
+            'batting': tuple(tuple(row) for row in batting),
+            'bowling': tuple(tuple(row) for row in bowling),
+            'runs_per_over': tuple(runs_per_over)
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("InningsSummary is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("InningsSummary is read-only")
+
+    @classmethod
+    def from_state(cls, state, innings):
+        """Freeze an InningsState (and its tracker, if any) into a summary"""
+        batting, bowling, runs_per_over = [], [], []
+        if state.tracker is not None:
+            data = state.tracker.innings_data
+            for player_id in state.batting_xi:
+                stats = data['batsmen'].get(player_id)
+                if stats and stats['balls'] > 0:
+                    batting.append((player_id, stats['runs'], stats['balls'], stats['fours'], stats['sixes']))
+            for player_id in state.bowling_xi:
+                stats = data['bowlers'].get(player_id)
+                if stats and stats['balls'] > 0:
+                    bowling.append((player_id, stats['balls'], stats['runs'], stats['wickets']))
+            runs_per_over = list(data['runs_per_over'])
+            if data['current_over_balls']:
+                runs_per_over.append(data['current_over_runs'])
+        return cls(innings, state.runs, state.wickets, state.balls, state.overs, state.target,
+                   batting, bowling, runs_per_over)
+
+    @property
+    def score(self):
+        return f"{self.runs}/{self.wickets}"
+
+    @property
+    def overs_text(self):
+        """Overs bowled as cricket notation ('12.3')"""
+        return f"{self.balls // 6}.{self.balls % 6}"
+
+    @property
+    def run_rate(self):
+        return (self.runs / (self.balls / 6)) if self.balls > 0 else 0
+
+    def to_dict(self):
+        """Plain data (for checkpoints and match history)"""
+        return {
+            'innings': self.innings, 'runs': self.runs, 'wickets': self.wickets, 'balls': self.balls,
+            'overs': self.overs, 'target': self.target,
+            'batting': [list(row) for row in self.batting],
+            'bowling': [list(row) for row in self.bowling],
+            'runs_per_over': list(self.runs_per_over)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
@@ -0,0 +1,220 @@
+"""
+Headless Match Simulator
+Synchronous ball-by-ball matches with policy callbacks instead of Discord views
+
+Run with: python -m game.simulator --innings 10000 --overs 20
+"""
+import argparse
+import random
+from bisect import bisect
+import statistics
+import time
+
+from data.players import CATALOG
+from game.outcome_model import outcome_model, rating_bucket
+from game.rules import InningsState, SHOTS, bowler_specialty, deliveries_for, sample_outcome
+from utils.match_tracker import MatchTracker
+
+
+# Default policies. Each receives the InningsState, the simulator's RNG and the options
+def openers_in_order(state, rng):
+    """First two batsmen of the XI open"""
+    return state.available_batsmen[0], state.available_batsmen[1]
+
+
+def next_in_order(state, rng):
+    """Batting order follows the XI"""
+    return state.available_batsmen[0]
+
+
+def random_bowler(state, rng, allowed):
+    return allowed[int(rng.random() * len(allowed))]
+
+
+def random_delivery(state, rng, deliveries):
+    return deliveries[int(rng.random() * len(deliveries))]
+
+
+def random_shot(state, rng, delivery):
+    return SHOTS[int(rng.random() * len(SHOTS))]
+
+
+class MatchSimulator:
+    """Play innings and matches with the same rules as ProfessionalMatchEngine, without I/O"""
+
+    def __init__(self, team1_xi, team2_xi, overs, seed=None, track=True,
+                 pick_openers=openers_in_order, pick_batsman=next_in_order,
+                 pick_bowler=random_bowler, pick_delivery=random_delivery,
+                 pick_shot=random_shot, model=outcome_model,
+                 difficulty="easy", pitch=None, weather=None):
+        """
+        Args:
+            team1_xi (list): Player IDs batting first
+            team2_xi (list): Player IDs batting second
+            overs (int): Overs per innings
+            seed (int): Seed for reproducible matches
+            track (bool): Record full MatchTracker stats (slower; off for balance runs)
+            pick_*: Policy callbacks replacing the Discord selection views
+            model (OutcomeModel): Ratings-aware outcome tables; None uses the
+                flat game.rules shot tables (what game.batch reproduces)
+            difficulty, pitch, weather: Match settings fed to the model
+        """
+        self.team1_xi = team1_xi
+        self.team2_xi = team2_xi
+        self.overs = overs
+        self.rng = random.Random(seed)
+        self.track = track
+        self.pick_openers = pick_openers
+        self.pick_batsman = pick_batsman
+        self.pick_bowler = pick_bowler
+        self.pick_delivery = pick_delivery
+        self.pick_shot = pick_shot
+        self.model = model
+        self.condition_offset = model.condition_offset(difficulty, pitch, weather) if model else 0
+
+        # Delivery options and rating buckets per player, resolved once instead of per ball
+        self.deliveries = {}
+        self.batting_buckets = {}
+        self.bowling_buckets = {}
+        for player_id in list(team1_xi) + list(team2_xi):
+            player = CATALOG.get(player_id)
+            specialty = bowler_specialty(player) if player else "fast"
+            self.deliveries[player_id] = deliveries_for(specialty)
+            self.batting_buckets[player_id] = rating_bucket(player.get('batting') if player else None)
+            self.bowling_buckets[player_id] = rating_bucket(player.get('bowling') if player else None)
+
+    def play_innings(self, batting_xi, bowling_xi, target=None):
+        """
+        Simulate one innings ball by ball
+
+        Returns:
+            dict: runs, wickets, balls, timeline and (when tracking) the tracker summary
+        """
+        rng = self.rng
+        tracker = MatchTracker() if self.track else None
+        state = InningsState(batting_xi, bowling_xi, self.overs, target, tracker)
+        pick_bowler = self.pick_bowler
+        pick_delivery = self.pick_delivery
+        pick_shot = self.pick_shot
+        deliveries = self.deliveries
+        model = self.model
+        timeline = []
+        if model:
+            # Inlined OutcomeModel.situation_index/sample_index: this loop is the hot path
+            tables = model.tables
+            shot_base = {s: i * len(model.delivery_variants) for s, i in model.shot_index.items()}
+            unknown_shot = shot_base[None]
+            variant = model.delivery_variant
+            buckets = model.buckets
+            stride = model.conditions_stride
+            offset = self.condition_offset
+            batting_buckets = self.batting_buckets
+            bowling_buckets = self.bowling_buckets
+            uniform = rng.random
+
+        state.set_openers(*self.pick_openers(state, rng))
+
+        while not state.is_complete():
+            if state.current_bowler_id is None:
+                state.current_bowler_id = pick_bowler(state, rng, state.allowed_bowlers())
+
+            delivery = pick_delivery(state, rng, deliveries[state.current_bowler_id])
+            shot = pick_shot(state, rng, delivery)
+            if model:
+                index = (shot_base.get(shot, unknown_shot) + variant(delivery)) * buckets
+                index = (index + batting_buckets[state.striker_id]) * buckets + bowling_buckets[state.current_bowler_id]
+                outcomes, cumulative, total = tables[index * stride + offset]
+                outcome = outcomes[bisect(cumulative, uniform() * total)]
+            else:
+                outcome = sample_outcome(shot, rng)
+            state.apply_ball(outcome, shot)
+            timeline.append(outcome)
+
+            if outcome == 'wicket' and state.wickets < 10 and state.available_batsmen:
+                state.set_new_batsman(self.pick_batsman(state, rng))
+
+        return {
+            'runs': state.runs,
+            'wickets': state.wickets,
+            'balls': state.balls,
+            'target': target,
+            'bowler_overs': state.bowler_overs,
+            'timeline': timeline,
+            'summary': tracker.get_innings_summary() if tracker else None
+        }
+
+    def play_match(self):
+        """
+        Simulate both innings
+
+        Returns:
+            dict: innings1, innings2 and winner (1, 2 or None for a tie)
+        """
+        first = self.play_innings(self.team1_xi, self.team2_xi)
+        second = self.play_innings(self.team2_xi, self.team1_xi, target=first['runs'] + 1)
+
+        if second['runs'] > first['runs']:
+            winner = 2
+        elif second['runs'] < first['runs']:
+            winner = 1
+        else:
+            winner = None
+
+        return {'innings1': first, 'innings2': second, 'winner': winner}
+
+
+def random_xi(rng):
+    """Eleven random catalog players"""
+    return [p['id'] for p in rng.sample(CATALOG.all(), 11)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless cricket simulator for balance testing")
+    parser.add_argument('--innings', type=int, default=10000, help="innings (or matches with --matches) to simulate")
+    parser.add_argument('--overs', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--matches', action='store_true', help="simulate full matches instead of single innings")
+    parser.add_argument('--track', action='store_true', help="record full MatchTracker stats")
+    parser.add_argument('--flat', action='store_true', help="ignore ratings/conditions (plain shot tables)")
+    parser.add_argument('--difficulty', default="easy", choices=["easy", "hard"])
+    parser.add_argument('--pitch', default=None, help="Grassy, Dry, Flat or Two-paced")
+    parser.add_argument('--xi1', help="comma separated player IDs (default: random)")
+    parser.add_argument('--xi2', help="comma separated player IDs (default: random)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    xi1 = args.xi1.split(',') if args.xi1 else random_xi(rng)
+    xi2 = args.xi2.split(',') if args.xi2 else random_xi(rng)
+    sim = MatchSimulator(
+        xi1, xi2, args.overs, seed=args.seed, track=args.track,
+        model=None if args.flat else outcome_model, difficulty=args.difficulty, pitch=args.pitch
+    )
+
+    start = time.perf_counter()
+    innings = []
+    wins = {1: 0, 2: 0, None: 0}
+    for _ in range(args.innings):
+        if args.matches:
+            match = sim.play_match()
+            innings.extend([match['innings1'], match['innings2']])
+            wins[match['winner']] += 1
+        else:
+            innings.append(sim.play_innings(xi1, xi2))
+    elapsed = time.perf_counter() - start
+
+    runs = [i['runs'] for i in innings]
+    wickets = [i['wickets'] for i in innings]
+    balls = sum(i['balls'] for i in innings)
+    print(f"🏏 {len(innings):,} innings of {args.overs} overs in {elapsed:.2f}s "
+          f"({len(innings) / elapsed:,.0f} innings/s, {balls / elapsed:,.0f} balls/s)")
+    print(f"📊 Runs: mean {statistics.mean(runs):.1f} | median {statistics.median(runs)} | "
+          f"stdev {statistics.pstdev(runs):.1f} | min {min(runs)} | max {max(runs)}")
+    print(f"🎯 Wickets: mean {statistics.mean(wickets):.2f} | all out {sum(w >= 10 for w in wickets) / len(wickets):.1%}")
+    print(f"⚡ Run rate: {sum(runs) / (balls / 6):.2f} per over | balls/innings {balls / len(innings):.1f}")
+    if args.matches:
+        total = args.innings
+        print(f"🏆 Team 1 {wins[1] / total:.1%} | Team 2 (chasing) {wins[2] / total:.1%} | Tie {wins[None] / total:.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""
+Win Probability
+Dynamic-programming win probability over (balls left, wickets left, runs), precomputed per format
+from the outcome model, cached to disk and memory-mapped for O(1) lookups during a match
+
+Run with: python -m game.win_probability --overs 20 [--rebuild]
+"""
+import argparse
+import hashlib
+import math
+import os
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from game.outcome_model import outcome_model
+from game.rules import SHOTS
+
+
+WICKETS = 10
+CHASE = 0
+DEFEND = 1
+# Highest run count tracked per ball of the innings (capped for long formats)
+RUNS_PER_BALL_CAP = 3
+MAX_RUNS_CAP = 400
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'win_prob_cache')
+
+
+def ball_distribution(model=outcome_model, shots=SHOTS):
+    """
+    Outcome probabilities for an average ball (every shot equally likely, neutral ratings and conditions)
+
+    Returns:
+        dict: runs (0 for a dot ball) or 'wicket' -> probability
+    """
+    probs = {}
+    for shot in shots:
+        for outcome, p in model.probabilities(shot).items():
+            key = 0 if outcome == 'dot' else outcome
+            probs[key] = probs.get(key, 0.0) + p / len(shots)
+    return probs
+
+
+def innings_balls(overs):
+    """Balls in a full innings (The Hundred's 16.4 overs is 99 balls, as InningsState counts it)"""
+    return math.ceil(overs * 6)
+
+
+def build_tables(balls, max_runs, probs):
+    """
+    Backward induction over every state of an innings
+
+    Args:
+        balls (int): Balls in a full innings
+        max_runs (int): Largest run count tracked (needs and totals above it are clamped)
+        probs (dict): Per-ball distribution from ball_distribution
+
+    Returns:
+        numpy.ndarray: float32 [2, balls + 1, 11, max_runs + 1] where
+            [CHASE, b, w, r] is P(chasing side wins needing r with b balls and w wickets left) and
+            [DEFEND, b, w, r] is P(side batting first wins on r runs with b balls and w wickets left)
+    """
+    if np is None:
+        raise RuntimeError("Win probability tables need numpy (pip install numpy)")
+    wicket_p = probs.get('wicket', 0.0)
+    run_probs = [(runs, p) for runs, p in probs.items() if runs != 'wicket']
+    size = max_runs + 1
+
+    # Chase: W[b, w, r], won once r <= 0, lost when out of balls or wickets. A tie goes to the
+    # bowling side, as in the engine (target = first innings + 1)
+    chase = np.zeros((balls + 1, WICKETS + 1, size))
+    chase[:, :, 0] = 1.0
+    for b in range(1, balls + 1):
+        prev = chase[b - 1]
+        cur = np.zeros_like(prev)
+        for runs, p in run_probs:
+            if runs == 0:
+                cur += p * prev
+            else:
+                shifted = np.ones_like(prev)
+                shifted[:, runs:] = prev[:, :size - runs]
+                cur += p * shifted
+        cur[1:] += wicket_p * prev[:-1]
+        cur[0, 1:] = 0.0
+        cur[:, 0] = 1.0
+        chase[b] = cur
+
+    # Defend: D[b, w, r] for the side batting first; the innings ends into the chase of r + 1
+    full = chase[balls, WICKETS]
+    final = 1.0 - full[np.minimum(np.arange(size) + 1, max_runs)]
+    defend = np.empty_like(chase)
+    defend[0] = final
+    for b in range(1, balls + 1):
+        prev = defend[b - 1]
+        cur = np.zeros_like(prev)
+        for runs, p in run_probs:
+            if runs == 0:
+                cur += p * prev
+            else:
+                shifted = np.empty_like(prev)
+                shifted[:, :size - runs] = prev[:, runs:]
+                shifted[:, size - runs:] = prev[:, max_runs:]
+                cur += p * shifted
+        cur[1:] += wicket_p * prev[:-1]
+        cur[0] = final
+        defend[b] = cur
+
+    return np.stack([chase, defend]).astype(np.float32)
+
+
+def table_key(overs, probs):
+    """Cache file name: format plus a fingerprint of the outcome distribution it was built from"""
+    balls = innings_balls(overs)
+    fingerprint = repr(sorted((str(k), round(v, 9)) for k, v in probs.items()))
+    digest = hashlib.sha1(fingerprint.encode()).hexdigest()[:12]
+    return f"winprob_{balls}b_{digest}.npy"
+
+
+class WinProbabilityTable:
+    """Memory-mapped DP table for one innings length"""
+
+    def __init__(self, overs, data):
+        self.overs = overs
+        self.data = data
+        self.balls = data.shape[1] - 1
+        self.max_runs = data.shape[3] - 1
+
+    def chase(self, balls_left, wickets_left, runs_needed):
+        """P(chasing side wins)"""
+        if runs_needed <= 0:
+            return 1.0
+        if balls_left <= 0 or wickets_left <= 0:
+            return 0.0
+        return float(self.data[
+            CHASE, min(balls_left, self.balls), min(wickets_left, WICKETS), min(runs_needed, self.max_runs)
+        ])
+
+    def defend(self, balls_left, wickets_left, runs):
+        """P(side batting first wins) during the first innings"""
+        return float(self.data[
+            DEFEND, max(0, min(balls_left, self.balls)), max(0, min(wickets_left, WICKETS)),
+            max(0, min(runs, self.max_runs))
+        ])
+
+    def batting_first(self, innings, balls_left, wickets_left, runs, target=None):
+        """P(side batting first wins) from either innings' scoreboard"""
+        if innings == 1:
+            return self.defend(balls_left, wickets_left, runs)
+        return 1.0 - self.chase(balls_left, wickets_left, target - runs)
+
+
+def load_table(overs, cache_dir=CACHE_DIR, rebuild=False):
+    """
+    Load a format's table from the cache (memory-mapped), building and saving it first if missing
+
+    Returns:
+        WinProbabilityTable
+    """
+    if np is None:
+        raise RuntimeError("Win probability tables need numpy (pip install numpy)")
+    probs = ball_distribution()
+    path = os.path.join(cache_dir, table_key(overs, probs))
+
+    if rebuild or not os.path.exists(path):
+        balls = innings_balls(overs)
+        data = build_tables(balls, min(balls * RUNS_PER_BALL_CAP, MAX_RUNS_CAP), probs)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write then rename so a half-written file is never mapped
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, data)
+        os.replace(tmp_path, path)
+
+    return WinProbabilityTable(overs, np.load(path, mmap_mode='r'))
+
+
+_tables = {}
+
+
+def get_table(overs):
+    """Cached table for a format, or None when numpy is unavailable or the build fails"""
+    balls = innings_balls(overs)
+    if balls not in _tables:
+        try:
+            _tables[balls] = load_table(overs)
+        except (RuntimeError, OSError, ValueError) as e:
+            print(f"⚠️ Win probability unavailable for {overs} overs: {e}")
+            _tables[balls] = None
+    return _tables[balls]
+
+
+def preload(overs_list):
+    """Build or map every format's table up front (bot startup) so the first match doesn't pay for it"""
+    loaded = 0
+    for overs in sorted(set(overs_list)):
+        if get_table(overs) is not None:
+            loaded += 1
+    return loaded
+
+
+def turning_point(history):
+    """
+    Ball with the largest swing in the first-batting side's win probability
+
+    Args:
+        history (list): Dicts with innings, ball, p (from the engine's win_prob_history)
+
+    Returns:
+        tuple: (entry, swing) or (None, 0.0) when there are fewer than two points
+    """
+    best, swing = None, 0.0
+    for previous, entry in zip(history, history[1:]):
+        delta = entry['p'] - previous['p']
+        if abs(delta) > abs(swing):
+            best, swing = entry, delta
+    return best, swing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and inspect win probability tables")
+    parser.add_argument('--overs', type=float, default=20)
+    parser.add_argument('--rebuild', action='store_true', help="ignore the cached table")
+    args = parser.parse_args(argv)
+
+    overs = int(args.overs) if args.overs == int(args.overs) else args.overs
+    start = time.perf_counter()
+    table = load_table(overs, rebuild=args.rebuild)
+    elapsed = time.perf_counter() - start
+    print(f"📈 {overs} overs: {table.data.shape} table ({table.data.nbytes / 1e6:.1f}MB) ready in {elapsed * 1000:.0f}ms")
+
+    probs = ball_distribution()
+    expected = sum(k * p for k, p in probs.items() if k != 'wicket')
+    print(f"⚡ Per ball: {expected:.2f} runs expected, wicket {probs.get('wicket', 0):.1%}")
+    for total in (100, 140, 160, 180, 200):
+        print(f"   Chasing {total + 1} from {table.balls} balls: {table.chase(table.balls, WICKETS, total + 1):.1%}")
+
+    lookups = 1000000
+    start = time.perf_counter()
+    for i in range(lookups):
+        table.chase(60, 7, i % 120 + 1)
+    print(f"🔎 {(time.perf_counter() - start) / lookups * 1e9:.0f} ns/lookup")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Ban Cache
+Every ban held in memory so the global command check costs no database round trip
+"""
+import asyncio
+import logging
+
+from config import BAN_CACHE_SETTINGS
+from database.db import db
+
+
+logger = logging.getLogger('ban_cache')
+
+
+class BanCache:
+    """user_id -> ban reason, loaded at startup, updated by cmban/cmunban and refreshed periodically"""
+
+    def __init__(self, refresh_interval=60):
+        self.refresh_interval = refresh_interval
+        self.bans = None       # None until the first load succeeds
+        self._changes = None   # Local bans/unbans made while a refresh query is in flight
+        self._task = None
+        self.stats = {'hits': 0, 'misses': 0, 'blocked': 0, 'refreshes': 0, 'refresh_errors': 0}
+
+    async def load(self):
+        """Replace the cache with the bans collection (other processes' bans/unbans show up here)"""
+        self._changes = {}
+        try:
+            docs = await db.db.bans.find({}, {'user_id': 1, 'reason': 1}).to_list(length=None)
+        except Exception as e:
+            self._changes = None
+            self.stats['refresh_errors'] += 1
+            logger.error(f"Ban cache refresh failed: {e}")
+            return False
+
+        bans = {doc['user_id']: doc.get('reason') or 'No reason provided' for doc in docs}
+        # A ban/unban that landed after the query started wins over the stale result
+        for user_id, reason in self._changes.items():
+            if reason is None:
+                bans.pop(user_id, None)
+            else:
+                bans[user_id] = reason
+        self._changes = None
+        self.bans = bans
+        self.stats['refreshes'] += 1
+        return True
+
+    def start(self):
+        """Start the periodic refresh loop (idempotent)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.load()
+
+    async def get_reason(self, user_id):
+        """Ban reason for a user, or None if they aren't banned"""
+        user_id = str(user_id)
+        if self.bans is None:
+            # Not loaded yet (or the startup load failed): ask the database
+            self.stats['misses'] += 1
+            ban = await db.db.bans.find_one({"user_id": user_id})
+            reason = (ban.get('reason') or 'No reason provided') if ban else None
+        else:
+            self.stats['hits'] += 1
+            reason = self.bans.get(user_id)
+        if reason is not None:
+            self.stats['blocked'] += 1
+        return reason
+
+    def add(self, user_id, reason):
+        """cmban wrote a ban"""
+        user_id = str(user_id)
+        if self.bans is not None:
+            self.bans[user_id] = reason
+        if self._changes is not None:
+            self._changes[user_id] = reason
+
+    def remove(self, user_id):
+        """cmunban deleted a ban"""
+        user_id = str(user_id)
+        if self.bans is not None:
+            self.bans.pop(user_id, None)
+        if self._changes is not None:
+            self._changes[user_id] = None
+
+    def summary(self):
+        """Cache size, hit rate and refresh counters"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'loaded': self.bans is not None,
+            'size': len(self.bans) if self.bans is not None else 0,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0
+        }
+
+
+ban_cache = BanCache(BAN_CACHE_SETTINGS['refresh_interval'])
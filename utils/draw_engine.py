@@ -0,0 +1,169 @@
+"""
+Draw Engine
+Weighted card drops via precompiled Vose alias tables with seeded, replayable draws
+"""
+import logging
+import random
+
+
+logger = logging.getLogger('draw_engine')
+
+
+# Rarity roll for free hourly claims (out of 1000)
+HOURLY_CLAIM_WEIGHTS = {'common': 880, 'rare': 90, 'epic': 25, 'legendary': 5}
+
+# Rarity roll per pack rarity (cmbuy packs, free daily pack)
+PACK_RARITY_WEIGHTS = {
+    'common': {'common': 90, 'rare': 8, 'epic': 1.5, 'legendary': 0.5},
+    'rare': {'common': 60, 'rare': 30, 'epic': 8, 'legendary': 2},
+    'epic': {'common': 20, 'rare': 40, 'epic': 30, 'legendary': 10},
+    'legendary': {'common': 5, 'rare': 20, 'epic': 35, 'legendary': 40},
+}
+
+# Weekly leaderboard mystery box; higher rank = better rarity chances
+WEEKLY_RANK_WEIGHTS = {
+    1: {'common': 30, 'rare': 30, 'epic': 25, 'legendary': 15},
+    2: {'common': 40, 'rare': 35, 'epic': 20, 'legendary': 5},
+    3: {'common': 50, 'rare': 30, 'epic': 15, 'legendary': 5},
+}
+
+GIVEAWAY_WEIGHTS = {'common': 50, 'rare': 30, 'epic': 15, 'legendary': 5}
+
+# Free daily pack type (cmpack)
+FREE_PACK_WEIGHTS = {'bronze_pack': 60, 'silver_pack': 30, 'gold_pack': 10}
+
+
+class AliasTable:
+    """Vose alias table: O(n) build, O(1) weighted sample"""
+
+    def __init__(self, weights):
+        """
+        Compile a weight table
+
+        Args:
+            weights (dict): outcome -> non-negative weight (need not sum to 1)
+        """
+        self.outcomes = list(weights.keys())
+        self.weights = [float(w) for w in weights.values()]
+        total = sum(self.weights)
+        if not self.outcomes or total <= 0 or any(w < 0 for w in self.weights):
+            raise ValueError("Weight table needs at least one positive weight and no negatives")
+
+        n = len(self.outcomes)
+        self.probabilities = [w / total for w in self.weights]
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+
+        scaled = [p * n for p in self.probabilities]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+
+        # Leftovers are 1.0 up to floating point error
+        for i in large + small:
+            self.prob[i] = 1.0
+
+    def sample(self, rng=random):
+        """Draw one outcome"""
+        column = rng.randrange(len(self.prob))
+        if rng.random() < self.prob[column]:
+            return self.outcomes[column]
+        return self.outcomes[self.alias[column]]
+
+    def sample_many(self, count, rng=random):
+        """Draw `count` outcomes"""
+        n = len(self.prob)
+        prob = self.prob
+        alias = self.alias
+        outcomes = self.outcomes
+        randrange = rng.randrange
+        uniform = rng.random
+        results = []
+        for _ in range(count):
+            column = randrange(n)
+            results.append(outcomes[column] if uniform() < prob[column] else outcomes[alias[column]])
+        return results
+
+
+class DrawEngine:
+    """Named alias tables plus seeded, logged draws that can be replayed"""
+
+    def __init__(self):
+        self.tables = {}
+        self._seed_source = random.SystemRandom()
+
+    def register(self, name, weights):
+        """Compile (or recompile) a named weight table"""
+        self.tables[name] = AliasTable(weights)
+        return self.tables[name]
+
+    def new_seed(self):
+        """Fresh 64-bit seed for a draw"""
+        return self._seed_source.getrandbits(64)
+
+    def roll(self, name, count=1, seed=None, context=None):
+        """
+        Draw `count` outcomes from a named table
+
+        Args:
+            name (str): Registered table name
+            count (int): Number of outcomes to draw in one call
+            seed (int): Replay a previous draw; a new seed is generated if None
+            context (str): Free text logged with the seed (user, command, ...)
+
+        Returns:
+            tuple: (list of outcomes, seed used)
+        """
+        if seed is None:
+            seed = self.new_seed()
+        rng = random.Random(seed)
+        outcomes = self.tables[name].sample_many(count, rng)
+        logger.info("roll table=%s count=%d seed=%d context=%s", name, count, seed, context)
+        return outcomes, seed
+
+    def draw_cards(self, name, scheme, count=1, seed=None, context=None, catalog=None):
+        """
+        Roll `count` rarities from a table and pick a player for each from the
+        catalog's rarity buckets, all from one seeded RNG stream
+
+        Args:
+            name (str): Registered rarity table name
+            scheme (str): Catalog rarity scheme ('pack' or 'claim')
+            count (int): Number of cards
+            seed (int): Replay a previous draw; a new seed is generated if None
+            context (str): Free text logged with the seed
+            catalog (PlayerCatalog): Defaults to data.players.CATALOG
+
+        Returns:
+            tuple: (list of (rarity, catalog player) pairs, seed used)
+        """
+        if catalog is None:
+            from data.players import CATALOG
+            catalog = CATALOG
+        if seed is None:
+            seed = self.new_seed()
+        rng = random.Random(seed)
+        rarities = self.tables[name].sample_many(count, rng)
+        cards = [(rarity, catalog.draw(scheme, rarity, rng)) for rarity in rarities]
+        logger.info("cards table=%s scheme=%s count=%d seed=%d context=%s", name, scheme, count, seed, context)
+        return cards, seed
+
+
+draw_engine = DrawEngine()
+draw_engine.register('hourly_claim', HOURLY_CLAIM_WEIGHTS)
+for _pack_rarity, _weights in PACK_RARITY_WEIGHTS.items():
+    draw_engine.register(f'pack_{_pack_rarity}', _weights)
+for _rank, _weights in WEEKLY_RANK_WEIGHTS.items():
+    draw_engine.register(f'weekly_rank_{_rank}', _weights)
+draw_engine.register('giveaway', GIVEAWAY_WEIGHTS)
+draw_engine.register('free_pack', FREE_PACK_WEIGHTS)
@@ -0,0 +1,82 @@
+"""
+Keyset Pager
+Newer/Older button view over a keyset-paged query: each older page is one query, fetched only when asked for
+"""
+import discord
+from discord.ui import Button, View
+
+
+class KeysetPager(View):
+    """
+    Base pager; subclasses build the embed for `self.pages[self.page]`
+
+    Args:
+        author_id: Only this user can turn the pages
+        fetch: async fetch(limit=, before=) returning rows newest first, where
+            `before` is the (cursor_key, _id) of the last row already shown
+        cursor_key (str): Sort field the keyset continues from ('created_at', 'acquired_at')
+        page_size (int): Rows per page
+    """
+
+    def __init__(self, author_id, fetch, cursor_key, page_size=10):
+        super().__init__(timeout=180)
+        self.author_id = author_id
+        self.fetch = fetch
+        self.cursor_key = cursor_key
+        self.page_size = page_size
+        self.pages = []       # Pages loaded so far (going back re-uses them)
+        self.page = 0
+        self.has_more = True
+        self.message = None
+
+    async def load_next(self):
+        """Fetch the page after the last loaded one; False if there is none"""
+        before = None
+        if self.pages:
+            last = self.pages[-1][-1]
+            before = (last[self.cursor_key], last['_id'])
+        # One extra row tells us whether an older page exists
+        rows = await self.fetch(limit=self.page_size + 1, before=before)
+        self.has_more = len(rows) > self.page_size
+        if not rows:
+            return False
+        self.pages.append(rows[:self.page_size])
+        return True
+
+    def update_buttons(self):
+        self.newer_button.disabled = self.page == 0
+        self.older_button.disabled = not self.pages or (self.page == len(self.pages) - 1 and not self.has_more)
+
+    def build_embed(self):
+        raise NotImplementedError
+
+    async def interaction_check(self, interaction):
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("⚠️ Only the person who asked can turn these pages!", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="Newer", style=discord.ButtonStyle.secondary, emoji="◀️")
+    async def newer_button(self, interaction: discord.Interaction, button: Button):
+        self.page = max(0, self.page - 1)
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="Older", style=discord.ButtonStyle.secondary, emoji="▶️")
+    async def older_button(self, interaction: discord.Interaction, button: Button):
+        if self.page == len(self.pages) - 1 and not await self.load_next():
+            self.update_buttons()
+            await interaction.response.edit_message(view=self)
+            return
+        self.page += 1
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
@@ -0,0 +1,112 @@
+"""
+Match Checkpoints
+Coalesced per-ball snapshots of live matches in the live_matches collection, so matches survive restarts
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from pymongo import ReplaceOne, DeleteOne
+
+from config import MATCH_CHECKPOINT_SETTINGS
+from database.db import db
+
+
+logger = logging.getLogger('match_checkpoint')
+
+
+class CheckpointWriter:
+    """Keep only the newest snapshot per match and write them in one bulk_write per interval"""
+
+    def __init__(self, flush_interval=1.0):
+        self.flush_interval = flush_interval
+        self.pending = {}      # match_id -> latest snapshot
+        self.finished = set()  # match_ids whose checkpoint should be deleted
+        self.draining = False
+        self._task = None
+        self._lock = asyncio.Lock()
+        self.stats = {'marked': 0, 'coalesced': 0, 'written': 0, 'deleted': 0, 'flushes': 0, 'errors': 0}
+
+    def start(self):
+        """Start the background flush loop (idempotent)"""
+        if self._task is None or self._task.done():
+            self.draining = False
+            self._task = asyncio.create_task(self._run())
+
+    def mark(self, snapshot):
+        """Queue a match snapshot; a newer one for the same match replaces it before it is written"""
+        match_id = snapshot['_id']
+        if match_id in self.pending:
+            self.stats['coalesced'] += 1
+        self.pending[match_id] = snapshot
+        self.finished.discard(match_id)
+        self.stats['marked'] += 1
+
+    def discard(self, match_id):
+        """Match finished (result saved or forfeited): drop its checkpoint"""
+        self.pending.pop(match_id, None)
+        self.finished.add(match_id)
+
+    async def flush(self):
+        """Write every queued snapshot and deletion in one round trip"""
+        async with self._lock:
+            if not self.pending and not self.finished:
+                return 0
+            if db.db is None:
+                return 0
+
+            pending, self.pending = self.pending, {}
+            finished, self.finished = self.finished, set()
+            ops = [ReplaceOne({'_id': match_id}, doc, upsert=True) for match_id, doc in pending.items()]
+            ops += [DeleteOne({'_id': match_id}) for match_id in finished]
+
+            try:
+                await db.db.live_matches.bulk_write(ops, ordered=False)
+            except Exception as e:
+                # Put back whatever wasn't superseded while we were writing
+                for match_id, doc in pending.items():
+                    if match_id not in self.finished:
+                        self.pending.setdefault(match_id, doc)
+                self.finished |= {m for m in finished if m not in self.pending}
+                self.stats['errors'] += 1
+                logger.error(f"Checkpoint flush failed ({len(ops)} ops): {e}")
+                return 0
+
+            self.stats['written'] += len(pending)
+            self.stats['deleted'] += len(finished)
+            self.stats['flushes'] += 1
+            return len(ops)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def drain(self):
+        """Shutdown: stop the loop and flush everything still queued"""
+        self.draining = True
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        written = await self.flush()
+        print(f"💾 Drained match checkpoints ({written} writes)")
+        return written
+
+    async def load_live(self, max_age_hours=None):
+        """
+        Checkpoints to resume, dropping ones too old to be worth resuming
+
+        Returns:
+            list: live_matches documents, oldest first
+        """
+        max_age_hours = max_age_hours or MATCH_CHECKPOINT_SETTINGS['max_age_hours']
+        cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+        await db.db.live_matches.delete_many({'updated_at': {'$lt': cutoff}})
+        return await db.db.live_matches.find({}).sort('updated_at', 1).to_list(length=None)
+
+
+checkpoint_writer = CheckpointWriter(MATCH_CHECKPOINT_SETTINGS['flush_interval'])
@@ -0,0 +1,179 @@
+"""
+Match Console
+One persistent scoreboard message and one persistent controls message per match, edited in place
+each ball; only key events (wickets, milestones, innings breaks) post new messages
+"""
+from collections import deque
+import logging
+import time
+
+from utils.outbound import outbound, PROMPT, RESULT, DECORATIVE
+
+
+logger = logging.getLogger('match_console')
+
+# Interaction tokens last 15 minutes; stop reusing one a little before that
+INTERACTION_TTL = 14 * 60
+
+
+class MatchConsole:
+    """Routes every outbound match message through the scheduler and counts the Discord API calls it costs"""
+
+    def __init__(self, channel, persistent=True, feed_lines=4):
+        """
+        Args:
+            channel: Match channel
+            persistent (bool): Console mode; False sends a new message for everything (classic)
+            feed_lines (int): Recent ball results kept for the scoreboard in console mode
+        """
+        self.channel = channel
+        self.persistent = persistent
+        self.scoreboard = None
+        self.controls = None
+        # Set when newer messages pushed a persistent message up the channel; it is reposted on next use
+        self.scoreboard_buried = False
+        self.controls_buried = False
+        self.feed = deque(maxlen=feed_lines)
+
+        # Last button/select press on the controls message: its token edits the message without
+        # touching the channel's rate limit bucket
+        self.interaction = None
+        self.interaction_at = 0.0
+
+        # send/edit/delete hit the channel bucket; interaction edits go through the webhook
+        self.calls = {'send': 0, 'edit': 0, 'delete': 0, 'interaction': 0}
+        self.over_calls = []
+        self._over_mark = 0
+
+    @property
+    def total_calls(self):
+        """Calls against the channel's rate limit bucket"""
+        return self.calls['send'] + self.calls['edit'] + self.calls['delete']
+
+    def acknowledge(self, interaction):
+        """Remember the interaction that answered a prompt (views already deferred it)"""
+        if self.persistent:
+            self.interaction = interaction
+            self.interaction_at = time.monotonic()
+
+    async def send(self, content=None, priority=RESULT, **kwargs):
+        """New message for a key event"""
+        self.calls['send'] += 1
+        message = await outbound.send(self.channel, content, priority=priority, **kwargs)
+        if self.persistent:
+            self.scoreboard_buried = self.scoreboard is not None
+            self.controls_buried = self.controls is not None
+        return message
+
+    async def edit(self, message, **kwargs):
+        if message is self.controls and await self._edit_via_interaction(**kwargs):
+            return message
+        self.calls['edit'] += 1
+        await outbound.edit(message, priority=PROMPT if message is self.controls else RESULT, **kwargs)
+        return message
+
+    def decorate(self, content=None, **kwargs):
+        """GIF/image card: lowest priority, dropped by the scheduler when stale or under pressure"""
+        future = outbound.send(self.channel, content, priority=DECORATIVE, **kwargs)
+        future.add_done_callback(self._count_decoration)
+        return future
+
+    def _count_decoration(self, future):
+        if not future.cancelled() and future.exception() is None and future.result() is not None:
+            self.calls['send'] += 1
+            if self.persistent:
+                self.scoreboard_buried = self.scoreboard is not None
+                self.controls_buried = self.controls is not None
+
+    async def _edit_via_interaction(self, **kwargs):
+        """Edit the controls message through the last interaction on it, if still valid"""
+        interaction = self.interaction
+        if interaction is None or time.monotonic() - self.interaction_at > INTERACTION_TTL:
+            return False
+        message = getattr(interaction, 'message', None)
+        if message is None or self.controls is None or message.id != self.controls.id:
+            return False
+        try:
+            await interaction.edit_original_response(**kwargs)
+        except Exception as e:
+            logger.debug(f"Interaction edit failed, falling back to a channel edit: {e}")
+            self.interaction = None
+            return False
+        self.calls['interaction'] += 1
+        return True
+
+    async def prompt(self, content=None, embed=None, view=None):
+        """Show an input prompt: edits the controls message in console mode"""
+        if not self.persistent:
+            return await self.send(content, priority=PROMPT, embed=embed, view=view)
+
+        if self.controls is not None and not self.controls_buried:
+            try:
+                return await self.edit(self.controls, content=content, embed=embed, view=view)
+            except Exception as e:
+                logger.debug(f"Controls message edit failed, reposting: {e}")
+
+        await self._delete_controls()
+        self.calls['send'] += 1
+        self.controls = await outbound.send(self.channel, content, priority=PROMPT, embed=embed, view=view)
+        self.controls_buried = False
+        self.interaction = None
+        return self.controls
+
+    async def update(self, content):
+        """Minor ball-by-ball text: folded into the next scoreboard edit in console mode"""
+        if not self.persistent:
+            return await self.send(content)
+        self.feed.append(content)
+        return None
+
+    async def show_scoreboard(self, embed):
+        """Show the live scorecard: edits the scoreboard message in console mode"""
+        if not self.persistent:
+            return await self.send(embed=embed)
+
+        if self.scoreboard is not None and not self.scoreboard_buried:
+            # Not awaited: if the channel is backed up, queued scoreboard edits collapse into the newest
+            self.calls['edit'] += 1
+            scoreboard = self.scoreboard
+            future = outbound.edit(scoreboard, collapse_key=('scoreboard', scoreboard.id), embed=embed)
+            future.add_done_callback(lambda f: self._scoreboard_edited(f, scoreboard))
+            return scoreboard
+
+        self.calls['send'] += 1
+        self.scoreboard = await outbound.send(self.channel, embed=embed)
+        self.scoreboard_buried = False
+        # Controls belong below the scoreboard: repost them with the next prompt
+        self.controls_buried = self.controls is not None
+        return self.scoreboard
+
+    def _scoreboard_edited(self, future, scoreboard):
+        """Scoreboard message gone (deleted by a moderator?): repost it on the next ball"""
+        if not future.cancelled() and future.exception() is not None and self.scoreboard is scoreboard:
+            logger.debug(f"Scoreboard message edit failed, reposting: {future.exception()}")
+            self.scoreboard = None
+
+    async def _delete_controls(self):
+        if self.controls is None:
+            return
+        self.calls['delete'] += 1
+        outbound.delete(self.controls)
+        self.controls = None
+
+    def end_over(self):
+        """Close the over's channel API call count; returns the calls it cost"""
+        calls = self.total_calls - self._over_mark
+        self._over_mark = self.total_calls
+        self.over_calls.append(calls)
+        return calls
+
+    def stats(self):
+        """API call totals and per-over average (channel bucket only)"""
+        overs = len(self.over_calls)
+        return {
+            'mode': 'console' if self.persistent else 'classic',
+            'calls': dict(self.calls),
+            'total': self.total_calls,
+            'overs': overs,
+            'per_over': (sum(self.over_calls) / overs) if overs else 0.0
+        }
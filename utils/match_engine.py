@@ -5,19 +5,25 @@ Complete ball-by-ball interactive match system with professional graphics
 import discord
 from discord.ui import Button, View, Select
 import random
+import math
 import asyncio
 from datetime import datetime
 import logging
 import traceback
 
-from config import COLORS
+from config import COLORS, MATCH_CONSOLE_SETTINGS
 from data.players import get_player_by_id
 from utils.match_tracker import MatchTracker
 from utils.match_graphics import match_graphics
 from utils.stadium_manager import stadium_manager
 from utils.celebration_manager import celebration_gifs
 from utils.ovr_calculator import calculate_ovr
-from database.db import Database
+from database.db import db
+from game.rules import InningsState, InningsSummary, bowler_specialty
+from game.outcome_model import outcome_model, rating_bucket
+from game.win_probability import get_table as get_win_probability_table
+from utils.match_checkpoint import checkpoint_writer
+from utils.match_console import MatchConsole
 
 # Setup logging
 logger = logging.getLogger('match_engine')
@@ -339,11 +345,12 @@ class ShotSelectView(View):
         return button_callback
 
 
-class ProfessionalMatchEngine:
-    """Professional cricket match engine with full graphics"""
+class ProfessionalMatchEngine(InningsState):
+    """Professional cricket match engine with full graphics (Discord I/O over game.rules)"""
     
     def __init__(self, channel, batting_user_id, bowling_user_id, batting_xi, bowling_xi, 
-                 overs, venue, innings, target, guild, difficulty="easy", batting_team_name=None, bowling_team_name=None):
+                 overs, venue, innings, target, guild, difficulty="easy", batting_team_name=None, bowling_team_name=None,
+                 conditions=None, match_id=None, console_mode=None):
         self.channel = channel
         self.batting_user_id = batting_user_id
         self.bowling_user_id = bowling_user_id
@@ -353,35 +360,45 @@ class ProfessionalMatchEngine:
         self.bowling_xi = bowling_xi
         self.batting_team_name = batting_team_name or f"{self.batting_user.display_name}'s Team"
         self.bowling_team_name = bowling_team_name or f"{self.bowling_user.display_name}'s Team"
-        self.overs = overs
         self.venue = venue
         self.innings = innings
-        self.target = target
         self.guild = guild
         self.difficulty = difficulty  # "easy" or "hard"
+        # Pitch and weather picked at cmplay ({'pitch': PITCH_CONDITIONS entry, 'weather': WEATHER_CONDITIONS entry})
+        self.conditions = conditions or {}
+        self.condition_offset = outcome_model.condition_offset(
+            difficulty, (self.conditions.get('pitch') or {}).get('type'), self.conditions.get('weather')
+        )
         
-        # Initialize match tracker
-        self.tracker = MatchTracker()
+        # Score, strike, bowler rotation and match tracker live in InningsState
+        InningsState.__init__(self, batting_xi, bowling_xi, overs, target, MatchTracker())
+        self.batsmen_selected = False
         
-        # Current match state
-        self.striker_id = None
-        self.non_striker_id = None
-        self.runs = 0
-        self.wickets = 0
-        self.balls = 0
-        self.max_balls = overs * 6
+        # Win probability of the side batting first after every ball (carried into innings 2)
+        self.win_prob_table = get_win_probability_table(overs)
+        self.win_prob_history = []
         
-        # Current bowler
-        self.current_bowler_id = None
-        # Last over's bowler (to prevent consecutive overs)
-        self.last_bowler_id = None
+        # One live_matches checkpoint per match, shared by both innings
+        self.match_id = match_id or f"{channel.id}-{int(datetime.utcnow().timestamp())}"
+        self.forfeited = False
+        self.cancelled = False
         
-        # Available batsmen (not yet out)
-        self.available_batsmen = batting_xi.copy()
-        self.batsmen_selected = False
+        # Frozen innings 1 scorecard while this engine plays innings 2 (set by MatchSession)
+        self.first_innings = None
+        
+        # Console mode edits one scoreboard and one controls message instead of posting per prompt
+        if console_mode is None:
+            console_mode = MATCH_CONSOLE_SETTINGS['enabled']
+        self.console_mode = console_mode
+        self.console = MatchConsole(channel, console_mode, MATCH_CONSOLE_SETTINGS['feed_lines'])
     
     async def start_innings(self):
-        """Start the innings"""
+        """
+        Start the innings and play it out
+        
+        Returns:
+            bool: True if the innings reached its end (False if forfeited or aborted by an error)
+        """
         try:
             logger.info(f"Starting innings {self.innings}")
             
@@ -394,58 +411,156 @@ class ProfessionalMatchEngine:
             await self.select_openers()
             
             if not self.striker_id or not self.non_striker_id:
-                await self.channel.send("❌ Failed to select openers!")
-                return
+                if not self.forfeited:
+                    await self.console.send("❌ Failed to select openers!")
+                return False
+            self.record_win_probability()
+            self.checkpoint()
             
-            # Ball-by-ball loop
-            logger.info(f"Starting ball-by-ball loop: {self.max_balls} balls, target: {self.target}")
-            while self.balls < self.max_balls and self.wickets < 10:
-                if self.target and self.runs >= self.target:
-                    logger.info("Target reached!")
-                    break
-                
-                # Select bowler at start of over
-                ball_in_over = self.balls % 6
-                logger.debug(f"Ball {self.balls + 1}, ball_in_over: {ball_in_over}")
-                
-                if ball_in_over == 0 or self.current_bowler_id is None:
-                    logger.debug("Selecting bowler...")
-                    await self.select_bowler()
-                    
-                    if not self.current_bowler_id:
-                        logger.error("No bowler selected, breaking")
-                        break
-                    
-                    logger.info(f"Bowler selected: {self.current_bowler_id}")
-                
-                # Select shot and play ball
-                try:
-                    logger.debug("Selecting shot...")
-                    await self.select_shot()
-                    logger.debug(f"Ball complete. Score: {self.runs}/{self.wickets}")
-                except Exception as e:
-                    error_msg = f"❌ Error in ball {self.balls + 1}: {str(e)}\n```{traceback.format_exc()}```"
-                    logger.error(error_msg)
-                    await self.channel.send(error_msg[:2000])  # Discord limit
-                    break
+            await self.play_innings()
+            return not self.forfeited
+            
+        except Exception as e:
+            error_msg = f"❌ Fatal error in innings: {str(e)}\n```{traceback.format_exc()}```"
+            logger.error(error_msg)
+            await self.console.send(error_msg[:2000])
+            return False
+    
+    async def resume_innings(self):
+        """Continue an innings rebuilt from a checkpoint, re-posting whichever prompt was pending (returns like start_innings)"""
+        try:
+            logger.info(f"Resuming match {self.match_id} innings {self.innings} at {self.runs}/{self.wickets} ({self.balls} balls)")
+            target_text = f" | Target: {self.target}" if self.target else ""
+            await self.console.send(
+                f"🔄 **Match resumed after a bot restart!** {self.batting_user.mention} vs {self.bowling_user.mention}\n"
+                f"🏏 Innings {self.innings}: **{self.runs}/{self.wickets}** ({self.balls // 6}.{self.balls % 6} overs){target_text}"
+            )
+            
+            if not self.striker_id or not self.non_striker_id:
+                await self.select_openers()
+                if not self.striker_id or not self.non_striker_id:
+                    if not self.forfeited:
+                        await self.console.send("❌ Failed to select openers!")
+                    return False
+                self.checkpoint()
+            elif self.striker_out and self.wickets < 10 and self.available_batsmen:
+                # Restarted between a wicket and the new batsman walking in
+                await self.select_new_batsman()
+                self.checkpoint()
+            
+            await self.play_innings()
+            return not self.forfeited
+            
+        except Exception as e:
+            error_msg = f"❌ Fatal error in resumed innings: {str(e)}\n```{traceback.format_exc()}```"
+            logger.error(error_msg)
+            await self.console.send(error_msg[:2000])
+            return False
+    
+    async def play_innings(self):
+        """Ball-by-ball loop until the innings ends (MatchSession shows the summary and moves on)"""
+        logger.info(f"Starting ball-by-ball loop: {self.max_balls} balls, target: {self.target}")
+        while not self.is_complete():
+            # Select bowler at start of over
+            ball_in_over = self.balls % 6
+            logger.debug(f"Ball {self.balls + 1}, ball_in_over: {ball_in_over}")
+            
+            if ball_in_over == 0 or self.current_bowler_id is None:
+                logger.debug("Selecting bowler...")
+                await self.select_bowler()
                 
-                # Check if innings ended
-                if self.balls >= self.max_balls or self.wickets >= 10:
-                    logger.info(f"Innings ended: balls={self.balls}, wickets={self.wickets}")
+                if not self.current_bowler_id:
+                    logger.error("No bowler selected, breaking")
                     break
                 
-                if self.target and self.runs >= self.target:
-                    logger.info("Target chased!")
-                    break
+                logger.info(f"Bowler selected: {self.current_bowler_id}")
+                self.checkpoint()
             
-            # Show final innings summary
-            logger.info("Showing innings summary")
-            await self.show_innings_complete()
+            # Select shot and play ball
+            try:
+                logger.debug("Selecting shot...")
+                await self.select_shot()
+                logger.debug(f"Ball complete. Score: {self.runs}/{self.wickets}")
+            except Exception as e:
+                error_msg = f"❌ Error in ball {self.balls + 1}: {str(e)}\n```{traceback.format_exc()}```"
+                logger.error(error_msg)
+                await self.console.send(error_msg[:2000])  # Discord limit
+                break
             
+            if self.is_complete():
+                logger.info(f"Innings ended: balls={self.balls}, wickets={self.wickets}, runs={self.runs}")
+                break
+            self.checkpoint()
+        
+        if self.forfeited:
+            # Result already recorded by forfeit_match
+            return
+        self.checkpoint()
+    
+    def snapshot(self):
+        """Everything needed to rebuild this engine after a restart (live_matches document)"""
+        return {
+            '_id': self.match_id,
+            'guild_id': self.guild.id,
+            'channel_id': self.channel.id,
+            'batting_user_id': self.batting_user_id,
+            'bowling_user_id': self.bowling_user_id,
+            'batting_xi': list(self.batting_xi),
+            'bowling_xi': list(self.bowling_xi),
+            'batting_team_name': self.batting_team_name,
+            'bowling_team_name': self.bowling_team_name,
+            'overs': self.overs,
+            'venue': self.venue,
+            'innings': self.innings,
+            'target': self.target,
+            'difficulty': self.difficulty,
+            'conditions': self.conditions,
+            'console_mode': self.console_mode,
+            'state': self.state_dict(),
+            'tracker': self.tracker.to_dict(),
+            'win_prob_history': list(self.win_prob_history),
+            'first_innings': self.first_innings.to_dict() if self.first_innings else None,
+            'updated_at': datetime.utcnow()
+        }
+    
+    def cancel(self):
+        """Creator ended the match (cmend): no result, loops stop at their next check, no more checkpoints"""
+        self.cancelled = True
+        self.forfeited = True
+        self.wickets = 10
+        self.balls = self.max_balls
+    
+    def checkpoint(self):
+        """Queue a snapshot (coalesced and written in the background by checkpoint_writer)"""
+        if self.forfeited:
+            return
+        try:
+            checkpoint_writer.mark(self.snapshot())
         except Exception as e:
-            error_msg = f"❌ Fatal error in innings: {str(e)}\n```{traceback.format_exc()}```"
-            logger.error(error_msg)
-            await self.channel.send(error_msg[:2000])
+            logger.error(f"Checkpoint failed for match {self.match_id}: {e}")
+    
+    @classmethod
+    async def from_checkpoint(cls, doc, channel):
+        """Rebuild an engine from a live_matches document"""
+        guild = channel.guild
+        engine = cls(
+            channel, doc['batting_user_id'], doc['bowling_user_id'],
+            doc['batting_xi'], doc['bowling_xi'], doc['overs'], doc['venue'],
+            doc['innings'], doc['target'], guild, doc.get('difficulty', 'easy'),
+            doc.get('batting_team_name'), doc.get('bowling_team_name'),
+            doc.get('conditions'), match_id=doc['_id'], console_mode=doc.get('console_mode')
+        )
+        # Member cache may still be filling right after startup
+        if engine.batting_user is None:
+            engine.batting_user = await guild.fetch_member(doc['batting_user_id'])
+        if engine.bowling_user is None:
+            engine.bowling_user = await guild.fetch_member(doc['bowling_user_id'])
+        engine.load_state(doc['state'])
+        engine.tracker = MatchTracker.from_dict(doc['tracker'])
+        engine.win_prob_history = doc.get('win_prob_history', [])
+        if doc.get('first_innings'):
+            engine.first_innings = InningsSummary.from_dict(doc['first_innings'])
+        return engine
     
     async def show_team_xi(self):
         """Show professional team XI display"""
@@ -502,7 +617,7 @@ class ProfessionalMatchEngine:
         
         embed.set_footer(text=f"{self.batting_user.display_name} • Playing XI", icon_url=self.batting_user.display_avatar.url)
         
-        await self.channel.send(embed=embed)
+        await self.console.send(embed=embed)
     
     async def select_openers(self):
         """Let batting team select opening batsmen"""
@@ -514,19 +629,19 @@ class ProfessionalMatchEngine:
         )
         
         async def striker_callback(interaction, selected):
+            self.console.acknowledge(interaction)
             self.striker_id = selected
             self.available_batsmen.remove(selected)
         
         view = BatsmanSelectView(self.batting_user_id, self.batting_xi, self.available_batsmen, striker_callback)
-        await self.channel.send(embed=embed, view=view)
+        await self.console.prompt(embed=embed, view=view)
         await view.wait()
         
         if not self.striker_id:
-            await self.channel.send(f"⏱️ **{self.batting_user.mention} didn't select opener!**\n❌ **Match Forfeited!** -500 coins penalty!")
-            db = Database()
-            await db.connect()
+            if self.cancelled:
+                return
+            await self.console.send(f"⏱️ **{self.batting_user.mention} didn't select opener!**\n❌ **Match Forfeited!** -500 coins penalty!")
             await db.deduct_coins(self.batting_user_id, 500, "Match forfeit - opener timeout")
-            await db.close()
             await self.forfeit_match(self.batting_user_id, 'opener selection timeout')
             return
         
@@ -538,19 +653,19 @@ class ProfessionalMatchEngine:
         )
         
         async def non_striker_callback(interaction, selected):
+            self.console.acknowledge(interaction)
             self.non_striker_id = selected
             self.available_batsmen.remove(selected)
         
         view2 = BatsmanSelectView(self.batting_user_id, self.batting_xi, self.available_batsmen, non_striker_callback)
-        await self.channel.send(embed=embed2, view=view2)
+        await self.console.prompt(embed=embed2, view=view2)
         await view2.wait()
         
         if not self.non_striker_id:
-            await self.channel.send(f"⏱️ **{self.batting_user.mention} didn't select non-striker!**\n❌ **Match Forfeited!** -500 coins penalty!")
-            db = Database()
-            await db.connect()
+            if self.cancelled:
+                return
+            await self.console.send(f"⏱️ **{self.batting_user.mention} didn't select non-striker!**\n❌ **Match Forfeited!** -500 coins penalty!")
             await db.deduct_coins(self.batting_user_id, 500, "Match forfeit - non-striker timeout")
-            await db.close()
             await self.forfeit_match(self.batting_user_id, 'non-striker selection timeout')
             return
     
@@ -563,19 +678,18 @@ class ProfessionalMatchEngine:
         )
         
         async def callback(interaction, selected):
-            self.striker_id = selected
-            self.available_batsmen.remove(selected)
+            self.console.acknowledge(interaction)
+            self.set_new_batsman(selected)
         
         view = BatsmanSelectView(self.batting_user_id, self.batting_xi, self.available_batsmen, callback)
-        await self.channel.send(embed=embed, view=view)
+        await self.console.prompt(embed=embed, view=view)
         await view.wait()
         
         if not self.striker_id:
-            await self.channel.send(f"⏱️ **{self.batting_user.mention} didn't select new batsman!**\n❌ **Match Forfeited!** -500 coins penalty!")
-            db = Database()
-            await db.connect()
+            if self.cancelled:
+                return
+            await self.console.send(f"⏱️ **{self.batting_user.mention} didn't select new batsman!**\n❌ **Match Forfeited!** -500 coins penalty!")
             await db.deduct_coins(self.batting_user_id, 500, "Match forfeit - batsman selection timeout")
-            await db.close()
             await self.forfeit_match(self.batting_user_id, 'new batsman selection timeout')
             # Mark all out to stop the innings loop
             self.wickets = 10
@@ -591,65 +705,24 @@ class ProfessionalMatchEngine:
         )
         
         async def callback(interaction, selected_bowler):
+            self.console.acknowledge(interaction)
             self.current_bowler_id = selected_bowler
 
-        # Enforce bowling rotation: bowler who bowled previous over cannot bowl the immediately next over
-        # and enforce per-format max overs (T20: 4 overs, ODI: 10 overs)
-        if self.overs <= 20:
-            per_bowler_limit = 4
-        elif self.overs >= 50:
-            per_bowler_limit = 10
-        else:
-            # default conservative limit for other match lengths
-            per_bowler_limit = max(1, self.overs // 5)
-
-        # Build allowed bowlers list
-        allowed_bowlers = []
-        excluded_reasons = {}
-        for player_id in self.bowling_xi:
-            # Skip last over bowler
-            if self.last_bowler_id and player_id == self.last_bowler_id:
-                excluded_reasons[player_id] = 'previous_over'
-                continue
-
-            stats = self.tracker.get_bowler_stats(player_id) or {}
-            bowled_overs = stats.get('overs', 0)
-            # If bowled_overs is float like 1.0, compare directly
-            if bowled_overs >= per_bowler_limit:
-                excluded_reasons[player_id] = 'limit_reached'
-                continue
-
-            allowed_bowlers.append(player_id)
-
-        # If no allowed bowlers due to strict rules, relax the no-consecutive constraint
-        if not allowed_bowlers:
-            # Allow everyone except those who have strictly reached limit
-            fallback = []
-            for player_id in self.bowling_xi:
-                stats = self.tracker.get_bowler_stats(player_id) or {}
-                if stats.get('overs', 0) >= per_bowler_limit:
-                    excluded_reasons[player_id] = 'limit_reached'
-                    continue
-                fallback.append(player_id)
-
-            if fallback:
-                allowed_bowlers = fallback
-            else:
-                # As last resort, allow all (prevents deadlock)
-                allowed_bowlers = self.bowling_xi.copy()
+        # Enforce bowling rotation (no consecutive overs) and per-format max overs
+        allowed_bowlers = self.allowed_bowlers()
 
         # Build view with only allowed bowlers
         view = BowlerSelectView(self.bowling_user_id, allowed_bowlers, callback)
         
-        msg = await self.channel.send(embed=prompt_embed, view=view)
+        msg = await self.console.prompt(embed=prompt_embed, view=view)
         await view.wait()
         
         if not self.current_bowler_id:
-            await self.channel.send(f"⏱️ **{self.bowling_user.mention} didn't select bowler!**\n❌ **Match Forfeited!** -500 coins penalty!")
-            db = Database()
-            await db.connect()
+            if self.cancelled:
+                return
+            await self.console.send(f"⏱️ **{self.bowling_user.mention} didn't select bowler!**\n❌ **Match Forfeited!** -500 coins penalty!")
             await db.deduct_coins(self.bowling_user_id, 500, "Match forfeit - bowler selection timeout")
-            await db.close()
+            await self.forfeit_match(self.bowling_user_id, 'bowler selection timeout')
             return
     
     async def select_shot(self):
@@ -660,7 +733,7 @@ class ProfessionalMatchEngine:
             bowler = get_player_by_id(self.current_bowler_id)
             if not bowler:
                 logger.error(f"Bowler not found: {self.current_bowler_id}")
-                await self.channel.send(f"❌ Error: Bowler not found!")
+                await self.console.send(f"❌ Error: Bowler not found!")
                 return
             
             ball_speed = random.randint(130, 155)
@@ -669,68 +742,60 @@ class ProfessionalMatchEngine:
             bowl_type_choice = None
             
             async def bowl_callback(interaction, selected_delivery):
+                self.console.acknowledge(interaction)
                 nonlocal bowl_type_choice
                 bowl_type_choice = selected_delivery
                 logger.info(f"Delivery selected: {selected_delivery}")
             
             # Determine bowler specialty based on name/type
-            bowler_name = bowler['name'].lower()
-            if any(name in bowler_name for name in ['ashwin', 'lyon', 'moeen', 'jadeja']):
-                bowler_specialty = "off_spin"
-            elif any(name in bowler_name for name in ['kuldeep', 'chahal', 'rashid', 'zampa', 'adil']):
-                bowler_specialty = "leg_spin"
-            elif bowler.get('bowl_type') == 'spin':
-                # Default spinners to off spin if not identified
-                bowler_specialty = "off_spin"
-            else:
-                bowler_specialty = "fast"
+            specialty = bowler_specialty(bowler)
             
             # Fast bowlers use two-step combo selection
-            if bowler_specialty == "fast":
+            if specialty == "fast":
                 # Step 1: Select pace type
                 pace_type = None
                 
                 async def pace_callback(interaction, selected_pace):
+                    self.console.acknowledge(interaction)
                     nonlocal pace_type
                     pace_type = selected_pace
                 
                 pace_view = PaceTypeSelectView(self.bowling_user_id, pace_callback)
-                pace_msg = await self.channel.send(f"⚾ **{bowler['name']}**, choose pace & length:", view=pace_view)
+                pace_msg = await self.console.prompt(f"⚾ **{bowler['name']}**, choose pace & length:", view=pace_view)
                 await pace_view.wait()
                 
                 if not pace_type:
-                    await self.channel.send(f"⏱️ **{self.bowling_user.mention} didn't select pace type!**\n❌ **Match Forfeited!** -500 coins penalty!")
-                    db = Database()
-                    await db.connect()
+                    if self.cancelled:
+                        return
+                    await self.console.send(f"⏱️ **{self.bowling_user.mention} didn't select pace type!**\n❌ **Match Forfeited!** -500 coins penalty!")
                     await db.deduct_coins(self.bowling_user_id, 500, "Match forfeit - pace selection timeout")
-                    await db.close()
                     await self.forfeit_match(self.bowling_user_id, 'pace selection timeout')
                     return
                 
                 # Step 2: Select length (edit same message)
                 async def length_callback(interaction, combined_delivery):
+                    self.console.acknowledge(interaction)
                     nonlocal bowl_type_choice
                     bowl_type_choice = combined_delivery
                 
                 length_view = BallLengthSelectView(self.bowling_user_id, pace_type, length_callback)
                 try:
-                    await pace_msg.edit(view=length_view)
+                    await self.console.edit(pace_msg, view=length_view)
                 except:
-                    await self.channel.send(view=length_view)
+                    await self.console.prompt(f"⚾ **{bowler['name']}**, choose pace & length:", view=length_view)
                 await length_view.wait()
             else:
                 # Spinners use single selection
-                delivery_view = BowlingTypeSelectView(self.bowling_user_id, bowler_specialty, bowl_callback)
-                await self.channel.send(f"⚾ **{bowler['name']}**, choose your delivery:", view=delivery_view)
+                delivery_view = BowlingTypeSelectView(self.bowling_user_id, specialty, bowl_callback)
+                await self.console.prompt(f"⚾ **{bowler['name']}**, choose your delivery:", view=delivery_view)
                 await delivery_view.wait()
             
             if not bowl_type_choice:
                 # Punish for not selecting - end match
-                await self.channel.send(f"⏱️ **{self.bowling_user.mention} didn't select delivery in time!**\n❌ **Match Forfeited!** -500 coins penalty!")
-                db = Database()
-                await db.connect()
+                if self.cancelled:
+                    return
+                await self.console.send(f"⏱️ **{self.bowling_user.mention} didn't select delivery in time!**\n❌ **Match Forfeited!** -500 coins penalty!")
                 await db.deduct_coins(self.bowling_user_id, 500, "Match forfeit - delivery selection timeout")
-                await db.close()
                 await self.forfeit_match(self.bowling_user_id, 'delivery selection timeout')
                 return
             
@@ -740,7 +805,7 @@ class ProfessionalMatchEngine:
             # Informational broadcast: announce the delivery immediately so the opponent
             # knows the ball has been bowled before the shot selection prompt appears.
             try:
-                await self.channel.send(f"⚾ {bowler['name']} bowls: **{bowl_type_choice}** ({ball_speed} kmph)")
+                await self.console.update(f"⚾ {bowler['name']} bowls: **{bowl_type_choice}** ({ball_speed} kmph)")
             except Exception:
                 # Non-fatal: log and continue if the message cannot be sent
                 logger.debug("Failed to send immediate delivery announcement")
@@ -749,6 +814,7 @@ class ProfessionalMatchEngine:
             shot_choice = None
             
             async def callback(interaction, selected_shot):
+                self.console.acknowledge(interaction)
                 nonlocal shot_choice
                 shot_choice = selected_shot
                 batsman = get_player_by_id(self.striker_id)
@@ -758,22 +824,21 @@ class ProfessionalMatchEngine:
             batsman = get_player_by_id(self.striker_id)
             if not batsman:
                 logger.error(f"Batsman not found: {self.striker_id}")
-                await self.channel.send(f"❌ Error: Batsman not found!")
+                await self.console.send(f"❌ Error: Batsman not found!")
                 return
             
             logger.debug("Creating shot selection view")
             view = ShotSelectView(self.batting_user_id, bowler['name'], ball_speed, callback)
             
-            shot_msg = await self.channel.send(f"🏏 **{batsman['name']}** facing {ball_speed}km/h", view=view)
+            shot_msg = await self.console.prompt(f"🏏 **{batsman['name']}** facing {ball_speed}km/h", view=view)
             logger.debug("Waiting for shot selection...")
             await view.wait()
             
             if not shot_choice:
-                await self.channel.send(f"⏱️ **{self.batting_user.mention} didn't select shot!**\n❌ **Match Forfeited!** -500 coins penalty!")
-                db = Database()
-                await db.connect()
+                if self.cancelled:
+                    return
+                await self.console.send(f"⏱️ **{self.batting_user.mention} didn't select shot!**\n❌ **Match Forfeited!** -500 coins penalty!")
                 await db.deduct_coins(self.batting_user_id, 500, "Match forfeit - shot selection timeout")
-                await db.close()
                 await self.forfeit_match(self.batting_user_id, 'shot selection timeout')
                 return
             
@@ -798,32 +863,18 @@ class ProfessionalMatchEngine:
         """Process the ball and show result"""
         outcome = self.calculate_outcome(shot, bowl_type)
         
-        self.balls += 1
-        over = (self.balls - 1) // 6
-        ball_in_over = ((self.balls - 1) % 6) + 1
-        
         batsman = get_player_by_id(self.striker_id)
         bowler = get_player_by_id(self.current_bowler_id)
         
-        # Track the ball
-        self.tracker.add_ball(self.striker_id, self.current_bowler_id, 
-                             outcome if outcome != 'wicket' and outcome != 'dot' else 0,
-                             outcome if outcome == 'wicket' or outcome == 'dot' else outcome,
-                             shot)
-
-        # If the over completed with this ball, mark last bowler and clear current bowler
-        if self.balls % 6 == 0:
-            try:
-                self.last_bowler_id = self.current_bowler_id
-            except Exception:
-                self.last_bowler_id = None
-            # Clearing current bowler so select_bowler will trigger next over selection
-            self.current_bowler_id = None
+        # Score, track the ball, rotate strike and close the over
+        over_complete = self.apply_ball(outcome, shot)
+        self.record_win_probability()
+        if over_complete:
+            calls = self.console.end_over()
+            logger.info(f"Over {self.balls // 6} ({self.console.stats()['mode']}): {calls} Discord API calls")
         
         # Handle outcome
         if outcome == 'wicket':
-            self.wickets += 1
-            
             # Show wicket celebration
             await self.show_wicket(batsman, bowler, ball_speed)
             
@@ -835,12 +886,6 @@ class ProfessionalMatchEngine:
             await self.show_ball_result("⚪ Dot Ball", f"{batsman['name']} defends", ball_speed)
         
         else:
-            self.runs += outcome
-            
-            # Swap batsmen on odd runs
-            if outcome in [1, 3]:
-                self.striker_id, self.non_striker_id = self.non_striker_id, self.striker_id
-            
             # Check for milestones
             batsman_stats = self.tracker.get_batsman_stats(self.striker_id)
             if batsman_stats:
@@ -856,24 +901,41 @@ class ProfessionalMatchEngine:
                 await self.show_ball_result("🚀 SIX!", f"{batsman['name']} clears the ropes!", ball_speed, use_embed=True)
             else:
                 # Text only for 1,2,3 runs
-                await self.channel.send(f"✅ **{outcome} RUN{'S' if outcome > 1 else ''}** - {batsman['name']} rotates strike")
+                await self.console.update(f"✅ **{outcome} RUN{'S' if outcome > 1 else ''}** - {batsman['name']} rotates strike")
     
     def calculate_outcome(self, shot, bowl_type):
-        """Calculate outcome based on shot and bowl"""
-        outcomes = {
-            'defend': [('dot', 70), (1, 25), ('wicket', 5)],
-            'drive': [(4, 30), (2, 25), (1, 20), ('dot', 15), ('wicket', 10)],
-            'loft': [(6, 25), (4, 20), (1, 15), ('wicket', 40)],
-            'sweep': [(4, 30), (2, 25), (1, 20), ('wicket', 25)],
-            'cut': [(4, 35), (2, 20), (1, 25), ('dot', 10), ('wicket', 10)],
-            'leave': [('dot', 95), ('wicket', 5)],
-            'pull': [(6, 20), (4, 30), (1, 20), ('wicket', 30)],
-            'flick': [(2, 30), (1, 40), (4, 15), ('wicket', 15)]
-        }
-        
-        weights = outcomes.get(shot, [('dot', 50), (1, 30), ('wicket', 20)])
-        choices, probs = zip(*weights)
-        return random.choices(choices, weights=probs)[0]
+        """Calculate outcome from the precompiled model (shot, delivery, ratings, difficulty, conditions)"""
+        batsman = get_player_by_id(self.striker_id) or {}
+        bowler = get_player_by_id(self.current_bowler_id) or {}
+        index = outcome_model.situation_index(
+            shot, bowl_type,
+            rating_bucket(batsman.get('batting')), rating_bucket(bowler.get('bowling')),
+            self.condition_offset
+        )
+        return outcome_model.sample_index(index)
+    
+    def batting_first_win_probability(self):
+        """P(side batting first wins) from the current scoreboard, or None without a table"""
+        if self.win_prob_table is None:
+            return None
+        balls_left = math.ceil(self.max_balls - self.balls)
+        return self.win_prob_table.batting_first(
+            self.innings, balls_left, 10 - self.wickets, self.runs, self.target
+        )
+    
+    def record_win_probability(self):
+        """Append this ball's win probability to the match history"""
+        p = self.batting_first_win_probability()
+        if p is not None:
+            self.win_prob_history.append({'innings': self.innings, 'ball': self.balls, 'p': p})
+    
+    def win_probability_text(self):
+        """'Team A 62% | Team B 38%' for the live scorecard"""
+        p = self.batting_first_win_probability()
+        if p is None:
+            return None
+        first, second = (self.batting_user, self.bowling_user) if self.innings == 1 else (self.bowling_user, self.batting_user)
+        return f"{first.name} **{p:.0%}** | {second.name} **{1 - p:.0%}**"
     
     async def show_live_scorecard(self, commentary):
         """Show professional live scorecard with both batsmen"""
@@ -924,6 +986,10 @@ class ProfessionalMatchEngine:
         rates_text += f"```"
         embed.add_field(name="📊 PARTNERSHIP", value=rates_text, inline=False)
         
+        win_text = self.win_probability_text()
+        if win_text:
+            embed.add_field(name="🔮 WIN PROBABILITY", value=win_text, inline=False)
+        
         # Bowler stats
         bowler_text = f"```\n"
         bowler_text += f"{bowler['name']:<20} O: {bowler_stats['overs']:.1f}  R: {bowler_stats['runs']}  W: {bowler_stats['wickets']}\n"
@@ -951,6 +1017,10 @@ class ProfessionalMatchEngine:
         # Commentary
         embed.add_field(name="📡 COMMENTARY", value=commentary, inline=False)
         
+        # Console mode: ball results folded into the scoreboard instead of separate messages
+        if self.console.feed:
+            embed.add_field(name="📣 LAST BALLS", value="\n".join(reversed(self.console.feed)), inline=False)
+        
         # Target info
         if self.target:
             need = self.target - self.runs
@@ -958,19 +1028,19 @@ class ProfessionalMatchEngine:
             target_footer = f"Need {need} runs from {balls_left} balls"
             embed.set_footer(text=target_footer)
         
-        await self.channel.send(embed=embed)
+        await self.console.show_scoreboard(embed)
     
     async def show_ball_result(self, title, description, ball_speed, use_embed=True):
         """Show ball result"""
-        if use_embed:
+        if use_embed and not self.console.persistent:
             embed = discord.Embed(
                 title=title,
                 description=description,
                 color=COLORS['success']
             )
-            await self.channel.send(embed=embed)
+            await self.console.send(embed=embed)
         else:
-            await self.channel.send(f"**{title}** - {description}")
+            await self.console.update(f"**{title}** - {description}")
     
     async def show_wicket(self, batsman, bowler, ball_speed):
         """Show wicket with GIF and scorecard"""
@@ -983,12 +1053,12 @@ class ProfessionalMatchEngine:
         dismissals = ["bowled", "caught", "lbw", "stumped", "run out"]
         dismissal = random.choice(dismissals)
         
-        await self.channel.send(f"🔴 **OUT!** {dismissal.title()} by {bowler['name']}! {batsman['name']} IS OUT 🔥")
+        await self.console.send(f"🔴 **OUT!** {dismissal.title()} by {bowler['name']}! {batsman['name']} IS OUT 🔥")
         
         if gif_url:
             embed = discord.Embed(color=discord.Color.red())
             embed.set_image(url=gif_url)
-            await self.channel.send(embed=embed)
+            self.console.decorate(embed=embed)
         
         # Create wicket card
         wicket_card = match_graphics.create_wicket_card(
@@ -1002,7 +1072,7 @@ class ProfessionalMatchEngine:
             bowler['name']
         )
         
-        await self.channel.send(file=discord.File(wicket_card, "wicket.png"))
+        self.console.decorate(file=discord.File(wicket_card, "wicket.png"))
     
     async def show_milestone(self, batsman, milestone, stats):
         """Show milestone celebration"""
@@ -1013,12 +1083,12 @@ class ProfessionalMatchEngine:
             gif_url = celebration_gifs.get_century_gif(batsman['name'])
         
         milestone_text = "FIFTY" if milestone == 50 else "CENTURY"
-        await self.channel.send(f"🎉 **{milestone_text}!** {batsman['name']} reaches {milestone}! 🔥🔥🔥")
+        await self.console.send(f"🎉 **{milestone_text}!** {batsman['name']} reaches {milestone}! 🔥🔥🔥")
         
         if gif_url:
             embed = discord.Embed(color=discord.Color.gold())
             embed.set_image(url=gif_url)
-            await self.channel.send(embed=embed)
+            self.console.decorate(embed=embed)
         
         # Create milestone card
         milestone_card = match_graphics.create_milestone_card(
@@ -1031,10 +1101,12 @@ class ProfessionalMatchEngine:
             milestone
         )
         
-        await self.channel.send(file=discord.File(milestone_card, f"{milestone}.png"))
+        self.console.decorate(file=discord.File(milestone_card, f"{milestone}.png"))
     
     async def show_innings_complete(self):
         """Show innings complete with full analytics and scorecard"""
+        logger.info(f"Innings {self.innings} Discord API calls: {self.console.stats()}")
+        
         # Create comprehensive innings scorecard
         embed = discord.Embed(
             title=f"📊 INNINGS {self.innings} COMPLETE",
@@ -1080,6 +1152,9 @@ class ProfessionalMatchEngine:
         
         if self.innings == 1:
             summary += f"\n🎯 **Target:** {self.runs + 1} runs"
+            win_text = self.win_probability_text()
+            if win_text:
+                summary += f"\n🔮 {win_text}"
             embed.add_field(name="📈 SUMMARY", value=summary, inline=False)
         else:
             if self.runs >= self.target:
@@ -1088,173 +1163,13 @@ class ProfessionalMatchEngine:
                 summary += f"\n🏆 **{self.bowling_user.name} WINS by {self.target - self.runs - 1} runs!**"
             embed.add_field(name="📈 RESULT", value=summary, inline=False)
         
-        await self.channel.send(embed=embed)
+        await self.console.send(embed=embed)
         
         # Show wagon wheel
         if self.tracker.innings_data['shot_zones']:
             wagon_wheel = match_graphics.create_wagon_wheel(self.tracker.innings_data['shot_zones'])
-            await self.channel.send(file=discord.File(wagon_wheel, "wagon_wheel.png"))
-        
-        # If innings 1, start innings 2
-        if self.innings == 1:
-            # Swap teams and start next innings
-            next_engine = ProfessionalMatchEngine(
-                self.channel,
-                self.bowling_user_id,  # Swap
-                self.batting_user_id,   # Swap
-                self.bowling_xi,        # Swap
-                self.batting_xi,        # Swap
-                self.overs,
-                self.venue,
-                2,  # Innings 2
-                self.runs + 1,  # Target
-                self.guild,
-                self.difficulty  # Pass difficulty to 2nd innings
-            )
-            await next_engine.start_innings()
-        else:
-            # Match complete - determine winner and show final scorecard
-            await self.show_final_scorecard()
-    
-    async def show_final_scorecard(self):
-        """Show comprehensive final match scorecard with both innings"""
-        # Determine winner
-        if self.runs >= self.target:
-            winner = self.batting_user
-            winner_team = f"{self.batting_user.name}"
-            result_text = f"🏆 **{winner.mention} WON BY {10 - self.wickets} WICKETS!** 🏆"
-        else:
-            winner = self.bowling_user
-            winner_team = f"{self.bowling_user.name}"
-            result_text = f"🏆 **{winner.mention} WON BY {self.target - self.runs - 1} RUNS!** 🏆"
-        
-        # Create comprehensive scorecard embed
-        embed = discord.Embed(
-            title="📊 FINAL MATCH SCORECARD 📊",
-            description=result_text,
-            color=discord.Color.gold()
-        )
-        
-        # Get innings 1 data from the first engine (stored when creating second innings)
-        # For now, we'll show current innings data
-        # TODO: Store innings 1 data to display both innings
-        
-        # Show current (2nd) innings batting
-        batting_text = "```\n"
-        batting_text += f"{'BATSMAN':<20} R    B   4s  6s   SR\n"
-        batting_text += f"{'─' * 50}\n"
-        
-        for batsman_id in self.batting_xi:
-            stats = self.tracker.get_batsman_stats(batsman_id)
-            if stats and stats.get('balls', 0) > 0:
-                player = get_player_by_id(batsman_id)
-                batting_text += f"{player['name']:<20} {stats['runs']:<4} {stats['balls']:<3} {stats['fours']:<3} {stats['sixes']:<3} {stats['strike_rate']:>6.1f}\n"
-        
-        batting_text += f"{'─' * 50}\n"
-        batting_text += f"{'TOTAL':<20} {self.runs}/{self.wickets} ({(self.balls // 6)}.{self.balls % 6} overs)\n"
-        batting_text += f"```"
-        embed.add_field(name=f"🏏 {self.batting_user.name.upper()} INNINGS", value=batting_text, inline=False)
-        
-        # Show bowling figures
-        bowling_text = "```\n"
-        bowling_text += f"{'BOWLER':<20} O    R   W   Econ\n"
-        bowling_text += f"{'─' * 50}\n"
-        
-        for bowler_id in self.bowling_xi:
-            stats = self.tracker.get_bowler_stats(bowler_id)
-            if stats and stats['overs'] > 0:
-                player = get_player_by_id(bowler_id)
-                bowling_text += f"{player['name']:<20} {stats['overs']:.1f}  {stats['runs']:<3} {stats['wickets']:<3} {stats['economy']:>5.2f}\n"
-        
-        bowling_text += f"```"
-        embed.add_field(name=f"⚾ {self.bowling_user.name.upper()} BOWLING", value=bowling_text, inline=False)
-        
-        # Match info
-        match_info = f"**Stadium:** {self.venue}\n"
-        match_info += f"**Overs:** {self.overs}\n"
-        match_info += f"**Target:** {self.target}\n"
-        match_info += f"**Match Date:** {datetime.now().strftime('%d %B %Y')}"
-        embed.add_field(name="📌 MATCH INFO", value=match_info, inline=False)
-        
-        # Show wagon wheel for final innings
-        if self.tracker.innings_data['shot_zones']:
-            wagon_wheel = match_graphics.create_wagon_wheel(self.tracker.innings_data['shot_zones'])
-            await self.channel.send(file=discord.File(wagon_wheel, "final_wagon_wheel.png"))
-        
-        # Show Manhattan for final innings
-        if self.tracker.innings_data['runs_per_over']:
-            manhattan = match_graphics.create_manhattan_graph(self.tracker.innings_data['runs_per_over'])
-            await self.channel.send(file=discord.File(manhattan, "final_manhattan.png"))
-        
-        await self.channel.send(embed=embed)
-        
-        # Show winner celebration GIF
-        win_gif = celebration_gifs.get_match_win_gif(winner_team)
-        if win_gif:
-            win_embed = discord.Embed(color=discord.Color.gold())
-            win_embed.set_image(url=win_gif)
-            await self.channel.send(embed=win_embed)
-        
-        # Save match history to database
-        await self.save_match_history(winner)
+            self.console.decorate(file=discord.File(wagon_wheel, "wagon_wheel.png"))
     
-    async def save_match_history(self, winner):
-        """Save match result to database"""
-        db = Database()
-        await db.connect()
-        
-        try:
-            # Determine match result details
-            if self.runs >= self.target:
-                # Batting team won
-                winner_id = str(self.batting_user_id)
-                loser_id = str(self.bowling_user_id)
-                win_by = f"{10 - self.wickets} wickets"
-                winner_score = f"{self.runs}/{self.wickets}"
-                loser_score = f"{self.target - 1}/{10}"
-            else:
-                # Bowling team won
-                winner_id = str(self.bowling_user_id)
-                loser_id = str(self.batting_user_id)
-                win_by = f"{self.target - self.runs - 1} runs"
-                winner_score = f"{self.target - 1}/{10}"
-                loser_score = f"{self.runs}/{self.wickets}"
-            
-            # Prepare match data
-            match_data = {
-                "team1_user": str(self.batting_user_id),
-                "team1_name": self.batting_user.name,
-                "team1_score": f"{self.runs}/{self.wickets}",
-                "team1_overs": f"{(self.balls // 6)}.{self.balls % 6}",
-                "team2_user": str(self.bowling_user_id),
-                "team2_name": self.bowling_user.name,
-                "team2_score": f"{self.target - 1}/{10}",  # Assuming innings 1 all out or full overs
-                "team2_overs": f"{self.overs}.0",
-                "winner_id": winner_id,
-                "winner_name": winner.name,
-                "win_by": win_by,
-                "venue": self.venue,
-                "overs": self.overs,
-                "match_type": f"{self.overs}-over match",
-                "created_at": datetime.utcnow()
-            }
-            
-            # Save to database
-            await db.save_match(match_data)
-            
-            # Update win/loss records
-            await db.update_match_result(winner_id, won=True)
-            await db.update_match_result(loser_id, won=False)
-            
-            # Award coins
-            await db.award_match_coins(winner_id, 5000, "Match victory")
-            await db.award_match_coins(loser_id, 1000, "Participation reward")
-            
-        except Exception as e:
-            logger.error(f"Error saving match history: {e}")
-        finally:
-            await db.close()
-
     async def forfeit_match(self, forfeiter_id, reason="forfeit"):
         """Handle match forfeit: record opponent as winner and save result"""
         try:
@@ -1272,9 +1187,9 @@ class ProfessionalMatchEngine:
                 loser = self.bowling_user
 
             # Announce result
-            await self.channel.send(f"❌ Match ended due to forfeit ({reason}). {winner.mention} is declared the winner!")
+            await self.console.send(f"❌ Match ended due to forfeit ({reason}). {winner.mention} is declared the winner!")
 
-            # Prepare match data (minimal)
+            # Prepare match data (minimal); the bowling side has only batted if this is innings 2
             match_data = {
                 "team1_user": str(self.batting_user_id),
                 "team1_name": self.batting_user.name,
@@ -1282,31 +1197,31 @@ class ProfessionalMatchEngine:
                 "team1_overs": f"{(self.balls // 6)}.{self.balls % 6}",
                 "team2_user": str(self.bowling_user_id),
                 "team2_name": self.bowling_user.name,
-                "team2_score": f"{self.target - 1}/{10}",
-                "team2_overs": f"{self.overs}.0",
+                "team2_score": self.first_innings.score if self.first_innings else "DNB",
+                "team2_overs": self.first_innings.overs_text if self.first_innings else "0.0",
                 "winner_id": winner_id,
                 "winner_name": winner.name,
                 "win_by": f"Forfeit ({reason})",
                 "venue": self.venue,
+                "guild_id": str(self.guild.id),
                 "overs": self.overs,
                 "match_type": f"{self.overs}-over match",
                 "created_at": datetime.utcnow()
             }
 
-            db = Database()
-            await db.connect()
             await db.save_match(match_data)
 
             # Update records and award coins
-            await db.update_match_result(winner_id, won=True)
-            await db.update_match_result(loser_id, won=False)
+            await db.update_match_result(winner_id, won=True, match=match_data)
+            await db.update_match_result(loser_id, won=False, match=match_data)
             await db.award_match_coins(winner_id, 5000, "Match victory (forfeit)")
             await db.award_match_coins(loser_id, 1000, "Participation reward (forfeit)")
-            await db.close()
 
             # Mark match ended so loops break
             self.wickets = 10
             self.balls = self.max_balls
+            self.forfeited = True
+            checkpoint_writer.discard(self.match_id)
 
         except Exception as e:
             logger.error(f"Error handling forfeit: {e}")
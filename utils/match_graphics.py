@@ -195,6 +195,75 @@ class MatchGraphics:
         buf.seek(0)
         return buf
     
+    def create_win_probability_graph(self, history, team1_name, team2_name, turning_point=None):
+        """
+        Create win probability worm across both innings
+        history: list of {'innings', 'ball', 'p'} (p = team batting first's chance)
+        turning_point: history entry to highlight
+        """
+        width = 800
+        height = 500
+        img = Image.new('RGBA', (width, height), self.bg_color)
+        draw = ImageDraw.Draw(img)
+        
+        try:
+            title_font = ImageFont.truetype("arial.ttf", 32)
+            label_font = ImageFont.truetype("arial.ttf", 18)
+        except:
+            title_font = ImageFont.load_default()
+            label_font = ImageFont.load_default()
+        
+        draw.text((width // 2, 30), "WIN PROBABILITY",
+                 fill=self.text_color, font=title_font, anchor="mm")
+        
+        graph_left = 80
+        graph_right = width - 50
+        graph_top = 100
+        graph_bottom = height - 80
+        graph_width = graph_right - graph_left
+        graph_height = graph_bottom - graph_top
+        
+        draw.line([graph_left, graph_bottom, graph_right, graph_bottom],
+                 fill=self.text_color, width=2)
+        draw.line([graph_left, graph_bottom, graph_left, graph_top],
+                 fill=self.text_color, width=2)
+        
+        # 50% line and axis labels
+        mid = graph_top + graph_height / 2
+        draw.line([graph_left, mid, graph_right, mid], fill=(90, 90, 90), width=1)
+        for pct in (0, 50, 100):
+            y = graph_bottom - (pct / 100) * graph_height
+            draw.text((graph_left - 15, y), f"{pct}%", fill=self.text_color,
+                     font=label_font, anchor="rm")
+        draw.text((graph_left + 10, graph_top - 20), team1_name, fill=self.green, font=label_font, anchor="lm")
+        draw.text((graph_left + 10, graph_bottom + 25), team2_name, fill=self.blue, font=label_font, anchor="lm")
+        
+        if len(history) > 1:
+            step = graph_width / (len(history) - 1)
+            points = [
+                (graph_left + i * step, graph_bottom - entry['p'] * graph_height)
+                for i, entry in enumerate(history)
+            ]
+            draw.line(points, fill=self.accent_color, width=3)
+            
+            # Innings break
+            for i, entry in enumerate(history):
+                if entry['innings'] == 2:
+                    x = graph_left + i * step
+                    draw.line([x, graph_top, x, graph_bottom], fill=(120, 120, 120), width=1)
+                    draw.text((x + 5, graph_bottom + 10), "Inn 2", fill=self.text_color, font=label_font, anchor="lm")
+                    break
+            
+            if turning_point in history:
+                x, y = points[history.index(turning_point)]
+                draw.ellipse([x - 8, y - 8, x + 8, y + 8], outline=self.red, width=3)
+                draw.text((x, y - 20), "TURNING POINT", fill=self.red, font=label_font, anchor="mm")
+        
+        buf = io.BytesIO()
+        img.save(buf, format='PNG')
+        buf.seek(0)
+        return buf
+    
     def create_milestone_card(self, player_name, runs, balls, fours, sixes, strike_rate, milestone_type):
         """
         Create milestone celebration card (50 or 100)
@@ -0,0 +1,260 @@
+"""
+Match Session
+Owns both innings of a match: plays them from one flat loop, keeping finished innings as frozen summaries
+"""
+import discord
+from datetime import datetime
+import logging
+
+from data.players import get_player_by_id
+from database.db import db
+from game.rules import InningsSummary
+from game.win_probability import turning_point
+from utils.match_checkpoint import checkpoint_writer
+from utils.match_engine import ProfessionalMatchEngine
+from utils.match_graphics import match_graphics
+from utils.celebration_manager import celebration_gifs
+
+
+logger = logging.getLogger('match_session')
+
+
+class MatchSession:
+    """One match: the live innings engine plus InningsSummary for each finished innings"""
+
+    def __init__(self, engine):
+        """
+        Args:
+            engine (ProfessionalMatchEngine): The innings to play first (innings 1, or a
+                checkpointed innings 2 carrying its first_innings summary)
+        """
+        self.engine = engine
+        self.match_id = engine.match_id
+        self.channel = engine.channel
+        self.venue = engine.venue
+        self.win_prob_history = engine.win_prob_history
+        self.cancelled = False
+        self.innings = [engine.first_innings] if engine.first_innings else []
+        if engine.innings == 2 and not self.innings:
+            # Innings 2 checkpoint written before summaries were stored: only the target survives
+            self.innings.append(InningsSummary(1, engine.target - 1, 10, engine.max_balls, engine.overs))
+
+        # Sides by batting order, so both innings can be reported after the engines are gone
+        if engine.innings == 1:
+            self.first_user, self.second_user = engine.batting_user, engine.bowling_user
+        else:
+            self.first_user, self.second_user = engine.bowling_user, engine.batting_user
+
+    async def play(self, resume=False):
+        """
+        Play the remaining innings in turn; each engine is dropped once its innings is summarised
+
+        Args:
+            resume (bool): The current engine was rebuilt from a checkpoint
+        """
+        while self.engine is not None and not self.cancelled:
+            engine = self.engine
+            played = await (engine.resume_innings() if resume else engine.start_innings())
+            resume = False
+            if not played or self.cancelled:
+                # Forfeited (result already saved), cancelled with cmend, or aborted by an error already reported
+                self.engine = None
+                return
+
+            summary = InningsSummary.from_state(engine, engine.innings)
+            self.innings.append(summary)
+            await engine.show_innings_complete()
+
+            if engine.innings == 1:
+                self.engine = self.next_innings(engine, summary)
+            else:
+                self.engine = None
+                if not self.cancelled:
+                    await self.show_final_scorecard(engine)
+
+    def cancel(self):
+        """Creator ended the match (cmend): stop the live innings without a result and drop its checkpoint"""
+        self.cancelled = True
+        if self.engine is not None:
+            self.engine.cancel()
+        checkpoint_writer.discard(self.match_id)
+
+    def next_innings(self, engine, summary):
+        """Innings 2 engine: teams swapped, chasing the frozen innings 1 total"""
+        next_engine = ProfessionalMatchEngine(
+            engine.channel,
+            engine.bowling_user_id,
+            engine.batting_user_id,
+            engine.bowling_xi,
+            engine.batting_xi,
+            engine.overs,
+            engine.venue,
+            2,
+            summary.runs + 1,
+            engine.guild,
+            engine.difficulty,
+            engine.bowling_team_name,
+            engine.batting_team_name,
+            engine.conditions,
+            match_id=self.match_id,
+            console_mode=engine.console_mode
+        )
+        # Members may have come from fetch_member on resume
+        next_engine.batting_user = engine.bowling_user
+        next_engine.bowling_user = engine.batting_user
+        next_engine.win_prob_history = self.win_prob_history
+        next_engine.first_innings = summary
+        return next_engine
+
+    def result(self):
+        """(winner, loser, margin text) from the two innings summaries"""
+        first, second = self.innings
+        if second.runs >= second.target:
+            return self.second_user, self.first_user, f"{10 - second.wickets} wickets"
+        return self.first_user, self.second_user, f"{second.target - second.runs - 1} runs"
+
+    def batting_table(self, summary):
+        batting_text = "```\n"
+        batting_text += f"{'BATSMAN':<20} R    B   4s  6s   SR\n"
+        batting_text += f"{'─' * 50}\n"
+        for player_id, runs, balls, fours, sixes in summary.batting:
+            player = get_player_by_id(player_id)
+            strike_rate = runs / balls * 100 if balls else 0
+            batting_text += f"{player['name']:<20} {runs:<4} {balls:<3} {fours:<3} {sixes:<3} {strike_rate:>6.1f}\n"
+        batting_text += f"{'─' * 50}\n"
+        batting_text += f"{'TOTAL':<20} {summary.score} ({summary.overs_text} overs)\n"
+        batting_text += "```"
+        return batting_text
+
+    def bowling_table(self, summary):
+        bowling_text = "```\n"
+        bowling_text += f"{'BOWLER':<20} O    R   W   Econ\n"
+        bowling_text += f"{'─' * 50}\n"
+        for player_id, balls, runs, wickets in summary.bowling:
+            player = get_player_by_id(player_id)
+            economy = runs / (balls / 6) if balls else 0
+            overs = f"{balls // 6}.{balls % 6}"
+            bowling_text += f"{player['name']:<20} {overs:<4} {runs:<3} {wickets:<3} {economy:>5.2f}\n"
+        bowling_text += "```"
+        return bowling_text
+
+    async def show_final_scorecard(self, engine):
+        """Final scorecard with both innings, then save the result"""
+        first, second = self.innings
+        winner, loser, margin = self.result()
+        result_text = f"🏆 **{winner.mention} WON BY {margin.upper()}!** 🏆"
+
+        embed = discord.Embed(
+            title="📊 FINAL MATCH SCORECARD 📊",
+            description=result_text,
+            color=discord.Color.gold()
+        )
+
+        for summary, batting_user, bowling_user in ((first, self.first_user, self.second_user),
+                                                    (second, self.second_user, self.first_user)):
+            embed.add_field(name=f"🏏 {batting_user.name.upper()} INNINGS", value=self.batting_table(summary), inline=False)
+            embed.add_field(name=f"⚾ {bowling_user.name.upper()} BOWLING", value=self.bowling_table(summary), inline=False)
+
+        # Match info
+        match_info = f"**Stadium:** {self.venue}\n"
+        match_info += f"**Overs:** {engine.overs}\n"
+        match_info += f"**Target:** {second.target}\n"
+        match_info += f"**Match Date:** {datetime.now().strftime('%d %B %Y')}"
+        embed.add_field(name="📌 MATCH INFO", value=match_info, inline=False)
+
+        # Win probability swing across both innings
+        if len(self.win_prob_history) > 1:
+            embed.add_field(name="🔮 WIN PROBABILITY", value=self.win_probability_summary(), inline=False)
+            chart = match_graphics.create_win_probability_graph(
+                self.win_prob_history, self.first_user.name, self.second_user.name, turning_point(self.win_prob_history)[0]
+            )
+            engine.console.decorate(file=discord.File(chart, "win_probability.png"))
+
+        # Wagon wheel for the final innings (shot zones aren't kept in summaries)
+        if engine.tracker.innings_data['shot_zones']:
+            wagon_wheel = match_graphics.create_wagon_wheel(engine.tracker.innings_data['shot_zones'])
+            engine.console.decorate(file=discord.File(wagon_wheel, "final_wagon_wheel.png"))
+
+        if second.runs_per_over:
+            manhattan = match_graphics.create_manhattan_graph(list(second.runs_per_over))
+            engine.console.decorate(file=discord.File(manhattan, "final_manhattan.png"))
+
+        await engine.console.send(embed=embed)
+
+        # Show winner celebration GIF
+        win_gif = celebration_gifs.get_match_win_gif(winner.name)
+        if win_gif:
+            win_embed = discord.Embed(color=discord.Color.gold())
+            win_embed.set_image(url=win_gif)
+            engine.console.decorate(embed=win_embed)
+
+        await self.save_match_history(winner, loser, margin)
+        checkpoint_writer.discard(self.match_id)
+
+    def win_probability_summary(self):
+        """Per-over sparkline of the first-batting side's chances and the match turning point"""
+        blocks = "▁▂▃▄▅▆▇█"
+        first, second = self.first_user.name, self.second_user.name
+        lines = []
+        for innings in (1, 2):
+            # Probability at the end of each over (plus the last ball of the innings)
+            points = [e for e in self.win_prob_history if e['innings'] == innings]
+            per_over = [e['p'] for e in points if e['ball'] % 6 == 0 and e['ball'] > 0]
+            if points and points[-1]['ball'] % 6:
+                per_over.append(points[-1]['p'])
+            if per_over:
+                spark = "".join(blocks[min(int(p * len(blocks)), len(blocks) - 1)] for p in per_over)
+                lines.append(f"`Inn {innings}` {spark}")
+
+        entry, swing = turning_point(self.win_prob_history)
+        if entry:
+            gainer = first if swing > 0 else second
+            over = f"{(entry['ball'] - 1) // 6}.{(entry['ball'] - 1) % 6 + 1}"
+            before = entry['p'] - swing
+            lines.append(
+                f"🔄 **Turning point:** innings {entry['innings']}, ball {over} - "
+                f"{gainer} {abs(swing):.0%} swing ({first} {before:.0%} → {entry['p']:.0%})"
+            )
+        lines.append(f"_{first} chances per over (batting first)_")
+        return "\n".join(lines)
+
+    async def save_match_history(self, winner, loser, margin):
+        """Save the match result with both innings to the database"""
+        first, second = self.innings
+        try:
+            # team1 is the chasing side, team2 the side that batted first
+            match_data = {
+                "team1_user": str(self.second_user.id),
+                "team1_name": self.second_user.name,
+                "team1_score": second.score,
+                "team1_overs": second.overs_text,
+                "team2_user": str(self.first_user.id),
+                "team2_name": self.first_user.name,
+                "team2_score": first.score,
+                "team2_overs": first.overs_text,
+                "innings": [
+                    {**first.to_dict(), 'batting_user': str(self.first_user.id)},
+                    {**second.to_dict(), 'batting_user': str(self.second_user.id)}
+                ],
+                "winner_id": str(winner.id),
+                "winner_name": winner.name,
+                "win_by": margin,
+                "venue": self.venue,
+                "guild_id": str(self.channel.guild.id),
+                "overs": first.overs,
+                "match_type": f"{first.overs}-over match",
+                "created_at": datetime.utcnow()
+            }
+
+            await db.save_match(match_data)
+
+            # Update win/loss records
+            await db.update_match_result(str(winner.id), won=True, match=match_data)
+            await db.update_match_result(str(loser.id), won=False, match=match_data)
+
+            # Award coins
+            await db.award_match_coins(str(winner.id), 5000, "Match victory")
+            await db.award_match_coins(str(loser.id), 1000, "Participation reward")
+
+        except Exception as e:
+            logger.error(f"Error saving match history: {e}")
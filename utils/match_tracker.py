@@ -2,6 +2,8 @@
 Match Statistics Tracker
 Tracks all ball-by-ball data for analytics and graphics
 """
+import copy
+
 
 class MatchTracker:
     """Track detailed match statistics"""
@@ -25,6 +27,19 @@ class MatchTracker:
             'total_balls': 0
         }
     
+    def to_dict(self):
+        """Innings data as plain dicts/lists (for checkpoints)"""
+        return copy.deepcopy(self.innings_data)
+    
+    @classmethod
+    def from_dict(cls, innings_data):
+        """Rebuild a tracker from to_dict() output"""
+        tracker = cls()
+        tracker.innings_data.update(copy.deepcopy(innings_data))
+        # Stored as lists; the wagon wheel expects (angle, runs) pairs
+        tracker.innings_data['shot_zones'] = [tuple(zone) for zone in tracker.innings_data['shot_zones']]
+        return tracker
+    
     def add_ball(self, batsman_id, bowler_id, runs, outcome, shot_type=None):
         """
         Record a ball
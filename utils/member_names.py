@@ -0,0 +1,41 @@
+"""
+Member Names
+Resolve a page of user IDs to display names from the gateway caches, with one batched query for the rest
+"""
+import asyncio
+
+import discord
+
+
+async def resolve_names(bot, guild, user_ids):
+    """
+    Display names for a list of user IDs without one API call per user
+
+    Looks in the guild's member cache, then the bot's user cache; anyone still missing
+    is fetched with a single guild member query (up to 100 IDs).
+
+    Args:
+        bot: The bot (for its user cache)
+        guild (discord.Guild): Guild whose members are looked up first (None in DMs)
+        user_ids (list): User IDs (str or int)
+
+    Returns:
+        dict: str(user_id) -> display name (IDs that couldn't be resolved are absent)
+    """
+    names = {}
+    missing = []
+    for user_id in user_ids:
+        user = (guild.get_member(int(user_id)) if guild else None) or bot.get_user(int(user_id))
+        if user:
+            names[str(user_id)] = user.display_name
+        else:
+            missing.append(int(user_id))
+
+    if missing and guild:
+        missing = missing[:100]
+        try:
+            for member in await guild.query_members(user_ids=missing, limit=len(missing)):
+                names[str(member.id)] = member.display_name
+        except (discord.HTTPException, discord.ClientException, asyncio.TimeoutError):
+            pass
+    return names
@@ -0,0 +1,248 @@
+"""
+Outbound Message Scheduler
+Per-channel token buckets with priority classes, so bursts from matches, auctions and announcements
+stay under Discord's rate limits instead of tripping 429 retry sleeps
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from config import OUTBOUND_SETTINGS
+
+
+logger = logging.getLogger('outbound')
+
+# Priority classes: lower runs first
+PROMPT = 0       # Interactive prompts a player is waiting on
+RESULT = 1       # Ball results, scorecards, auction updates, announcements
+DECORATIVE = 2   # GIFs and image cards; dropped when stale or under pressure
+PRIORITY_NAMES = {PROMPT: 'prompt', RESULT: 'result', DECORATIVE: 'decorative'}
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `capacity`"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self):
+        """Seconds until a token is available (0 if one is ready)"""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def pause(self, seconds):
+        """Server asked us to back off: no tokens for `seconds`"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+class _Job:
+    __slots__ = ('priority', 'seq', 'action', 'future', 'queued_at', 'expires_at', 'collapse_key')
+
+    def __init__(self, priority, seq, action, future, expires_at, collapse_key):
+        self.priority = priority
+        self.seq = seq
+        self.action = action
+        self.future = future
+        self.queued_at = time.monotonic()
+        self.expires_at = expires_at
+        self.collapse_key = collapse_key
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class ChannelQueue:
+    """Pending jobs and metrics for one channel"""
+
+    def __init__(self, channel_id, bucket):
+        self.channel_id = channel_id
+        self.bucket = bucket
+        self.heap = []
+        self.collapsible = {}  # collapse_key -> queued job
+        self.wakeup = asyncio.Event()
+        self.worker = None
+        self.stats = {
+            'sent': 0, 'collapsed': 0, 'dropped': 0, 'failed': 0, 'rate_limited': 0,
+            'max_depth': 0, 'wait_total': 0.0, 'wait_max': 0.0
+        }
+
+
+def _log_failure(future):
+    """Retrieve fire-and-forget failures so they are logged instead of warned about"""
+    if not future.cancelled() and future.exception() is not None:
+        logger.debug(f"Outbound job failed: {future.exception()}")
+
+
+class OutboundScheduler:
+    """Queue every channel.send/message.edit through a per-channel worker"""
+
+    def __init__(self, rate=0.8, burst=1, decorative_ttl=15.0, pressure_depth=8, idle_timeout=60.0):
+        """
+        Args:
+            rate (float): Sustained messages per second per channel
+            burst (int): Bucket capacity; burst + rate * 5 <= 5 never exceeds Discord's 5 per 5s
+            decorative_ttl (float): Seconds a decorative message may wait before it is dropped
+            pressure_depth (int): Queue depth above which queued decorative messages are dropped
+            idle_timeout (float): Seconds before an empty channel's worker exits
+        """
+        self.rate = rate
+        self.burst = burst
+        self.decorative_ttl = decorative_ttl
+        self.pressure_depth = pressure_depth
+        self.idle_timeout = idle_timeout
+        self.queues = {}
+        self._seq = itertools.count()
+
+    def _queue(self, channel):
+        queue = self.queues.get(channel.id)
+        if queue is None:
+            queue = ChannelQueue(channel.id, TokenBucket(self.rate, self.burst))
+            self.queues[channel.id] = queue
+        if queue.worker is None or queue.worker.done():
+            queue.worker = asyncio.create_task(self._run(queue))
+        return queue
+
+    def submit(self, channel, action, priority=RESULT, collapse_key=None, ttl=None):
+        """
+        Queue `action` (a zero-argument coroutine function) for a channel
+
+        Args:
+            collapse_key: Queued jobs with the same key are merged; only the newest action runs
+            ttl (float): Drop the job if it hasn't started within this many seconds
+                (decorative jobs default to decorative_ttl)
+
+        Returns:
+            asyncio.Future: Result of the action, or None if it was dropped
+        """
+        queue = self._queue(channel)
+
+        if collapse_key is not None and collapse_key in queue.collapsible:
+            job = queue.collapsible[collapse_key]
+            job.action = action
+            queue.stats['collapsed'] += 1
+            return job.future
+
+        if ttl is None and priority == DECORATIVE:
+            ttl = self.decorative_ttl
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_log_failure)
+        job = _Job(priority, next(self._seq), action, future,
+                   time.monotonic() + ttl if ttl else None, collapse_key)
+        heapq.heappush(queue.heap, job)
+        if collapse_key is not None:
+            queue.collapsible[collapse_key] = job
+        queue.stats['max_depth'] = max(queue.stats['max_depth'], len(queue.heap))
+        queue.wakeup.set()
+        return future
+
+    def send(self, channel, content=None, priority=RESULT, ttl=None, **kwargs):
+        """Queued channel.send; await the returned future for the Message"""
+        return self.submit(channel, lambda: channel.send(content, **kwargs), priority, ttl=ttl)
+
+    def edit(self, message, priority=RESULT, collapse_key=None, **kwargs):
+        """Queued message.edit; pass a collapse_key for edits where only the newest matters"""
+        return self.submit(message.channel, lambda: message.edit(**kwargs), priority, collapse_key)
+
+    def delete(self, message, priority=RESULT):
+        return self.submit(message.channel, message.delete, priority)
+
+    async def _run(self, queue):
+        """Worker: one job at a time, highest priority first, paced by the channel's bucket"""
+        while True:
+            if not queue.heap:
+                queue.wakeup.clear()
+                try:
+                    await asyncio.wait_for(queue.wakeup.wait(), timeout=self.idle_timeout)
+                except asyncio.TimeoutError:
+                    if not queue.heap:
+                        self.queues.pop(queue.channel_id, None)
+                        return
+                continue
+
+            wait = queue.bucket.wait_time()
+            if wait > 0:
+                # Re-check after sleeping: a higher-priority job may have arrived meanwhile
+                await asyncio.sleep(wait)
+                continue
+
+            job = heapq.heappop(queue.heap)
+            if job.collapse_key is not None and queue.collapsible.get(job.collapse_key) is job:
+                del queue.collapsible[job.collapse_key]
+
+            now = time.monotonic()
+            stale = job.expires_at is not None and now > job.expires_at
+            pressured = job.priority == DECORATIVE and len(queue.heap) >= self.pressure_depth
+            if stale or pressured:
+                queue.stats['dropped'] += 1
+                if not job.future.done():
+                    job.future.set_result(None)
+                continue
+
+            queue.bucket.take()
+            waited = now - job.queued_at
+            queue.stats['wait_total'] += waited
+            queue.stats['wait_max'] = max(queue.stats['wait_max'], waited)
+            try:
+                result = await job.action()
+            except Exception as e:
+                if getattr(e, 'status', None) == 429:
+                    # Back off and retry this job first
+                    queue.stats['rate_limited'] += 1
+                    queue.bucket.pause(getattr(e, 'retry_after', None) or 1.0)
+                    job.queued_at = time.monotonic()
+                    heapq.heappush(queue.heap, job)
+                    continue
+                queue.stats['failed'] += 1
+                if not job.future.done():
+                    job.future.set_exception(e)
+                continue
+
+            queue.stats['sent'] += 1
+            if not job.future.done():
+                job.future.set_result(result)
+
+    def stats(self):
+        """
+        Queue depth and wait time per channel plus totals
+
+        Returns:
+            dict: channels (channel_id -> metrics) and totals
+        """
+        channels = {}
+        totals = {'depth': 0, 'sent': 0, 'collapsed': 0, 'dropped': 0, 'failed': 0, 'rate_limited': 0, 'wait_max': 0.0}
+        for channel_id, queue in self.queues.items():
+            s = queue.stats
+            depth_by_priority = {name: 0 for name in PRIORITY_NAMES.values()}
+            for job in queue.heap:
+                depth_by_priority[PRIORITY_NAMES[job.priority]] += 1
+            channels[channel_id] = {
+                **s,
+                'depth': len(queue.heap),
+                'depth_by_priority': depth_by_priority,
+                'wait_avg': s['wait_total'] / (s['sent'] + s['failed']) if s['sent'] + s['failed'] else 0.0,
+            }
+            totals['depth'] += len(queue.heap)
+            for key in ('sent', 'collapsed', 'dropped', 'failed', 'rate_limited'):
+                totals[key] += s[key]
+            totals['wait_max'] = max(totals['wait_max'], s['wait_max'])
+        return {'channels': channels, 'totals': totals}
+
+
+outbound = OutboundScheduler(
+    OUTBOUND_SETTINGS['rate'], OUTBOUND_SETTINGS['burst'],
+    OUTBOUND_SETTINGS['decorative_ttl'], OUTBOUND_SETTINGS['pressure_depth']
+)